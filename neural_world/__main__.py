@@ -3,12 +3,46 @@
 usage:
     __main__.py simulation [options]
     __main__.py individual [options]
+    __main__.py batch [options] [<field=value>...]
+    __main__.py sweep <spec> <results> [options]
+    __main__.py render <directory> [options]
 
 options:
     -h, --help          print this help
     -v, --version       print version
     --log-level=LEVEL   log level used for terminal output   [default: warning]
     --render-png=BOOL   activate png files generation        [default: 1]
+    --evaluator=NAME    neural network evaluation engine, in asp,
+                        circuit, numpy, asp_batch, parallel or tiled
+    --space=NAME        storage of objects in space, in dict or grid
+    --seed=N            seed of the random streams, for reproducible runs
+    --shared=NAME       publish the world state in the shared memory of given
+                        name, for other processes (see the shared module)
+    --deferred-archive  archive networks in a single file, and render them
+                        at the end of the simulation
+    --event-log         write births, deaths and moves in a binary event log
+    --checkpoint=N      save a checkpoint of the simulation every N steps
+    --deltas            write the changes of each step between checkpoints
+    --restore=FILE      restore the simulation from given checkpoint file,
+                        or from a directory of checkpoints with deltas
+    --rewind=N          step to restore from a directory of checkpoints
+                        with deltas, default to the last one
+
+batch options:
+    --config=FILE       configuration file, with a field = value per line
+    --steps=N           number of steps, unless extinction [default: 100]
+    --summary=FILE      JSON file receiving the summary, instead of stdout
+    --profile           add the time spent in each phase of the steps
+
+sweep and render options:
+    --workers=N         number of worker processes, default to one per core
+
+In batch mode, the simulation is run without prompt, rendering nor waiting.
+Fields given as arguments override the configuration file.
+In sweep mode, the simulations described by the JSON spec file are run
+in parallel, and their results appended to the results file.
+In render mode, the networks archived by a simulation with the
+deferred_archive field are rendered in DOT and PNG files.
 
 
 """
@@ -17,11 +51,15 @@ import docopt
 from functools import partial
 
 import neural_world.actions as action
+from neural_world import cache
 from neural_world import commons
 from neural_world.info import VERSION
+from neural_world import sweep
+from neural_world import netarchive
+from neural_world import headless
 from neural_world.config import Configuration
 from neural_world.engine import Engine
-from neural_world.prompt import Prompt
+from neural_world.profiling import PhaseProfiler
 from neural_world.observer import (Archivist, TerminalWorldView,
                                    NullTerminalWorldView, TreeBuilder)
 
@@ -29,21 +67,28 @@ from neural_world.observer import (Archivist, TerminalWorldView,
 LOGGER = commons.logger()
 
 
-def run_simulation(config, render_png):
-    """Run a simulation, with CLI and many default behaviors"""
+def run_simulation(config, render_png, restore=None, restore_step=None):
+    """Run a simulation, with CLI and many default behaviors.
+    If a checkpoint file or directory is given, the world is restored from it."""
+    from neural_world.prompt import Prompt  # not needed by other modes
     # Observers
     v = TerminalWorldView
     a = partial(Archivist, archive_directory=config.dir_archive_simulation,
-                render_graph=render_png)
+                render_graph=render_png, deferred=config.deferred_archive)
     t = partial(TreeBuilder, archive_directory=config.dir_archive_simulation,
                 render_graph=render_png)
 
-    # Engine from rules
-    e = Engine.generate_from(config, observers=(v, a, t))
+    # Engine from rules, or from a checkpoint
+    observers = (v, a, t) + headless.optional_observers(config)
+    if restore:
+        e = headless.restored(config, restore, restore_step, observers)
+    else:
+        e = Engine.generate_from(config, observers)
     e.world.init_observers()
 
     # Initialize the world
-    e.world.populate()
+    if not restore:
+        e.world.populate()
     prompt = Prompt(config, e)
 
     # Main loop
@@ -62,6 +107,16 @@ def run_simulation(config, render_png):
         LOGGER.info('Treatment loop finished through keyboard interruption.')
     e.world.deinit()
     LOGGER.info('Deinitialization of World')
+    LOGGER.info('Reactions cache: ' + str(cache.REACTIONS))
+
+
+def run_batch(config, steps, summary_file=None, restore=None, restore_step=None,
+              profile:bool=False):
+    """Run a simulation without any interaction, then write its summary"""
+    profiler = PhaseProfiler() if profile else None
+    summary = headless.run(config, steps, restore, restore_step, profiler)
+    headless.write_summary(summary, summary_file)
+    LOGGER.info('Batch run finished after ' + str(summary['steps']) + ' steps.')
 
 
 def run_individual(config):
@@ -78,12 +133,46 @@ if __name__ == '__main__':
     commons.log_level(level=args['--log-level'])
     render_png = bool(int(args['--render-png']))
 
+    workers = int(args['--workers']) if args['--workers'] else None
+    if args['sweep']:
+        sweep.run(sweep.read_spec(args['<spec>']), args['<results>'], workers)
+        exit()
+    if args['render']:
+        netarchive.render(args['<directory>'], workers, render_graph=render_png)
+        exit()
+
     # Configuration
-    config = Configuration()
+    overrides = {}
+    if args['--evaluator']:
+        overrides['network_evaluator'] = args['--evaluator']
+    if args['--space']:
+        overrides['space_backend'] = args['--space']
+    if args['--seed']:
+        overrides['seed'] = args['--seed']
+    if args['--shared']:
+        overrides['shared_state'] = args['--shared']
+    if args['--deferred-archive']:
+        overrides['deferred_archive'] = True
+    if args['--event-log']:
+        overrides['event_log'] = True
+    if args['--checkpoint']:
+        overrides['checkpoint_interval'] = args['--checkpoint']
+    if args['--deltas']:
+        overrides['checkpoint_deltas'] = True
+    if args['batch']:
+        fields = headless.read_config(args['--config']) if args['--config'] else {}
+        overrides.update(field.split('=', 1) for field in args['<field=value>'])
+        config = headless.configuration(fields, **overrides)
+    else:
+        config = Configuration(**overrides)
     assert config.is_valid()
 
     # Run
-    if args['simulation']:
-        run_simulation(config, render_png)
+    restore_step = int(args['--rewind']) if args['--rewind'] else None
+    if args['batch']:
+        run_batch(config, int(args['--steps']), args['--summary'],
+                  args['--restore'], restore_step, args['--profile'])
+    elif args['simulation']:
+        run_simulation(config, render_png, args['--restore'], restore_step)
     elif args['individual']:
         run_individual(config)
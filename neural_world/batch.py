@@ -0,0 +1,240 @@
+"""
+Batch computation of the reactions of all individuals of a World.
+
+Instead of evaluating each neural network when its individual is updated,
+the input states of all living individuals are gathered in a 2-D boolean
+array, and all networks are evaluated at once: level by level with numpy,
+or in a single ASP solving.
+
+"""
+import weakref
+import itertools
+
+import numpy as np
+
+from neural_world import commons
+from neural_world import parallel
+from neural_world import solving
+from neural_world.atoms import arg as atoms_arg
+from neural_world.commons import NeuronType, Evaluator, FILE_ASP_RUNNING_BATCH
+from neural_world.neural_network_engine import MINIMAL_NEURON_ID
+
+
+LOGGER = commons.logger(commons.SUBLOGGER_LIFE)
+
+# Integer codes of the gates, as stored in the tables
+GATE_CODES = {NeuronType.XOR: 0, NeuronType.AND: 1,
+              NeuronType.NOT: 2, NeuronType.OR: 3}
+XOR, AND, NOT, OR = (GATE_CODES[t] for t in NeuronType.xano())
+
+
+class CircuitTables:
+    """Gates and edges of a Circuit, as numpy arrays.
+
+    Gates are described by their target neuron id, their type code,
+    their number of predecessors and their level.
+    Edges are described by their source neuron id and the index
+    of their gate in the gates arrays.
+
+    """
+
+    def __init__(self, circuit):
+        gates = circuit.gates
+        def array(values, dtype=np.int64):
+            values = tuple(values)
+            return np.fromiter(values, dtype=dtype, count=len(values))
+        self.targets  = array(idn for idn, _, _ in gates)
+        self.codes    = array((GATE_CODES[ntype] for _, ntype, _ in gates), np.int8)
+        self.nb_preds = array(len(preds) for _, _, preds in gates)
+        self.levels   = array(circuit.levels[idn] for idn, _, _ in gates)
+        self.sources  = array(pred for _, _, preds in gates for pred in preds)
+        self.edge_gates = array(idx for idx, (_, _, preds) in enumerate(gates)
+                                for _ in preds)
+
+# Tables are computed once per circuit, and forgotten with it.
+TABLES = weakref.WeakKeyDictionary()
+
+
+def tables_of(circuit) -> CircuitTables:
+    """Return the CircuitTables of given Circuit"""
+    try:
+        return TABLES[circuit]
+    except KeyError:
+        tables = TABLES[circuit] = CircuitTables(circuit)
+        return tables
+
+
+def evaluate_circuits(networks:list, inputs:np.ndarray) -> np.ndarray:
+    """Return output states of given neural networks, for given input states.
+
+    networks: sequence of NeuralNetworkEngine, each one having a circuit.
+    inputs: 2-D boolean array, one line of input states per network,
+            padded with False after the last input neuron.
+    return: 2-D boolean array, one line of output states per network,
+            padded with False after the last output neuron.
+
+    All networks share a single flat state vector, where the neuron of id I
+    in the network N is found at offsets[N] + I. Gates of all networks
+    are sorted by level, and each level is computed with a gather
+    of predecessor states followed by a reduction per gate.
+
+    """
+    nb_network = len(networks)
+    nb_outputs = np.array([n.nb_output_neuron for n in networks], dtype=np.int64)
+    outputs = np.zeros((nb_network, nb_outputs.max(initial=0)), dtype=bool)
+    if nb_network == 0:
+        return outputs
+    tables = [tables_of(n.circuit) for n in networks]
+
+    # flat state vector, initialized with input states
+    widths = np.array([n.maximal_neuron_id + 1 for n in networks], dtype=np.int64)
+    offsets = np.cumsum(widths) - widths
+    state = np.zeros(widths.sum(), dtype=bool)
+    nb_inputs = np.array([n.nb_input_neuron for n in networks], dtype=np.int64)
+    rows, cols = np.nonzero(np.arange(inputs.shape[1]) < nb_inputs[:, None])
+    state[offsets[rows] + MINIMAL_NEURON_ID + cols] = inputs[rows, cols]
+
+    # gates and edges of all networks, in flat state coordinates
+    nb_gates = np.array([len(t.targets) for t in tables], dtype=np.int64)
+    nb_edges = np.array([len(t.sources) for t in tables], dtype=np.int64)
+    gate_offsets = np.cumsum(nb_gates) - nb_gates
+    concat = lambda field: np.concatenate([getattr(t, field) for t in tables])
+    targets  = concat('targets') + np.repeat(offsets, nb_gates)
+    sources  = concat('sources') + np.repeat(offsets, nb_edges)
+    edge_gates = concat('edge_gates') + np.repeat(gate_offsets, nb_edges)
+    codes, nb_preds, levels = concat('codes'), concat('nb_preds'), concat('levels')
+
+    # sort gates by level, then edges by gate
+    order = np.argsort(levels, kind='stable')
+    targets, codes = targets[order], codes[order]
+    nb_preds, levels = nb_preds[order], levels[order]
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+    edge_gates = position[edge_gates]
+    edge_order = np.argsort(edge_gates, kind='stable')
+    sources, edge_gates = sources[edge_order], edge_gates[edge_order]
+
+    # computation, level by level (level 0 is for input neurons)
+    depth = levels.max(initial=0)
+    gate_bounds = np.searchsorted(levels, np.arange(1, depth + 2))
+    edge_bounds = np.searchsorted(edge_gates, gate_bounds)
+    for level in range(depth):
+        first_gate, last_gate = gate_bounds[level], gate_bounds[level+1]
+        first_edge, last_edge = edge_bounds[level], edge_bounds[level+1]
+        nb_up = np.bincount(edge_gates[first_edge:last_edge] - first_gate,
+                            weights=state[sources[first_edge:last_edge]],
+                            minlength=last_gate - first_gate)
+        code = codes[first_gate:last_gate]
+        state[targets[first_gate:last_gate]] = np.select(
+            (code == XOR, code == AND, code == NOT),
+            (nb_up == 1, nb_up == nb_preds[first_gate:last_gate], nb_up == 0),
+            default=nb_up > 0
+        )
+
+    # output neurons have the higher ids of each network
+    min_outputs = np.array([n.min_output_neuron_id for n in networks], dtype=np.int64)
+    rows, cols = np.nonzero(np.arange(outputs.shape[1]) < nb_outputs[:, None])
+    outputs[rows, cols] = state[offsets[rows] + min_outputs[rows] + cols]
+    return outputs
+
+
+def evaluate_asp(networks:list, inputs:np.ndarray) -> np.ndarray:
+    """Return output states of given neural networks, for given input states,
+    computed in a single solving of network_running_batch.lp.
+
+    Arguments and returned value are the same as for evaluate_circuits.
+    Atoms of each network are given its index in networks
+    as additional first argument.
+
+    """
+    nb_outputs = [n.nb_output_neuron for n in networks]
+    outputs = np.zeros((len(networks), max(nb_outputs, default=0)), dtype=bool)
+    if not networks:
+        return outputs
+    atoms = ''.join(itertools.chain.from_iterable(
+        (network.neural_network.replace('(', '(' + str(idx) + ','),
+         *('up(' + str(idx) + ',' + str(idn) + ').'
+           for idn, is_up in enumerate(states[:network.nb_input_neuron],
+                                       start=MINIMAL_NEURON_ID)
+           if is_up))
+        for idx, (network, states) in enumerate(zip(networks, inputs))
+    ))
+    model = solving.model_from(atoms, FILE_ASP_RUNNING_BATCH)
+    assert model is not None, 'batch running lead to non existing model'
+    min_outputs = [n.min_output_neuron_id for n in networks]
+    for atom in model:
+        idx, idn = (int(arg) for arg in atoms_arg(atom))
+        outputs[idx, idn - min_outputs[idx]] = True
+    return outputs
+
+
+# Batch evaluation function of each batched Evaluator
+EVALUATIONS = {
+    Evaluator.NUMPY: evaluate_circuits,
+    Evaluator.ASP_BATCH: evaluate_asp,
+    Evaluator.PARALLEL: parallel.evaluate_parallel,
+}
+
+
+def input_array(input_states:list) -> np.ndarray:
+    """Return the 2-D boolean array of given input states,
+    padded with False"""
+    width = max((len(states) for states in input_states), default=0)
+    inputs = np.zeros((len(input_states), width), dtype=bool)
+    for line, states in zip(inputs, input_states):
+        line[:len(states)] = states
+    return inputs
+
+
+def update_all(engine, world, evaluate=evaluate_circuits):
+    """Compute the next step of all individuals in given world, and send
+    their actions to given engine.
+
+    All individuals first pay their life cost, then the networks
+    of the living ones are evaluated together by given evaluate function.
+    Actions are finally sent in the same order as if each individual
+    had been updated one after the other.
+
+    """
+    with engine.profiler.phase('inputs'):
+        updates, living = prepared(world)
+        networks = [data['individual'].neural_network for data in living]
+        inputs = input_array([tuple(network.input_states(data))
+                              for network, data in zip(networks, living)])
+    with engine.profiler.phase('evaluation'):
+        emit_all(engine, updates, living, evaluate(networks, inputs))
+
+
+def prepared(world, with_neighbors:bool=True) -> (list, list):
+    """Make all individuals of given world pay their life cost, and return
+    the reaction data of all of them and of the living ones.
+
+    Neighbors states are given to the living ones only,
+    and only if with_neighbors is True.
+
+    """
+    updates, living = [], []  # reaction data of individuals
+    for indiv, coords in tuple(world.individuals.items()):
+        indiv.live()
+        data = {'neighbors': None, 'individual': indiv, 'coords': coords}
+        updates.append(data)
+        if indiv.energy > 0:
+            if with_neighbors:
+                data['neighbors'] = world.neighbors(coords)
+            living.append(data)
+    return updates, living
+
+
+def emit_all(engine, updates:list, living:list, outputs:np.ndarray):
+    """Send to given engine the actions of all individuals, in order,
+    according to the output states computed for the living ones"""
+    output_states = {
+        id(data['individual']):
+        states[:data['individual'].neural_network.nb_output_neuron].tolist()
+        for data, states in zip(living, outputs)
+    }
+    for data in updates:
+        indiv, coords = data['individual'], data['coords']
+        states = output_states.get(id(indiv))
+        reaction = () if states is None else indiv.reaction_with(states, **data)
+        indiv.emit_reaction(engine, coords, reaction)
@@ -0,0 +1,15 @@
+"""
+Benchmarks of Neural World, runnable headless:
+
+    python -m neural_world.benchmarks steps results.json
+    python -m neural_world.benchmarks networks results.json
+    python -m neural_world.benchmarks compare baseline.json results.json
+
+The steps benchmark measures the throughput of whole simulations over
+a grid of world sizes, populations and network sizes (see the steps module).
+The networks benchmark measures the evaluation and the cleaning of single
+networks by each evaluator (see the networks module).
+The compare command flags the regressions between two results files
+(see the compare module).
+
+"""
@@ -0,0 +1,41 @@
+"""
+
+usage:
+    __main__.py steps <results> [options]
+    __main__.py networks <results> [options]
+    __main__.py compare <baseline> <candidate> [options]
+
+options:
+    -h, --help          print this help
+    --log-level=LEVEL   log level used for terminal output   [default: info]
+    --spec=FILE         JSON specification of the cases, instead of the default one
+    --threshold=PCT     percentage of change making a regression [default: 10]
+    --networks=N        number of networks of each group [default: 10]
+    --inputs=N          number of input states of each network [default: 20]
+    --seed=N            seed of the networks and input states [default: 0]
+
+The steps and networks benchmarks write their results in the given JSON file.
+The networks benchmark exits with an error status if evaluators disagree.
+The compare command exits with an error status if regressions are found.
+
+"""
+import docopt
+
+from neural_world import commons
+from neural_world import sweep
+from neural_world.benchmarks import steps, networks, compare
+
+
+if __name__ == '__main__':
+    args = docopt.docopt(__doc__)
+    commons.log_level(level=args['--log-level'])
+    if args['steps']:
+        spec = sweep.read_spec(args['--spec']) if args['--spec'] else steps.DEFAULT_SPEC
+        steps.run(spec, args['<results>'])
+    elif args['networks']:
+        results = networks.run(args['<results>'], nb_network=int(args['--networks']),
+                               nb_input=int(args['--inputs']), seed=int(args['--seed']))
+        exit(1 if any(case['mismatches'] for case in results['cases']) else 0)
+    elif args['compare']:
+        threshold = float(args['--threshold']) / 100
+        exit(1 if compare.report(args['<baseline>'], args['<candidate>'], threshold) else 0)
@@ -0,0 +1,81 @@
+"""
+Comparison of two results files of benchmarks.
+
+Cases of both files are matched by their fields and seed. A measure
+of a case is a regression when it is worse in the candidate results
+than in the baseline ones by more than the given threshold, in ratio.
+Measures are worse when they are lower for throughputs, and higher
+for times and memory. Phases, and networks benchmarks, lasting less
+than MIN_TIME are ignored, their times being mostly noise.
+Measures null in the baseline have no ratio: they are reported
+when they become non null, but never as regressions.
+
+"""
+import json
+
+from neural_world.sweep import run_key
+
+
+MIN_TIME = 1e-3  # seconds
+THRESHOLD = 0.1
+
+
+def measures(case:dict) -> dict:
+    """Return measure: (value, higher is better) of given case"""
+    found = {'steps_per_second': (case.get('steps_per_second'), True),
+             'peak_rss': (case.get('peak_rss'), False)}
+    for name, time in case.get('phases', {}).items():
+        if time >= MIN_TIME:
+            found['phases.' + name] = (time / max(case['steps'], 1), False)
+    for name in ('peak', 'retained'):
+        found['allocations.' + name] = ((case.get('allocations') or {}).get(name), False)
+    if case.get('time', 0.) >= MIN_TIME:  # networks benchmark
+        found['time_per_call'] = (case['time_per_call'], False)
+    return {name: measure for name, measure in found.items() if measure[0] is not None}
+
+
+def read(filename:str) -> dict:
+    """Return the cases of given results file, by key"""
+    with open(filename) as fd:
+        return {run_key(case['fields'], case['seed']): case
+                for case in json.load(fd)['cases']}
+
+
+def compare(baseline:dict, candidate:dict, threshold:float=THRESHOLD) -> iter:
+    """Yield (key, measure, baseline value, candidate value, ratio, regression)
+    for each measure of the cases found in both given cases by key.
+    The ratio is None, and no regression given, when the baseline is 0
+    and the candidate is not."""
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = measures(baseline[key]), measures(candidate[key])
+        for name in sorted(before.keys() & after.keys()):
+            (old, higher_is_better), (new, _) = before[name], after[name]
+            if old == new:
+                ratio = 1.
+            elif not old:
+                yield key, name, old, new, None, False
+                continue
+            else:
+                ratio = new / old
+            worse = ratio < 1 - threshold if higher_is_better else ratio > 1 + threshold
+            yield key, name, old, new, ratio, worse
+
+
+def report(baseline_file:str, candidate_file:str, threshold:float=THRESHOLD) -> int:
+    """Print the comparison of given results files, and return
+    the number of regressions"""
+    baseline, candidate = read(baseline_file), read(candidate_file)
+    nb_regression, last_key = 0, None
+    for key, name, old, new, ratio, worse in compare(baseline, candidate, threshold):
+        if key != last_key:
+            print(key)
+            last_key = key
+        print('    {:<24} {:>14.6g} {:>14.6g} {:>9}{}'.format(
+            name, old, new, 'null base' if ratio is None else '{:.2f}x'.format(ratio),
+            '  REGRESSION' if worse else ''))
+        nb_regression += worse
+    missing = baseline.keys() ^ candidate.keys()
+    if missing:
+        print(len(missing), 'cases are not in both files')
+    print(nb_regression, 'regressions, with a threshold of', str(threshold * 100) + '%')
+    return nb_regression
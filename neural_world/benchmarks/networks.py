@@ -0,0 +1,222 @@
+"""
+Micro-benchmarks of the evaluation and cleaning of neural networks.
+
+Networks are taken from a corpus of groups of networks: networks spawned
+by an Incubator for each given number of intermediate neurons and edges,
+and pathological networks, dense, deep or having many outputs.
+
+For each available evaluator, are measured:
+
+    output_from: time of a call of NeuralNetworkEngine.output_from,
+                 the reactions cache being disabled
+    batch: time of the evaluation of all networks of a group at once,
+           for batched evaluators
+    cleaned: time of a call of NeuralNetworkEngine.cleaned, by ASP
+             (solving evaluators) or in python (others)
+
+All outputs are cross-checked against those of the reference evaluator,
+ASP if available, else CIRCUIT: cases giving other outputs are reported
+with their number of mismatches.
+
+Results are written in a JSON file, as the steps benchmark,
+and may be compared the same way (see the compare module).
+
+"""
+import os
+import json
+import time
+
+import numpy as np
+
+from neural_world import batch
+from neural_world import cache
+from neural_world import commons
+from neural_world.commons import Evaluator, NeuronType
+from neural_world.config import Configuration
+from neural_world.neural_network_engine import NeuralNetworkEngine
+from neural_world.benchmarks.steps import environment
+
+
+LOGGER = commons.logger()
+# numbers of intermediate neurons and of edges of spawned networks
+SIZES = ((1, 5), (5, 15), (10, 30), (20, 60), (40, 120))
+# per call evaluators, and batched ones with their evaluation function
+PER_CALL = (Evaluator.ASP, Evaluator.CIRCUIT)
+BATCHED = {evaluator: batch.EVALUATIONS[evaluator] for evaluator in
+           (Evaluator.NUMPY, Evaluator.ASP_BATCH, Evaluator.PARALLEL)}
+NETWORKS_PER_GROUP = 10
+
+
+def spawned(nb_inter:int, nb_edges:int, nb_network:int, seed:int) -> list:
+    """Return networks spawned by an incubator, with given number
+    of intermediate neurons and of edges"""
+    config = Configuration(
+        seed=seed, network_evaluator=Evaluator.CIRCUIT,
+        neuron_inter_mincount=nb_inter, neuron_inter_maxcount=nb_inter,
+        neuron_edges_mincount=nb_edges, neuron_edges_maxcount=nb_edges,
+    )
+    return [config.incubator.spawn().neural_network for _ in range(nb_network)]
+
+
+def built(nb_input:int, nb_inter:int, nb_output:int, edges:iter,
+          generator) -> NeuralNetworkEngine:
+    """Return a network of given sizes and edges, with random neuron types"""
+    types = NeuronType.xano()
+    return NeuralNetworkEngine(
+        nb_inter, inputs=((None, nb_input),), outputs=((None, nb_output),),
+        edges=tuple(edges), evaluator=Evaluator.CIRCUIT,
+        neuron_types=[types[idx] for idx in
+                      generator.integers(len(types), size=nb_inter + nb_output)],
+    )
+
+
+def pathological(nb_network:int, seed:int) -> dict:
+    """Return the groups of dense, deep and many outputs networks"""
+    generator = np.random.default_rng(seed)
+    def dense():  # all possible edges
+        nb_neuron = 8 + 20 + 8
+        return built(8, 20, 8, ((i, j) for i in range(1, nb_neuron + 1)
+                                for j in range(i + 1, nb_neuron + 1)), generator)
+    def deep():  # a chain from inputs to outputs
+        chain = range(5, 5 + 100)  # intermediate neurons
+        edges = [(i, chain[0]) for i in range(1, 5)]
+        edges += [(i, i + 1) for i in chain[:-1]]
+        edges += [(chain[-1], i) for i in range(chain[-1] + 1, chain[-1] + 5)]
+        return built(4, 100, 4, edges, generator)
+    def many_outputs():
+        nb_neuron = 8 + 10 + 64
+        return built(8, 10, 64, map(tuple, generator.integers(
+            1, nb_neuron, size=(200, 2), endpoint=True).tolist()), generator)
+    return {name: [build() for _ in range(nb_network)] for name, build
+            in (('dense', dense), ('deep', deep), ('many_outputs', many_outputs))}
+
+
+def corpus(nb_network:int=NETWORKS_PER_GROUP, seed:int=0, sizes:iter=SIZES) -> dict:
+    """Return the groups of networks of the benchmarks, by name"""
+    groups = {'spawned_{}_{}'.format(nb_inter, nb_edges):
+              spawned(nb_inter, nb_edges, nb_network, seed)
+              for nb_inter, nb_edges in sizes}
+    groups.update(pathological(nb_network, seed))
+    return groups
+
+
+def evaluated_by(network, evaluator:Evaluator) -> NeuralNetworkEngine:
+    """Return a network sharing the genome of given one, evaluated
+    by given evaluator"""
+    return NeuralNetworkEngine(network.nb_intermediate_neuron, network.inputs,
+                               network.outputs, evaluator=evaluator,
+                               genome=network.genome)
+
+
+def available(evaluator:Evaluator) -> bool:
+    """Return True if given evaluator works here"""
+    network = pathological(1, 0)['deep'][0]
+    try:
+        if evaluator in BATCHED:
+            BATCHED[evaluator]([network], np.zeros((1, network.nb_input_neuron), dtype=bool))
+        else:
+            evaluated_by(network, evaluator).output_from((False,) * network.nb_input_neuron)
+            NeuralNetworkEngine.cleaned(network.neural_network_all, evaluator)
+    except Exception as e:
+        LOGGER.warning('BENCHMARK: evaluator ' + evaluator.value + ' unavailable: ' + str(e))
+        return False
+    return True
+
+
+def timed(function, *args) -> (float, object):
+    """Return the time of the call of given function, and its result"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def case(group:str, backend:str, operation:str, seed:int, nb_call:int,
+         elapsed:float, mismatches:int) -> dict:
+    return {
+        'fields': {'benchmark': 'networks', 'group': group, 'backend': backend,
+                   'operation': operation},
+        'seed': seed,
+        'calls': nb_call,
+        'time': elapsed,
+        'time_per_call': elapsed / nb_call,
+        'mismatches': mismatches,
+    }
+
+
+def run_group(group:str, networks:list, evaluators:list, nb_input:int,
+              seed:int) -> iter:
+    """Yield the cases of given networks, evaluated each on given number
+    of random input states"""
+    generator = np.random.default_rng(seed)
+    inputs = [generator.random((nb_input, network.nb_input_neuron)) < 0.5
+              for network in networks]
+    # per call evaluations
+    reference = None
+    for evaluator in (e for e in evaluators if e in PER_CALL):
+        engines = [evaluated_by(network, evaluator) for network in networks]
+        for engine in engines:  # compilation
+            engine.output_from((False,) * engine.nb_input_neuron)
+        outputs, elapsed = [], 0.
+        for engine, states in zip(engines, inputs):
+            for line in states.tolist():
+                duration, output = timed(engine.output_from, line)
+                elapsed += duration
+                outputs.append(output)
+        reference = reference or outputs
+        yield case(group, evaluator.value, 'output_from', seed, len(outputs), elapsed,
+                   sum(out != ref for out, ref in zip(outputs, reference)))
+    # batched evaluations, of all networks and inputs at once
+    flat_networks = [network for network, states in zip(networks, inputs)
+                     for _ in states]
+    flat_inputs = batch.input_array([line for states in inputs for line in states.tolist()])
+    for evaluator in (e for e in evaluators if e in BATCHED):
+        elapsed, outputs = timed(BATCHED[evaluator], flat_networks, flat_inputs)
+        outputs = [tuple(line[:network.nb_output_neuron])
+                   for network, line in zip(flat_networks, outputs.tolist())]
+        reference = reference or outputs
+        yield case(group, evaluator.value, 'batch', seed, len(outputs), elapsed,
+                   sum(out != ref for out, ref in zip(outputs, reference)))
+    # cleaning, by ASP and in python
+    reference = None
+    for evaluator in (e for e in (Evaluator.ASP, Evaluator.CIRCUIT) if e in evaluators):
+        elapsed, cleaned = 0., []
+        for network in networks:
+            duration, atoms = timed(NeuralNetworkEngine.cleaned,
+                                    network.neural_network_all, evaluator)
+            elapsed += duration
+            cleaned.append(set(atoms.split('.')))
+        reference = reference or cleaned
+        yield case(group, 'asp' if evaluator.solving else 'python', 'cleaned', seed,
+                   len(networks), elapsed,
+                   sum(atoms != ref for atoms, ref in zip(cleaned, reference)))
+
+
+def run(results_file:str, nb_network:int=NETWORKS_PER_GROUP, nb_input:int=20,
+        seed:int=0, sizes:iter=SIZES, evaluators:iter=None) -> dict:
+    """Run the micro-benchmarks on the corpus, with given evaluators
+    (all available ones by default), and write the results in given file.
+    Return the results."""
+    groups = corpus(nb_network, seed, sizes)
+    evaluators = [e for e in (evaluators or tuple(PER_CALL) + tuple(BATCHED))
+                  if available(e)]
+    evaluators.sort(key=lambda e: e is not Evaluator.ASP)  # reference first
+    spec = {'networks': nb_network, 'inputs': nb_input, 'seed': seed,
+            'sizes': [list(size) for size in sizes],
+            'evaluators': [e.value for e in evaluators]}
+    results = {'environment': environment(), 'spec': spec, 'cases': []}
+    maxbytes = cache.REACTIONS.maxbytes
+    cache.REACTIONS.resize(0)  # each call must evaluate its network
+    try:
+        for group, networks in groups.items():
+            for result in run_group(group, networks, evaluators, nb_input, seed):
+                results['cases'].append(result)
+                LOGGER.info('BENCHMARK: {group} {backend} {operation}: '.format(
+                    **result['fields']) + '{:.1f} µs'.format(result['time_per_call'] * 1e6)
+                    + (' ({} MISMATCHES)'.format(result['mismatches'])
+                       if result['mismatches'] else ''))
+    finally:
+        cache.REACTIONS.resize(maxbytes)
+    with open(results_file + '.tmp', 'w') as fd:
+        json.dump(results, fd, indent=1, sort_keys=True)
+    os.replace(results_file + '.tmp', results_file)
+    return results
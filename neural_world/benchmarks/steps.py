@@ -0,0 +1,146 @@
+"""
+Benchmark of the step throughput of whole simulations.
+
+Cases are described by a specification, as for sweeps (see the sweep
+module): the configuration fields of each case are given by a base and
+a grid of values, and each case is run for each of the seeds, for the
+given number of steps:
+
+    {
+        "base": {"network_evaluator": "numpy"},
+        "grid": {"space_width": [40, 120], "init_indiv_count": [50, 500]},
+        "seeds": [0],
+        "steps": 30,
+        "allocation_steps": 3
+    }
+
+Each case runs in its own process, one after the other, and gives:
+
+    steps_per_second: number of steps computed by second
+    phases: time spent in each phase of the steps (see the profiling module)
+    peak_rss: maximal resident memory of the process, in bytes
+    allocations: peak and retained memory allocated by Python during
+                 allocation_steps additional steps, traced by tracemalloc
+
+Results are written in a JSON file, updated after each case.
+
+"""
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from neural_world import commons
+from neural_world import headless
+from neural_world import sweep
+from neural_world.engine import Engine
+from neural_world.info import VERSION
+from neural_world.profiling import PhaseProfiler
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None
+
+
+LOGGER = commons.logger()
+DEFAULT_SPEC = {
+    'base': {'network_evaluator': 'numpy', 'nutrient_regen': 0.01},
+    'grid': {
+        'space_width': [40, 120],
+        'space_height': [40, 120],
+        'init_indiv_count': [50, 500],
+        'neuron_inter_maxcount': [5, 20],
+        'neuron_edges_maxcount': [10, 30],
+    },
+    'seeds': [0],
+    'steps': 30,
+    'allocation_steps': 3,
+}
+
+
+def peak_rss() -> int:
+    """Return the maximal resident memory of the process, in bytes,
+    or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def environment() -> dict:
+    """Return the description of the machine running the benchmarks"""
+    return {
+        'neural_world': VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'nb_cpu': os.cpu_count(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def run_case(fields:dict, seed:int, steps:int, allocation_steps:int=0) -> dict:
+    """Run the simulation of given fields and seed, and return its measures"""
+    config = headless.configuration(fields, seed=seed, waiting_time=0)
+    engine = Engine.generate_from(config, headless.optional_observers(config))
+    engine.world.init_observers()
+    engine.world.populate()
+    engine.profiler = PhaseProfiler()
+    config.steps_number = steps
+    start = time.perf_counter()
+    engine.apply(config)
+    elapsed = time.perf_counter() - start
+    nb_step = engine.world.step_number
+    allocations = None
+    if allocation_steps and engine.world.have_life:
+        config.steps_number = allocation_steps
+        tracemalloc.start()
+        engine.apply(config)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocations = {'steps': engine.world.step_number - nb_step,
+                       'peak': peak, 'retained': retained}
+    engine.world.deinit()
+    return {
+        'fields': fields,
+        'seed': seed,
+        'steps': nb_step,
+        'population': engine.world.nb_individual,
+        'elapsed': elapsed,
+        'steps_per_second': nb_step / elapsed if elapsed else None,
+        'phases': {name: phase['time'] for name, phase
+                   in engine.profiler.stats.items()},
+        'peak_rss': peak_rss(),
+        'allocations': allocations,
+    }
+
+
+def run(spec:dict, results_file:str) -> dict:
+    """Run all cases of given specification, each one in a new process,
+    and write the results in given file. Return the results."""
+    context = multiprocessing.get_context('spawn')
+    level = logging.getLevelName(commons.log_level())  # for the new processes
+    results = {'environment': environment(), 'spec': spec, 'cases': []}
+    cases = tuple(sweep.runs(spec))
+    for idx, (key, fields, seed) in enumerate(cases, start=1):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context,
+                                 initializer=commons.log_level,
+                                 initargs=(level,)) as pool:
+            case = pool.submit(run_case, fields, seed, spec.get('steps', 30),
+                               spec.get('allocation_steps', 0)).result()
+        results['cases'].append(case)
+        LOGGER.info('BENCHMARK: case ' + str(idx) + '/' + str(len(cases)) + ' '
+                    + key + ': ' + str(round(case['steps_per_second'] or 0, 2))
+                    + ' steps/s')
+        with open(results_file + '.tmp', 'w') as fd:
+            json.dump(results, fd, indent=1, sort_keys=True)
+        os.replace(results_file + '.tmp', results_file)
+    return results
@@ -0,0 +1,113 @@
+"""
+Memoization of neural networks reactions.
+
+The output states of a network depend only on its cleaned atoms
+and on the states of its input neurons. The process-wide REACTIONS cache
+keeps the last computed reactions, keyed on a network fingerprint and
+the input states packed as an integer, and evicts the least recently used
+ones when their estimated memory exceeds its ceiling.
+
+"""
+import sys
+import hashlib
+from collections import OrderedDict
+
+import neural_world.default as default
+
+
+ENTRY_OVERHEAD = 100  # bytes of the slot and links of an entry, approximately
+
+
+def entry_size(key:tuple, outputs:tuple) -> int:
+    """Return the estimated memory of given entry, in bytes"""
+    return (ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(key[0])
+            + sys.getsizeof(key[1]) + sys.getsizeof(outputs))
+
+
+class ReactionCache:
+    """Bounded LRU mapping (network fingerprint, packed inputs) -> outputs.
+
+    The estimated memory of the entries, in bytes, is kept under maxbytes.
+    Counters of hits, misses and evictions are kept for statistics.
+    A ceiling of 0 disables the cache.
+
+    """
+
+    def __init__(self, maxbytes:int=default.REACTION_CACHE_MEMORY):
+        self.entries = OrderedDict()
+        self.maxbytes = maxbytes
+        self.nbytes = 0  # estimated memory of the entries
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def get(self, fingerprint:int, inputs:int):
+        """Return the cached outputs for given key, or None"""
+        key = fingerprint, inputs
+        try:
+            outputs = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return outputs
+
+    def put(self, fingerprint:int, inputs:int, outputs:tuple):
+        """Keep given outputs for given key, evicting
+        the least recently used entries if necessary"""
+        if self.maxbytes <= 0: return
+        key = fingerprint, inputs
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.nbytes -= entry_size(key, previous)
+        self.entries[key] = outputs
+        self.nbytes += entry_size(key, outputs)
+        self._evict()
+
+    def resize(self, maxbytes:int):
+        """Change the memory ceiling, evicting if necessary"""
+        self.maxbytes = maxbytes
+        self._evict()
+
+    def clear(self):
+        """Forget all entries and reset counters"""
+        self.entries.clear()
+        self.nbytes = 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def _evict(self):
+        while self.entries and self.nbytes > max(0, self.maxbytes):
+            key, outputs = self.entries.popitem(last=False)
+            self.nbytes -= entry_size(key, outputs)
+            self.evictions += 1
+
+    @property
+    def stats(self) -> dict:
+        """Counters and sizes of the cache"""
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits, 'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / requests if requests else 0.,
+            'size': len(self.entries),
+            'nbytes': self.nbytes, 'maxbytes': self.maxbytes,
+        }
+
+    def __str__(self):
+        return ' '.join(k + ':' + ('%.2f' % v if isinstance(v, float) else str(v))
+                        for k, v in self.stats.items())
+
+
+def fingerprint(network_atoms:str, *args) -> int:
+    """Return a 64 bits integer identifying given atoms and arguments"""
+    data = ' '.join((network_atoms, *(str(arg) for arg in args)))
+    digest = hashlib.blake2b(data.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def packed(ids:iter) -> int:
+    """Return the integer where the bits of given ids are set"""
+    return sum(1 << idn for idn in ids)
+
+
+# The cache shared by all neural networks of the process
+REACTIONS = ReactionCache()
@@ -0,0 +1,437 @@
+"""
+Checkpoints of a simulation: full snapshots of a World in a compact
+and versioned binary format, from which the simulation can be restored
+in another process.
+
+A snapshot is made of sections, written one after the other:
+
+    header: magic, version, step number, bounds, next individual id
+    meta: JSON of the counters of the world and of the neural networks,
+          and of the states of the random streams
+    genomes: each genome used by the individuals, written once
+    individuals: by chunks, as columns of fixed size values
+                 (id, genome, energy, max energy, coords, memory)
+    nutrients: the counts and energies of nutrients in all squares
+
+Individuals are streamed by chunks of CHUNK_SIZE, so that saving
+never builds the whole snapshot in memory. Genomes keep their cleaned
+network, so that loading a snapshot does not perform any cleaning.
+
+Between two snapshots, the changes of each step can be written as deltas,
+appended in a file following the snapshot (see DeltaLog):
+
+    header: step number, next individual id
+    meta: as in snapshots
+    deaths: ids of dead individuals
+    moves: ids and new coords of moved individuals
+    genomes: the genomes of born individuals unknown by the previous records
+    births: as the individuals of snapshots
+    updates: ids, energy, max energy and memory of the individuals
+             touched by an action
+    nutrients: index, count and energy of the modified squares
+
+The individuals concerned by a delta are given by a Journal of the actions
+executed by the engine. Restoring a step replays the deltas following
+the nearest snapshot (see restore).
+
+"""
+import io
+import os
+import re
+import json
+import struct
+
+import numpy as np
+
+from neural_world import actions
+from neural_world import commons
+from neural_world.commons import Direction, NeuronType
+from neural_world.genome import Genome
+from neural_world.individual import Individual
+from neural_world.neural_network import NeuralNetwork
+from neural_world.nutrient import Nutrient
+
+
+LOGGER = commons.logger()
+MAGIC = b'NWCKPT\x00\x00'
+DELTA_MAGIC = b'NWDELTA\x00'
+VERSION = 3
+HEADER = struct.Struct('<HQIIQ')  # version, step, width, height, next id
+DELTA = struct.Struct('<QQ')  # step, next id
+LENGTH = struct.Struct('<Q')
+GENOME = struct.Struct('<IIIII')  # nb input, inter, output, nb types, nb edges
+CHUNK_SIZE = 2**16
+# columns of individuals chunks
+COLUMNS = (('id', np.int64), ('genome', np.int32), ('energy', np.int64),
+           ('max_energy', np.int64), ('x', np.int32), ('y', np.int32),
+           ('memory_size', np.int16), ('nb_neighbor', np.int16))
+NEURON_TYPES = {ntype.value: ntype for ntype in NeuronType}
+# files of the checkpoints of a chain of deltas
+BASE_FILENAME, DELTA_FILENAME = 'checkpoint_{}.nwck', 'checkpoint_{}.nwdelta'
+REG_BASE_FILENAME = re.compile(r'^checkpoint_([0-9]+)\.nwck$')
+
+
+def write_blob(fd, data:bytes):
+    fd.write(LENGTH.pack(len(data)))
+    fd.write(data)
+
+
+def read_blob(fd) -> bytes:
+    length, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    return read_exactly(fd, length)
+
+
+def read_exactly(fd, size:int) -> bytes:
+    data = fd.read(size)
+    if len(data) != size:
+        raise ValueError('Truncated checkpoint')
+    return data
+
+
+def write_array(fd, values:iter, dtype, count:int):
+    fd.write(np.fromiter(values, dtype=dtype, count=count).tobytes())
+
+
+def read_array(fd, dtype, count:int) -> list:
+    return np.frombuffer(read_exactly(fd, np.dtype(dtype).itemsize * count),
+                         dtype=dtype).tolist()
+
+
+def write_memories(fd, networks:iter):
+    memory = np.fromiter((bit for network in networks for bit in network.memory),
+                         dtype=bool)
+    write_blob(fd, np.packbits(memory).tobytes())
+
+
+def read_memories(fd, memory_sizes:list) -> iter:
+    """Yield the memory of each given size"""
+    memory = np.unpackbits(np.frombuffer(read_blob(fd), dtype=np.uint8),
+                           count=sum(memory_sizes)).astype(bool).tolist()
+    offset = 0
+    for memory_size in memory_sizes:
+        yield memory[offset:offset+memory_size]
+        offset += memory_size
+
+
+def write_meta(fd, world):
+    """Write in JSON the data of given world that are not arrays,
+    statistics being sorted"""
+    write_blob(fd, json.dumps({
+        'object_counter': {cls.__name__: nb for cls, nb in world.object_counter.items()},
+        'directions': {d.name: nb for d, nb in sorted(NeuralNetwork.DIRECTIONS.items(),
+                                                      key=lambda item: item[0].name)},
+        'memories': sorted(NeuralNetwork.MEMORIES.items()),
+        'seed': world.random_streams.seed,
+        'streams': world.random_streams.state,
+    }).encode())
+
+
+def read_meta(fd) -> dict:
+    """Return the data written by write_meta()"""
+    return json.loads(read_blob(fd).decode())
+
+
+def restore_meta(data:dict, world):
+    """Restore in given world the data returned by read_meta()"""
+    classes = {cls.__name__: cls for cls in (Individual, Nutrient)}
+    world.object_counter.clear()
+    world.object_counter.update({classes[name]: nb for name, nb
+                                 in data['object_counter'].items()})
+    NeuralNetwork.DIRECTIONS.clear()
+    NeuralNetwork.DIRECTIONS.update({Direction[name]: nb for name, nb
+                                     in data['directions'].items()})
+    NeuralNetwork.MEMORIES.clear()
+    NeuralNetwork.MEMORIES.update(dict(data['memories']))
+    world.random_streams.seed = data['seed']
+    world.random_streams.state = data['streams']
+
+
+def write_genomes(fd, genomes:iter):
+    genomes = tuple(genomes)
+    fd.write(LENGTH.pack(len(genomes)))
+    for genome in genomes:
+        fd.write(GENOME.pack(genome.nb_input_neuron, genome.nb_intermediate_neuron,
+                             genome.nb_output_neuron, len(genome.neuron_types),
+                             len(genome.edges)))
+        fd.write(''.join(ntype.value for ntype in genome.neuron_types).encode())
+        fd.write(np.array(genome.edges, dtype=np.int32).reshape(-1, 2).tobytes())
+        write_blob(fd, genome.neural_network.encode())
+
+
+def read_genomes(fd, evaluator) -> iter:
+    nb_genome, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    for _ in range(nb_genome):
+        nb_input, nb_inter, nb_output, nb_type, nb_edge = GENOME.unpack(
+            read_exactly(fd, GENOME.size))
+        neuron_types = tuple(NEURON_TYPES[value] for value in
+                             read_exactly(fd, nb_type).decode())
+        edges = np.frombuffer(read_exactly(fd, 8 * nb_edge), dtype=np.int32)
+        edges = tuple(map(tuple, edges.reshape(-1, 2).tolist()))
+        cleaned_network = read_blob(fd).decode()
+        yield Genome.of(nb_input, nb_inter, nb_output, neuron_types, edges,
+                        evaluator, cleaned_network)
+
+
+def write_individuals(fd, individuals:tuple, genomes:dict):
+    """Write given (individual, coords), by chunks"""
+    fd.write(LENGTH.pack(len(individuals)))
+    for start in range(0, len(individuals), CHUNK_SIZE):
+        chunk = individuals[start:start+CHUNK_SIZE]
+        columns = (
+            (indiv.unique_id for indiv, _ in chunk),
+            (genomes[indiv.genome] for indiv, _ in chunk),
+            (indiv.energy for indiv, _ in chunk),
+            (indiv.neural_network.max_energy for indiv, _ in chunk),
+            (x for _, (x, y) in chunk),
+            (y for _, (x, y) in chunk),
+            (indiv.memory_size for indiv, _ in chunk),
+            (indiv.neural_network.nb_neighbor for indiv, _ in chunk),
+        )
+        for (_, dtype), values in zip(COLUMNS, columns):
+            write_array(fd, values, dtype, len(chunk))
+        write_memories(fd, (indiv.neural_network for indiv, _ in chunk))
+
+
+def read_individuals(fd, world, genomes:list) -> iter:
+    """Add to given world the individuals read in given file, and yield them"""
+    nb_individual, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    for start in range(0, nb_individual, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, nb_individual - start)
+        columns = [read_array(fd, dtype, size) for _, dtype in COLUMNS]
+        memories = read_memories(fd, columns[6])
+        for idn, gidx, energy, max_energy, x, y, memory_size, nb_neighbor in zip(*columns):
+            genome = genomes[gidx]
+            network = NeuralNetwork(
+                nb_inter_neuron=genome.nb_intermediate_neuron,
+                memory_size=memory_size, nb_neighbor=nb_neighbor,
+                evaluator=world.incubator.network_evaluator, genome=genome,
+            )
+            network.memory = next(memories)
+            network.max_energy = max_energy
+            indiv = Individual(network, energy)
+            indiv.unique_id = idn
+            world.add(indiv, (x, y))
+            yield indiv
+
+
+def save(world, fd) -> dict:
+    """Write a snapshot of given world in given binary file.
+    Return the index of each written genome."""
+    fd.write(MAGIC)
+    fd.write(HEADER.pack(VERSION, world.step_number, *world.space.bounds,
+                         Individual.next_individual_id))
+    write_meta(fd, world)
+    individuals = tuple(world.individuals.items())
+    genomes = {}  # genome: index
+    for indiv, _ in individuals:
+        genomes.setdefault(indiv.genome, len(genomes))
+    write_genomes(fd, genomes)
+    write_individuals(fd, individuals, genomes)
+    fd.write(world.space.nutrients.counts.tobytes())
+    fd.write(world.space.nutrients.energy.tobytes())
+    return genomes
+
+
+def load(fd, world) -> list:
+    """Restore in given world, new and configured but not populated,
+    the snapshot read in given binary file, and return its genomes.
+    Raise ValueError if the snapshot is invalid or of another space."""
+    if fd.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Not a checkpoint')
+    version, step, width, height, next_id = HEADER.unpack(read_exactly(fd, HEADER.size))
+    if version != VERSION:
+        raise ValueError('Unsupported checkpoint version ' + str(version))
+    if (width, height) != tuple(world.space.bounds):
+        raise ValueError('Checkpoint of a space ' + str((width, height))
+                         + ' instead of ' + str(tuple(world.space.bounds)))
+    data = read_meta(fd)
+    genomes = list(read_genomes(fd, world.incubator.network_evaluator))
+    nb_individual = sum(1 for _ in read_individuals(fd, world, genomes))
+    nutrients = world.space.nutrients
+    nutrients.counts[...] = np.frombuffer(read_exactly(fd, nutrients.counts.nbytes),
+                                          dtype=nutrients.counts.dtype).reshape(width, height)
+    nutrients.energy[...] = np.frombuffer(read_exactly(fd, nutrients.energy.nbytes),
+                                          dtype=nutrients.energy.dtype).reshape(width, height)
+    world.step_number = step
+    Individual.next_individual_id = next_id
+    restore_meta(data, world)
+    LOGGER.info('CHECKPOINT: restored step ' + str(step) + ' with '
+                + str(nb_individual) + ' individuals and '
+                + str(len(genomes)) + ' genomes')
+    return genomes
+
+
+class Journal:
+    """Individuals touched by the actions executed by an engine
+    since the last delta"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.touched = {}  # individual: None, in order of first action
+        self.moved = {}  # individual: coords before its first move
+        self.removed = []
+
+    def record(self, commands:iter):
+        for command in commands:
+            indiv = getattr(command, 'obj', getattr(command, 'indiv', None))
+            if not getattr(indiv, 'is_individual', False):
+                continue
+            self.touched[indiv] = None
+            if isinstance(command, actions.MoveAction):
+                self.moved.setdefault(indiv, command.coords)
+            elif isinstance(command, actions.RemoveAction):
+                self.removed.append(indiv)
+
+
+class DeltaLog:
+    """Writer of the deltas following the snapshot of given world,
+    whose genomes are indexed as returned by save()"""
+
+    def __init__(self, filename:str, world, genomes:dict):
+        self.file = open(filename, 'wb')
+        self.file.write(DELTA_MAGIC)
+        self.file.write(LENGTH.pack(world.step_number))
+        self.file.flush()
+        self.genomes = dict(genomes)
+        self.next_id = Individual.next_individual_id  # first id of next births
+        self.counts = world.space.nutrients.counts.copy()
+        self.energy = world.space.nutrients.energy.copy()
+
+    def births(self, world) -> tuple:
+        """Return (individual, coords) born since the last delta:
+        the registry ends with them, in order of arrival"""
+        births = []
+        for indiv in reversed(world.individuals):
+            if indiv.unique_id < self.next_id:
+                break
+            births.append((indiv, world.individuals[indiv]))
+        return tuple(reversed(births))
+
+    def write(self, world, journal:Journal):
+        """Append the delta of given world since the last delta,
+        according to given journal, which is then cleared"""
+        individuals = world.individuals
+        births = self.births(world)
+        new_genomes = {}
+        for indiv, _ in births:
+            if indiv.genome not in self.genomes:
+                new_genomes[indiv.genome] = self.genomes[indiv.genome] = len(self.genomes)
+        deaths = [indiv.unique_id for indiv in journal.removed
+                  if indiv not in individuals and indiv.unique_id < self.next_id]
+        moves = [(indiv.unique_id, individuals[indiv]) for indiv, coords
+                 in journal.moved.items()
+                 if indiv in individuals and individuals[indiv] != world.wrapped(coords)]
+        updated = [indiv for indiv in journal.touched
+                   if indiv in individuals and indiv.unique_id < self.next_id]
+        nutrients = world.space.nutrients
+        cells = np.flatnonzero((nutrients.counts != self.counts)
+                               | (nutrients.energy != self.energy))
+        # the delta is written at once, so that an interruption leaves a cut record
+        fd = io.BytesIO()
+        fd.write(DELTA.pack(world.step_number, Individual.next_individual_id))
+        write_meta(fd, world)
+        fd.write(LENGTH.pack(len(deaths)))
+        write_array(fd, deaths, np.int64, len(deaths))
+        fd.write(LENGTH.pack(len(moves)))
+        write_array(fd, (idn for idn, _ in moves), np.int64, len(moves))
+        write_array(fd, (x for _, (x, y) in moves), np.int32, len(moves))
+        write_array(fd, (y for _, (x, y) in moves), np.int32, len(moves))
+        write_genomes(fd, new_genomes)
+        write_individuals(fd, births, self.genomes)
+        fd.write(LENGTH.pack(len(updated)))
+        write_array(fd, (indiv.unique_id for indiv in updated), np.int64, len(updated))
+        write_array(fd, (indiv.energy for indiv in updated), np.int64, len(updated))
+        write_array(fd, (indiv.neural_network.max_energy for indiv in updated),
+                    np.int64, len(updated))
+        write_memories(fd, (indiv.neural_network for indiv in updated))
+        fd.write(LENGTH.pack(len(cells)))
+        fd.write(cells.astype(np.int64).tobytes())
+        fd.write(nutrients.counts.ravel()[cells].tobytes())
+        fd.write(nutrients.energy.ravel()[cells].tobytes())
+        write_blob(self.file, fd.getvalue())
+        self.file.flush()
+        self.next_id = Individual.next_individual_id
+        self.counts[...], self.energy[...] = nutrients.counts, nutrients.energy
+        journal.clear()
+
+    def close(self):
+        self.file.close()
+
+
+def load_delta(fd, world, genomes:list, individuals:dict) -> int:
+    """Apply to given world the delta read in given file, and return its step.
+    The genomes list and the individuals by id are updated."""
+    step, next_id = DELTA.unpack(read_exactly(fd, DELTA.size))
+    data = read_meta(fd)
+    nb_death, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    for idn in read_array(fd, np.int64, nb_death):
+        indiv = individuals.pop(idn)
+        world.remove(indiv, world.individuals[indiv])
+    nb_move, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    ids, xs, ys = (read_array(fd, dtype, nb_move) for dtype in (np.int64, np.int32, np.int32))
+    for idn, x, y in zip(ids, xs, ys):
+        indiv = individuals[idn]
+        world.space.remove(indiv, world.individuals[indiv])
+        world.space.add(indiv, (x, y))
+        world.individuals[indiv] = (x, y)
+    genomes.extend(read_genomes(fd, world.incubator.network_evaluator))
+    individuals.update((indiv.unique_id, indiv) for indiv
+                       in read_individuals(fd, world, genomes))
+    nb_update, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    updated = [individuals[idn] for idn in read_array(fd, np.int64, nb_update)]
+    energies, max_energies = (read_array(fd, np.int64, nb_update) for _ in range(2))
+    memories = read_memories(fd, [indiv.memory_size for indiv in updated])
+    for indiv, energy, max_energy, memory in zip(updated, energies, max_energies, memories):
+        indiv.energy = energy
+        indiv.neural_network.max_energy = max_energy
+        indiv.neural_network.memory = memory
+    nb_cell, = LENGTH.unpack(read_exactly(fd, LENGTH.size))
+    cells = np.frombuffer(read_exactly(fd, 8 * nb_cell), dtype=np.int64)
+    nutrients = world.space.nutrients
+    for grid in (nutrients.counts, nutrients.energy):
+        grid.ravel()[cells] = np.frombuffer(read_exactly(fd, grid.itemsize * nb_cell),
+                                            dtype=grid.dtype)
+    world.step_number = step
+    Individual.next_individual_id = next_id
+    restore_meta(data, world)
+    return step
+
+
+def base_steps(directory:str) -> list:
+    """Return the sorted steps of the snapshots of a chain in given directory"""
+    return sorted(int(match.group(1)) for match in map(REG_BASE_FILENAME.match,
+                                                       os.listdir(directory))
+                  if match)
+
+
+def restore(directory:str, world, step:int=None) -> int:
+    """Restore in given world, new and configured but not populated,
+    the given step (the last one by default) from the snapshots and deltas
+    written in given directory, and return the restored step.
+    Raise ValueError if the step is not available."""
+    bases = [base for base in base_steps(directory) if step is None or base <= step]
+    if not bases:
+        raise ValueError('No checkpoint before step ' + str(step) + ' in ' + directory)
+    with open(os.path.join(directory, BASE_FILENAME.format(bases[-1])), 'rb') as fd:
+        genomes = load(fd, world)
+    individuals = {indiv.unique_id: indiv for indiv in world.individuals}
+    filename = os.path.join(directory, DELTA_FILENAME.format(bases[-1]))
+    if os.path.exists(filename) and step != world.step_number:
+        with open(filename, 'rb') as fd:
+            if fd.read(len(DELTA_MAGIC)) != DELTA_MAGIC:
+                raise ValueError(filename + ' is not a delta checkpoint')
+            read_exactly(fd, LENGTH.size)  # step of the snapshot
+            while step is None or world.step_number < step:
+                try:
+                    record = read_blob(fd)
+                except ValueError:  # end of deltas, or interrupted record
+                    break
+                load_delta(io.BytesIO(record), world, genomes, individuals)
+    if step is not None and world.step_number != step:
+        raise ValueError('Step ' + str(step) + ' is not in the checkpoints of '
+                         + directory + ', that stop at ' + str(world.step_number))
+    LOGGER.info('CHECKPOINT: restored step ' + str(world.step_number)
+                + ' from ' + directory)
+    return world.step_number
@@ -0,0 +1,113 @@
+"""
+Compilation of neural networks into boolean circuits, evaluated in python.
+
+A Circuit gives exactly the same up/1 output atoms as the network_running.lp
+ASP program, without any call to a solver.
+
+"""
+import heapq
+from collections import defaultdict
+
+from neural_world import atoms
+from neural_world.commons import NeuronType
+
+
+# Gates semantic, as defined in network_running.lp:
+#  each gate receive the number of up predecessors and the number of predecessors.
+GATES = {
+    # exactly one up-state predecessor
+    NeuronType.XOR: lambda nb_up, nb_pred: nb_up == 1,
+    # none of the predecessors is down
+    NeuronType.AND: lambda nb_up, nb_pred: nb_up == nb_pred,
+    # all predecessors are down
+    NeuronType.NOT: lambda nb_up, nb_pred: nb_up == 0,
+    # at least one predecessor is up
+    NeuronType.OR : lambda nb_up, nb_pred: nb_up > 0,
+}
+
+
+class Circuit:
+    """Topologically ordered program of XOR/AND/NOT/OR gates,
+    compiled from the atoms of a neural network.
+
+    The gates are kept as a tuple of (neuron id, type, predecessors ids),
+    where each gate appears after all its predecessors.
+
+    Expected atoms are these of a cleaned network:
+        - neuron(I,T): neuron of id I is of type T (T in IXANO)
+        - output(I): neuron of id I is an output neuron
+        - edge(I,J): neuron of id I is a predecessor of neuron of id J
+
+    """
+
+    def __init__(self, network_atoms:str):
+        neurons, outputs = {}, set()
+        predecessors = defaultdict(set)
+        for atom in (atoms.split(a.strip()) for a in network_atoms.split('.')):
+            if atom is None: continue
+            name, args = atom
+            if name == 'neuron' and len(args) == 2:
+                neurons[int(args[0])] = NeuronType(args[1])
+            elif name == 'output' and len(args) == 1:
+                outputs.add(int(args[0]))
+            elif name == 'edge' and len(args) == 2:
+                predecessors[int(args[1])].add(int(args[0]))
+
+        self.inputs = frozenset(idn for idn, ntype in neurons.items()
+                                if ntype is NeuronType.INPUT)
+        self.outputs = frozenset(outputs)
+        self.levels = {idn: 0 for idn in self.inputs}
+        self.gates = tuple(
+            (idn, neurons[idn], tuple(sorted(p for p in predecessors[idn]
+                                             if p in neurons)))
+            for idn in Circuit.topological_order(neurons, predecessors)
+            if idn not in self.inputs
+        )
+        # level of a gate: length of the longest path from an input neuron
+        for idn, _, preds in self.gates:
+            self.levels[idn] = 1 + max((self.levels[p] for p in preds), default=0)
+
+    def __call__(self, up_inputs) -> frozenset:
+        """Return the ids of up-state output neurons, according to
+        given ids of up-state input neurons."""
+        up = set(idn for idn in up_inputs if idn in self.inputs)
+        for idn, ntype, preds in self.gates:
+            nb_up = sum(1 for pred in preds if pred in up)
+            if GATES[ntype](nb_up, len(preds)):
+                up.add(idn)
+        return frozenset(up & self.outputs)
+
+    @property
+    def depth(self):
+        """Number of gate levels to compute before knowing all outputs"""
+        return max(self.levels.values(), default=0)
+
+    @staticmethod
+    def topological_order(neurons:dict, predecessors:dict) -> tuple:
+        """Return neurons ids, ordered such as each neuron comes after
+        its predecessors. Ties are broken by increasing id.
+
+        A ValueError is raised if the network contains a cycle,
+        as the ASP semantic gives no model in that case.
+
+        """
+        successors = defaultdict(set)
+        nb_pred = {idn: 0 for idn in neurons}
+        for idn in neurons:
+            for pred in predecessors.get(idn, ()):
+                if pred in neurons:
+                    successors[pred].add(idn)
+                    nb_pred[idn] += 1
+        order, ready = [], [idn for idn, nb in nb_pred.items() if nb == 0]
+        heapq.heapify(ready)
+        while ready:
+            idn = heapq.heappop(ready)
+            order.append(idn)
+            for succ in successors[idn]:
+                nb_pred[succ] -= 1
+                if nb_pred[succ] == 0:
+                    heapq.heappush(ready, succ)
+        if len(order) != len(neurons):
+            raise ValueError('Neural network contains a cycle: '
+                             + str(predecessors))
+        return tuple(order)
@@ -0,0 +1,85 @@
+"""
+Cleaning of neural networks in python, giving the same atoms
+as the network_cleaning.lp ASP program.
+
+Edges targeting an input neuron are dropped, others are oriented
+from lower to higher ids, and only neurons both reachable from an input neuron
+and co-reachable to an output neuron are kept.
+Instead of the quadratic connected/2 closure of the ASP program,
+two linear graph traversals are performed.
+
+"""
+import itertools
+from collections import defaultdict
+
+from neural_world import atoms
+from neural_world.commons import NeuronType
+
+
+def cleaned(network_atoms:str) -> str:
+    """Return a cleaned version of given neural network atoms"""
+    neurons, outputs, edges = parsed(network_atoms)
+
+    neuron_ids = set(idn for idn, _ in neurons)
+    inputs = set(idn for idn, ntype in neurons if ntype == NeuronType.INPUT.value)
+    # orientation: from lower to higher id, once edges
+    #  originally targeting an input neuron are dropped
+    oriented = set(
+        (min(source, target), max(source, target)) for source, target in edges
+        if source != target and target not in inputs
+        and source in neuron_ids and target in neuron_ids
+    )
+    successors, predecessors = defaultdict(set), defaultdict(set)
+    for pred, succ in oriented:
+        successors[pred].add(succ)
+        predecessors[succ].add(pred)
+
+    reachable = (traversed(inputs, successors)
+                 & traversed(outputs & neuron_ids, predecessors))
+    return joined(
+        (neuron for neuron in neurons if neuron[0] in reachable),
+        outputs & reachable,
+        (edge for edge in oriented if edge[0] in reachable and edge[1] in reachable),
+    )
+
+
+def normalized(network_atoms:str) -> str:
+    """Return given network atoms in the order of the cleaned ones,
+    whatever the cleaning that gave them"""
+    return joined(*parsed(network_atoms))
+
+
+def parsed(network_atoms:str) -> (set, set, set):
+    """Return neurons (id, type), ids of outputs and edges of given atoms"""
+    neurons, outputs, edges = set(), set(), set()
+    for atom in (atoms.split(a.strip()) for a in network_atoms.split('.')):
+        if atom is None: continue
+        name, args = atom
+        if name == 'neuron' and len(args) == 2:
+            neurons.add((int(args[0]), args[1]))
+        elif name == 'output' and len(args) == 1:
+            outputs.add(int(args[0]))
+        elif name == 'edge' and len(args) == 2:
+            edges.add(tuple(int(arg) for arg in args))
+    return neurons, outputs, edges
+
+
+def joined(neurons:iter, outputs:iter, edges:iter) -> str:
+    """Return the atoms of given neurons, outputs and edges, sorted"""
+    kept = tuple(itertools.chain(
+        ('neuron(%d,%s)' % neuron for neuron in sorted(neurons)),
+        ('output(%d)' % idn for idn in sorted(outputs)),
+        ('edge(%d,%d)' % edge for edge in sorted(edges)),
+    ))
+    return '.'.join(kept) + ('.' if len(kept) else '')
+
+
+def traversed(sources:set, successors:dict) -> set:
+    """Return the set of nodes reachable from given ones, including them"""
+    visited, stack = set(sources), list(sources)
+    while stack:
+        for succ in successors[stack.pop()]:
+            if succ not in visited:
+                visited.add(succ)
+                stack.append(succ)
+    return visited
@@ -3,3 +3,6 @@ from .direction import *
 from .neurontype import *
 from .logs import *
 from .configurable import *
+from .evaluator import *
+from .spacebackend import *
+from .overflow import *
@@ -16,6 +16,7 @@ DIR_ARCHIVES = DIR_PACKAGE + 'archives/'
 
 # FILES
 FILE_ASP_RUNNING  = DIR_ASP + 'network_running.lp'
+FILE_ASP_RUNNING_BATCH = DIR_ASP + 'network_running_batch.lp'
 FILE_ASP_CLEANING = DIR_ASP + 'network_cleaning.lp'
 
 
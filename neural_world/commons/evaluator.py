@@ -0,0 +1,59 @@
+"""
+Definition of the Evaluator enumeration.
+
+"""
+from enum import Enum
+
+
+class Evaluator(Enum):
+    """Engines able to compute the outputs of a neural network.
+
+    ASP is the reference implementation, running network_running.lp
+    through a solver. CIRCUIT compiles the network in a python
+    boolean circuit, giving the same results without any solver call.
+    NUMPY evaluates the circuits of all individuals at once, at each step.
+    ASP_BATCH evaluates the networks of all individuals in a single
+    solving of network_running_batch.lp, at each step.
+    PARALLEL shares the networks of all individuals between worker processes,
+    each one evaluating its part as NUMPY, at each step.
+    TILED splits the world in tiles, each one owned by a worker process
+    that computes the steps of the individuals and nutrients in it,
+    the world of the main process being updated at each step.
+
+    """
+    ASP       = 'asp'
+    CIRCUIT   = 'circuit'
+    NUMPY     = 'numpy'
+    ASP_BATCH = 'asp_batch'
+    PARALLEL  = 'parallel'
+    TILED     = 'tiled'
+
+    @property
+    def batched(self):
+        """True if all networks are evaluated together at each step"""
+        return self in (Evaluator.NUMPY, Evaluator.ASP_BATCH, Evaluator.PARALLEL)
+
+    @property
+    def multiprocess(self):
+        """True if networks are evaluated by worker processes"""
+        return self in (Evaluator.PARALLEL, Evaluator.TILED)
+
+    @property
+    def tiled(self):
+        """True if the reactions are computed by tiles of the space"""
+        return self is Evaluator.TILED
+
+    @property
+    def solving(self):
+        """True if networks are evaluated by an ASP solver"""
+        return self in (Evaluator.ASP, Evaluator.ASP_BATCH)
+
+    @property
+    def compiling(self):
+        """True if networks are compiled in circuits by the main process"""
+        return self in (Evaluator.CIRCUIT, Evaluator.NUMPY)
+
+    @staticmethod
+    def names():
+        """Return values of Evaluators, as expected by the Configuration"""
+        return (e.value for e in Evaluator)
@@ -0,0 +1,25 @@
+"""
+Definition of the Overflow enumeration.
+
+"""
+from enum import Enum
+
+
+class Overflow(Enum):
+    """Policies of an asynchronous observer receiving a signal
+    while its queue is full.
+
+    BLOCK waits for the observer to consume a signal.
+    DROP_OLDEST drops the oldest signal of the queue.
+    COALESCE drops the oldest new step signal of the queue, superseded
+    by the new one, or waits if the queue only holds other signals.
+
+    """
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop_oldest'
+    COALESCE = 'coalesce'
+
+    @staticmethod
+    def names():
+        """Yield values of Overflows, as expected by the Configuration"""
+        return (o.value for o in Overflow)
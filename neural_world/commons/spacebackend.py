@@ -0,0 +1,22 @@
+"""
+Definition of the SpaceBackend enumeration.
+
+"""
+from enum import Enum
+
+
+class SpaceBackend(Enum):
+    """Implementations of the space of a World.
+
+    DICT is the reference, keeping a set of objects for each square.
+    GRID keeps individual ids and nutrient counts and energies in numpy
+    arrays, with a constant memory per square.
+
+    """
+    DICT = 'dict'
+    GRID = 'grid'
+
+    @staticmethod
+    def names():
+        """Yield values of SpaceBackends, as expected by the Configuration"""
+        return (b.value for b in SpaceBackend)
@@ -8,8 +8,9 @@ from collections import ChainMap
 
 import neural_world.default as default
 import neural_world.commons as commons
+from neural_world.rng import RandomStreams
 from neural_world.mutator import Mutator
-from neural_world.commons import NeuronType
+from neural_world.commons import NeuronType, Evaluator, SpaceBackend, Overflow
 from neural_world.incubator import Incubator
 
 
@@ -26,6 +27,9 @@ def user_compliant_bool(x):
         return bool(int(x))
     except ValueError:
         return 't' in x.lower()
+# Integer or None
+def optional_int(x):
+    return None if x in (None, '', 'None') else int(x)
 
 
 class Configuration:
@@ -55,14 +59,19 @@ class Configuration:
         'terminated'       : Field(value=False, type=user_compliant_bool),
         'memory_min_size'  : Field(value=default.MEMORY_MIN_SIZE, type=int),
         'memory_max_size'  : Field(value=default.MEMORY_MAX_SIZE, type=int),
+        'reaction_cache_memory' : Field(value=default.REACTION_CACHE_MEMORY, type=int),
+        'nb_workers'       : Field(value=default.NB_WORKERS, type=int),
     }
     GENERATED_FIELDS = {
         'mutator'   : Field(value=None, type=free_type),
         'incubator' : Field(value=None, type=free_type),
+        'random_streams' : Field(value=None, type=free_type),
     }
     UNMUTABLE_FIELDS = {
+        'seed'                     : Field(value=default.SEED, type=optional_int),
         'space_width'              : Field(value=default.SPACE_WIDTH, type=int),
         'space_height'             : Field(value=default.SPACE_HEIGHT, type=int),
+        'space_backend'            : Field(value=default.SPACE_BACKEND, type=SpaceBackend),
         'neighbor_access'          : Field(value=default.NEIGHBOR_ACCESS, type=free_type),
         'neuron_output_type'       : Field(value=default.OUTPUT_NEURON_TYPE, type=free_type),
         'life_division_min_energy' : Field(value=default.LIFE_DIVISION_MIN_ENERGY, type=int),
@@ -72,7 +81,16 @@ class Configuration:
         'neuron_inter_maxcount'    : Field(value=default.NEURON_INTER_MAXCOUNT, type=int),
         'neuron_edges_mincount'    : Field(value=default.NEURON_EDGES_MINCOUNT, type=int),
         'neuron_edges_maxcount'    : Field(value=default.NEURON_EDGES_MAXCOUNT, type=int),
+        'network_evaluator'        : Field(value=default.NETWORK_EVALUATOR, type=Evaluator),
         'dir_archive_simulation'   : Field(value=default.DIR_SIMULATION_ARCHIVE, type=str),
+        'shared_state'             : Field(value=default.SHARED_STATE, type=str),
+        'async_observers'          : Field(value=default.ASYNC_OBSERVERS, type=user_compliant_bool),
+        'observer_queue_size'      : Field(value=default.OBSERVER_QUEUE_SIZE, type=int),
+        'observer_overflow'        : Field(value=default.OBSERVER_OVERFLOW, type=Overflow),
+        'deferred_archive'         : Field(value=default.DEFERRED_ARCHIVE, type=user_compliant_bool),
+        'event_log'                : Field(value=default.EVENT_LOG, type=user_compliant_bool),
+        'checkpoint_interval'      : Field(value=default.CHECKPOINT_INTERVAL, type=int),
+        'checkpoint_deltas'        : Field(value=default.CHECKPOINT_DELTAS, type=user_compliant_bool),
     }
     ALL_FIELDS = ChainMap({}, MUTABLE_FIELDS, UNMUTABLE_FIELDS, GENERATED_FIELDS)
 
@@ -132,6 +150,8 @@ class Configuration:
             self.nutrient_energy  >= 0,
             self.nutrient_density >= 0.,
             self.nutrient_regen   >= 0.,
+            self.reaction_cache_memory >= 0,
+            self.nb_workers >= 0,
             # non mutable fields
             self.space_width  > 0,
             self.space_height > 0,
@@ -140,12 +160,20 @@ class Configuration:
             isinstance(self.init_indiv_density, float),
             self.life_division_min_energy >= 0,
             isinstance(self.neuron_output_type, NeuronType),
+            isinstance(self.network_evaluator, Evaluator),
+            isinstance(self.space_backend, SpaceBackend),
+            isinstance(self.observer_overflow, Overflow),
+            self.observer_queue_size > 0,
+            self.checkpoint_interval >= 0,
+            self.seed is None or self.seed >= 0,
             callable(self.neighbor_access),
         ))
 
 
     def postprocess_data(self):
         """Generate fields that needs it"""
+        if self._random_streams is None:  # streams are kept between steps
+            self._random_streams = RandomStreams(self.seed)
         self._mutator   = Mutator(self)
         self._incubator = Incubator(self)
 
@@ -6,7 +6,7 @@ import os
 import time
 
 import neural_world.commons as commons
-from neural_world.commons import Direction, NeuronType
+from neural_world.commons import Direction, NeuronType, Evaluator, SpaceBackend, Overflow
 from neural_world.neighbors import moore, vonneumann
 
 
@@ -15,6 +15,7 @@ STEP_NUMBER_PER_RUN = 100
 WAITING_TIME = 0.1
 
 # Per simulation values
+SEED = None  # seed of the random streams (None: drawn by the random module)
 DIR_SIMULATION_ARCHIVE = os.path.join(commons.DIR_ARCHIVES,
                                       'sim_' + str(int(time.time())))
 
@@ -34,6 +35,26 @@ NEURON_INTER_MINCOUNT = 1
 NEURON_INTER_MAXCOUNT = 20
 NEURON_EDGES_MINCOUNT = 5
 NEURON_EDGES_MAXCOUNT = 30
+# Neural network evaluation: ASP is the reference, CIRCUIT the fast one
+NETWORK_EVALUATOR = Evaluator.ASP
+# Memory ceiling of the memoized network reactions, in bytes (0 disables the cache)
+REACTION_CACHE_MEMORY = 2**24
+# Number of worker processes of the PARALLEL evaluator (0: one per core)
+NB_WORKERS = 0
+# Name of the shared memory publishing the world state (empty: not published)
+SHARED_STATE = ''
+# Dispatch of signals to observers in their own threads, through bounded queues
+ASYNC_OBSERVERS = False
+OBSERVER_QUEUE_SIZE = 64
+OBSERVER_OVERFLOW = Overflow.BLOCK
+# Archive networks in a single file, and render them at the end of the simulation
+DEFERRED_ARCHIVE = False
+# Write the events of the simulation in a binary log, in the simulation archive
+EVENT_LOG = False
+# Number of steps between two checkpoints of the simulation (0: no checkpoint)
+CHECKPOINT_INTERVAL = 0
+# Write the changes of each step between two checkpoints, allowing to restore any step
+CHECKPOINT_DELTAS = False
 
 # Global Life
 LIFE_DIVISION_MIN_ENERGY = 20
@@ -46,6 +67,8 @@ NUTRIENT_INITIAL_DENSITY = 0.6
 # World space constants and refs
 SPACE_WIDTH = 20
 SPACE_HEIGHT = 20
+# Storage of objects in space: DICT is the reference, GRID the compact one
+SPACE_BACKEND = SpaceBackend.DICT
 
 # Evolution constants
 MUTATION_RATE = 0.01
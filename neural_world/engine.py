@@ -2,11 +2,19 @@
 Invoker of actions, from View onto World.
 
 """
+import os
 import time
 
+import neural_world.batch as batch
+import neural_world.cache as cache
+import neural_world.checkpoint as checkpoint
+import neural_world.parallel as parallel
+import neural_world.tiling as tiling
 import neural_world.commons as commons
 import neural_world.actions as action
+from neural_world.profiling import NULL_PROFILER
 from neural_world.world import World
+from neural_world.observer import dispatch
 
 
 LOGGER = commons.logger()
@@ -17,6 +25,8 @@ class Engine:
     def __init__(self, world):
         self.world = world
         self.commands = []
+        self.journal = None  # receives the commands before their invocation
+        self.profiler = NULL_PROFILER  # times the phases of the steps
 
     def add(self, command):
         try:
@@ -26,6 +36,8 @@ class Engine:
 
     def invoke_all(self):
         """Call all commands on the world"""
+        if self.journal is not None:
+            self.journal.record(self.commands)
         [c.execute(self.world) for c in self.commands]
         self.commands = []
 
@@ -33,16 +45,23 @@ class Engine:
         """Apply given config then wait for the next."""
         self.world.config = config
         self.world.config.postprocess_data()
+        cache.REACTIONS.resize(config.reaction_cache_memory)
+        parallel.WORKERS.resize(config.nb_workers)
+        tiling.TILES.resize(config.nb_workers)
         self.invoke_all()  # if something added some actions after the last step
+        profiler = self.profiler
         if not config.terminated:
+            if config.network_evaluator.tiled:
+                tiling.TILES.scatter(self.world)
             for _ in range(config.steps_number):
-                # prepare the next amount of actions
-                for coords, obj in self.world:
-                    obj.update(self, self.world.neighbors(coords), coords)
-                self.add(action.RegenerateNutrientsAction())
+                if config.network_evaluator.tiled:
+                    # the tiles compute the step, then update the world
+                    tiling.TILES.step(self, self.world)
+                else:
+                    self.step(config)
                 self.add(action.StepComputedAction())
-                # invoke them
-                self.invoke_all()
+                with profiler.phase('observers'):
+                    self.invoke_all()
                 # finish if no more life
                 if not self.world.have_life:
                     break
@@ -50,17 +69,75 @@ class Engine:
                 if config.waiting_time > 0.:
                     time.sleep(config.waiting_time)
 
+    def step(self, config):
+        """Compute the next step of the world in the main process"""
+        profiler = self.profiler
+        # prepare the next amount of actions
+        if config.network_evaluator.batched:
+            batch.update_all(self, self.world,
+                             batch.EVALUATIONS[config.network_evaluator])
+        else:
+            # nutrients are not updated: they do nothing
+            with profiler.phase('inputs'):
+                updates = [(indiv, self.world.neighbors(coords), coords)
+                           for indiv, coords in tuple(self.world.individuals.items())]
+            with profiler.phase('evaluation'):
+                for indiv, neighbors, coords in updates:
+                    indiv.update(self, neighbors, coords)
+        # invoke them, then the end of step
+        with profiler.phase('invocation'):
+            self.invoke_all()
+        self.add(action.RegenerateNutrientsAction())
+        with profiler.phase('regeneration'):
+            self.invoke_all()
+
     @staticmethod
     def generate_from(config, observers=[]):
         """Generate world according to config.
 
         Given classes of Observer must wait for an engine as single parameter.
+        Observers are dispatched asynchronously if config asks for it.
 
         """
         world = World(config)
         engine = Engine(world)
         for observer_class in observers:
-            world.register(observer_class(engine))
+            world.register(dispatch.dispatched(observer_class(engine), config))
+        return engine
+
+    @staticmethod
+    def restore_from(config, filename:str, observers=[]):
+        """Generate world according to config, then restore in it
+        the checkpoint written in given file by save().
+
+        The world must not be populated.
+
+        """
+        engine = Engine.generate_from(config, observers)
+        with open(filename, 'rb') as fd:
+            checkpoint.load(fd, engine.world)
         return engine
 
+    @staticmethod
+    def rewind(config, directory:str, step:int=None, observers=[]):
+        """Generate world according to config, then restore in it the given
+        step (the last one by default) of the checkpoints and deltas written
+        in given directory by a Checkpointer.
+
+        The world must not be populated.
+
+        """
+        engine = Engine.generate_from(config, observers)
+        checkpoint.restore(directory, engine.world, step)
+        return engine
+
+    def save(self, filename:str) -> dict:
+        """Write a checkpoint of the world in given file, and return
+        the index of its genomes (see checkpoint.save).
+        The file is replaced only when the checkpoint is complete."""
+        with open(filename + '.tmp', 'wb') as fd:
+            genomes = checkpoint.save(self.world, fd)
+        os.replace(filename + '.tmp', filename)
+        return genomes
+
 
@@ -0,0 +1,209 @@
+"""
+Compact binary log of the events of a simulation, with an indexed reader.
+
+A log is a sequence of length-prefixed binary records, each one being
+a kind (1 byte), a payload length (2 bytes) and a payload:
+
+    birth: step, id, parent id (0 if none), x, y, genome fingerprint
+    death: step, id, x, y
+    move:  step, id, x, y (the new coords)
+    step:  step, number of individuals, number of nutrients
+
+Events are tagged with the step number of the world when they happen:
+the events of step s happen between the step summaries s and s+1.
+Records are buffered, and written by chunks.
+
+On close, an index footer is appended, giving the offset of the first
+record of each step and of the birth record of each individual,
+so that a reader can seek directly to a step or an individual.
+The log of an interrupted simulation has no footer: its index is then
+rebuilt by a scan of the records.
+
+"""
+import mmap
+import struct
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+
+MAGIC = b'NWEVLOG1'
+INDEX_MAGIC = b'NWEVIDX1'
+RECORD_HEADER = struct.Struct('<BH')  # kind, payload length
+TRAILER = struct.Struct('<QQQ8s')  # index offset, nb steps, nb births, magic
+BIRTH, DEATH, MOVE, STEP = range(1, 5)
+PAYLOADS = {
+    BIRTH: struct.Struct('<IQQiiQ'),
+    DEATH: struct.Struct('<IQii'),
+    MOVE: struct.Struct('<IQii'),
+    STEP: struct.Struct('<IQQ'),
+}
+
+Birth = namedtuple('Birth', 'step id parent coords fingerprint')
+Death = namedtuple('Death', 'step id coords')
+Move = namedtuple('Move', 'step id coords')
+Step = namedtuple('Step', 'step nb_individual nb_nutrient')
+
+
+def event(kind:int, payload:bytes):
+    """Return the event of given kind and payload"""
+    fields = PAYLOADS[kind].unpack(payload)
+    if kind == BIRTH:
+        step, idn, parent, x, y, fingerprint = fields
+        return Birth(step, idn, parent or None, (x, y), fingerprint)
+    if kind == STEP:
+        return Step(*fields)
+    step, idn, x, y = fields
+    return (Death if kind == DEATH else Move)(step, idn, (x, y))
+
+
+class EventLog:
+    """Writer of an event log in given file, flushing the records
+    every chunk_size bytes"""
+
+    def __init__(self, filename:str, chunk_size:int=2**20):
+        self.file = open(filename, 'wb')
+        self.file.write(MAGIC)
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        self.offset = len(MAGIC)  # offset of the next record
+        self.last_step = None
+        self.step_index = array('q')  # step, offset of its first record
+        self.birth_index = array('q')  # individual id, offset of its birth
+
+    def write(self, kind:int, *fields):
+        step = fields[0]
+        if step != self.last_step:
+            self.step_index.extend((step, self.offset))
+            self.last_step = step
+        if kind == BIRTH:
+            self.birth_index.extend((fields[1], self.offset))
+        payload = PAYLOADS[kind].pack(*fields)
+        self.buffer += RECORD_HEADER.pack(kind, len(payload)) + payload
+        self.offset += RECORD_HEADER.size + len(payload)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def birth(self, step:int, idn:int, parent:int, coords:tuple, fingerprint:int):
+        self.write(BIRTH, step, idn, parent or 0, *coords, fingerprint)
+
+    def death(self, step:int, idn:int, coords:tuple):
+        self.write(DEATH, step, idn, *coords)
+
+    def move(self, step:int, idn:int, coords:tuple):
+        self.write(MOVE, step, idn, *coords)
+
+    def step(self, step:int, nb_individual:int, nb_nutrient:int):
+        self.write(STEP, step, nb_individual, nb_nutrient)
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer = bytearray()
+
+    def close(self):
+        """Write the remaining records and the index footer"""
+        self.flush()
+        self.file.write(self.step_index.tobytes() + self.birth_index.tobytes())
+        self.file.write(TRAILER.pack(self.offset, len(self.step_index) // 2,
+                                     len(self.birth_index) // 2, INDEX_MAGIC))
+        self.file.close()
+
+
+class EventLogReader:
+    """Reader of an event log, mapped in memory"""
+
+    def __init__(self, filename:str):
+        self.file = open(filename, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(filename + ' is not an event log')
+        self.end = len(self.data)
+        trailer = self.data[-TRAILER.size:] if self.end >= TRAILER.size else b''
+        if len(trailer) == TRAILER.size and TRAILER.unpack(trailer)[3] == INDEX_MAGIC:
+            self.end, nb_step, nb_birth, _ = TRAILER.unpack(trailer)
+            index = np.frombuffer(self.data, dtype=np.int64, offset=self.end,
+                                  count=2 * (nb_step + nb_birth)).reshape(-1, 2).copy()
+            step_index, birth_index = index[:nb_step], index[nb_step:]
+        else:  # interrupted log: rebuild the index
+            step_index, birth_index = self.scanned_index()
+        self.step_numbers, self.step_offsets = step_index[:, 0], step_index[:, 1]
+        order = np.argsort(birth_index[:, 0], kind='stable')
+        self.birth_ids, self.birth_offsets = birth_index[order, 0], birth_index[order, 1]
+
+    def scanned_index(self) -> (np.ndarray, np.ndarray):
+        step_index, birth_index, last_step = [], [], None
+        for offset, kind, payload in self.records():
+            step = PAYLOADS[kind].unpack(payload)[0]
+            if step != last_step:
+                step_index.append((step, offset))
+                last_step = step
+            if kind == BIRTH:
+                birth_index.append((PAYLOADS[kind].unpack(payload)[1], offset))
+        return (np.array(step_index, dtype=np.int64).reshape(-1, 2),
+                np.array(birth_index, dtype=np.int64).reshape(-1, 2))
+
+    def records(self, offset:int=len(MAGIC)) -> iter:
+        """Yield (offset, kind, payload) of the records from given offset.
+        A record cut by an interruption ends the log."""
+        while offset + RECORD_HEADER.size <= self.end:
+            kind, length = RECORD_HEADER.unpack_from(self.data, offset)
+            start = offset + RECORD_HEADER.size
+            if start + length > self.end or kind not in PAYLOADS:
+                return
+            yield offset, kind, self.data[start:start+length]
+            offset = start + length
+
+    def __iter__(self):
+        return (event(kind, payload) for _, kind, payload in self.records())
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Step numbers having events, in order"""
+        return self.step_numbers
+
+    def events(self, start:int=None, stop:int=None) -> iter:
+        """Yield the events of steps from start to stop (excluded)"""
+        offset = len(MAGIC)
+        if start is not None:
+            idx = np.searchsorted(self.step_numbers, start)
+            if idx == len(self.step_numbers):
+                return
+            offset = int(self.step_offsets[idx])
+        for _, kind, payload in self.records(offset):
+            current = event(kind, payload)
+            if stop is not None and current.step >= stop:
+                return
+            yield current
+
+    def birth(self, idn:int) -> Birth:
+        """Return the birth of the individual of given id,
+        or raise KeyError if it is not in the log"""
+        idx = np.searchsorted(self.birth_ids, idn)
+        if idx == len(self.birth_ids) or self.birth_ids[idx] != idn:
+            raise KeyError(idn)
+        _, kind, payload = next(self.records(int(self.birth_offsets[idx])))
+        return event(kind, payload)
+
+    def history(self, idn:int) -> iter:
+        """Yield the birth, moves and death of the individual of given id.
+        Records are scanned from its birth to its death."""
+        birth = self.birth(idn)
+        yield birth
+        offset = int(self.birth_offsets[np.searchsorted(self.birth_ids, idn)])
+        for _, kind, payload in self.records(offset):
+            if kind in (MOVE, DEATH) and PAYLOADS[kind].unpack(payload)[1] == idn:
+                yield event(kind, payload)
+                if kind == DEATH:
+                    return
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
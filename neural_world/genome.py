@@ -0,0 +1,173 @@
+"""
+Definition of the Genome class, immutable description of a neural network.
+
+Genomes are interned: building a genome identical to an existing one
+returns the existing instance, so clones share the atoms, the cleaned
+network and the compiled circuit of their parent.
+
+"""
+import weakref
+import itertools
+
+from neural_world import cache
+from neural_world import commons
+from neural_world import default
+from neural_world import solving
+from neural_world import cleaning
+from neural_world.circuit import Circuit
+from neural_world.commons import Evaluator, NeuronType, FILE_ASP_CLEANING
+
+
+LOGGER = commons.logger(commons.SUBLOGGER_LIFE)
+MINIMAL_NEURON_ID = 1
+
+
+class Genome:
+    """Immutable and interned data defining a neural network.
+
+    A genome is identified by its canonical string, giving the number of input,
+    intermediate and output neurons, the types of non-input neurons and the
+    edges. Use Genome.of() to get the interned instance.
+
+    """
+    # canonical string: genome ; genomes are forgotten when not used anymore
+    REGISTRY = weakref.WeakValueDictionary()
+
+    def __init__(self, nb_input_neuron:int, nb_intermediate_neuron:int,
+                 nb_output_neuron:int, neuron_types:tuple, edges:tuple,
+                 evaluator:Evaluator=default.NETWORK_EVALUATOR,
+                 cleaned_network:str=None, canonical:str=None):
+        self.nb_input_neuron = nb_input_neuron
+        self.nb_intermediate_neuron = nb_intermediate_neuron
+        self.nb_output_neuron = nb_output_neuron
+        self.neuron_types, self.edges = tuple(neuron_types), tuple(edges)
+        self.canonical = canonical or Genome.canonical_string(
+            nb_input_neuron, nb_intermediate_neuron, nb_output_neuron,
+            self.neuron_types, self.edges
+        )
+        self.fingerprint = cache.fingerprint(self.canonical)
+        self._circuit = None
+        self._neural_network_all = None
+        # Atoms, then cleaning for remove useless data
+        if cleaned_network is None:
+            cleaned_network = cleaned(self.neural_network_all, evaluator)
+            LOGGER.debug('NEW NEURAL NETWORK: ' + self.neural_network_all)
+            LOGGER.debug('CLEANED: ' + cleaned_network)
+        self.neural_network = cleaned_network
+        # identify reactions, shared by all genomes of same cleaned network
+        self.reaction_fingerprint = cache.fingerprint(
+            self.neural_network, self.min_output_neuron_id, self.maximal_neuron_id
+        )
+
+    @staticmethod
+    def of(nb_input_neuron:int, nb_intermediate_neuron:int, nb_output_neuron:int,
+           neuron_types:iter, edges:iter,
+           evaluator:Evaluator=default.NETWORK_EVALUATOR,
+           cleaned_network:str=None):
+        """Return the interned Genome of given data, built if necessary.
+
+        The evaluator is used for the cleaning of new genomes only,
+        unless their cleaned network is given (as found in checkpoints).
+
+        """
+        neuron_types, edges = tuple(neuron_types), tuple(edges)
+        key = Genome.canonical_string(nb_input_neuron, nb_intermediate_neuron,
+                                      nb_output_neuron, neuron_types, edges)
+        genome = Genome.REGISTRY.get(key)
+        if genome is None:
+            genome = Genome(nb_input_neuron, nb_intermediate_neuron,
+                            nb_output_neuron, neuron_types, edges, evaluator,
+                            cleaned_network, canonical=key)
+            Genome.REGISTRY[key] = genome
+        return genome
+
+    @staticmethod
+    def canonical_string(nb_input_neuron, nb_intermediate_neuron,
+                         nb_output_neuron, neuron_types, edges) -> str:
+        """Return the string identifying the genome of given data.
+
+        Edges are sorted and deduplicated, as their order and repetitions
+        do not change the network.
+
+        """
+        return '/'.join((
+            ','.join(str(n) for n in (nb_input_neuron, nb_intermediate_neuron,
+                                      nb_output_neuron)),
+            ''.join(ntype.value for ntype in neuron_types),
+            ';'.join(str(a) + ',' + str(b) for a, b in sorted(set(edges))),
+        ))
+
+    def network_atoms(self) -> str:
+        """Return the atoms describing the whole network"""
+        neuron_ids = iter(range(MINIMAL_NEURON_ID, self.nb_neuron + MINIMAL_NEURON_ID))
+        neuron_type = iter(self.neuron_types)
+        network_atoms = '.'.join(itertools.chain(
+            # input neurons
+            ('neuron(' + str(idn) + ','
+             + default.INPUT_NEURON_TYPE.value + ')'
+             for idn in itertools.islice(neuron_ids, 0, self.nb_input_neuron)),
+            # intermediate neurons
+            ('neuron(' + str(idn) + ',' + next(neuron_type).value + ')'
+             for idn in itertools.islice(neuron_ids, 0, self.nb_intermediate_neuron)),
+            # output neurons: give their type and their output status.
+            ('neuron(' + str(idn) + ',' + next(neuron_type).value + ').'
+             + 'output(' + str(idn) + ')'  # this neuron is an output
+             for idn in neuron_ids),
+            # edges
+            ('edge(' + str(id1) + ',' + str(id2) + ')'
+             for id1, id2 in self.edges)
+        )) + '.'
+        assert network_atoms.count('neuron') == self.nb_neuron
+        assert network_atoms.count('edge') == len(self.edges)
+        assert network_atoms.count('output') == self.nb_output_neuron
+        assert network_atoms.count(',i)') == self.nb_input_neuron
+        assert ('neuron(' + str(MINIMAL_NEURON_ID)) in network_atoms
+        assert ('neuron(' + str(self.maximal_neuron_id)) in network_atoms
+        assert ('neuron(' + str(MINIMAL_NEURON_ID-1)) not in network_atoms
+        return network_atoms
+
+    @property
+    def neural_network_all(self) -> str:
+        """The atoms of the whole network, built at first access"""
+        if self._neural_network_all is None:
+            self._neural_network_all = self.network_atoms()
+        return self._neural_network_all
+
+    @property
+    def circuit(self) -> Circuit:
+        """The Circuit of the cleaned network, compiled at first access"""
+        if self._circuit is None:
+            self._circuit = Circuit(self.neural_network)
+        return self._circuit
+
+    @property
+    def nb_neuron(self):
+        return sum((self.nb_input_neuron, self.nb_intermediate_neuron,
+                    self.nb_output_neuron))
+
+    @property
+    def maximal_neuron_id(self):
+        return self.nb_neuron + MINIMAL_NEURON_ID - 1
+
+    @property
+    def min_output_neuron_id(self):
+        return self.nb_neuron - self.nb_output_neuron + MINIMAL_NEURON_ID
+
+    def __str__(self):
+        return '%016x' % self.fingerprint
+
+
+def cleaned(network_atoms:str, evaluator:Evaluator=Evaluator.ASP) ->str:
+    """Return a cleaned version of given neural network to remove
+    useless neuron, give an orientation to edges,...
+
+    The cleaning is performed by the ASP solver if given evaluator
+    is solving networks, else in python. Both give the atoms in the same
+    order, so genomes and reaction fingerprints do not depend on it.
+
+    """
+    if not evaluator.solving:
+        return cleaning.cleaned(network_atoms)
+    model = solving.model_from(network_atoms, FILE_ASP_CLEANING)
+    assert model is not None, 'cleaning network lead to non existing model'
+    return cleaning.normalized('.'.join(model))
@@ -0,0 +1,163 @@
+"""
+Headless running of simulations, without prompt, rendering nor waiting.
+
+The run() function performs a whole simulation and returns a summary
+of it, as a dict that is easily dumped in JSON.
+The read_config() function reads a configuration file, where each
+non-empty line is a 'field = value' assignation, and # begins a comment.
+
+"""
+import os
+import time
+import json
+from functools import partial
+
+from neural_world import cache
+from neural_world import commons
+from neural_world import neighbors
+from neural_world import observer
+from neural_world.config import Configuration
+from neural_world.engine import Engine
+from neural_world.nutrient import Nutrient
+from neural_world.observer.dispatch import AsyncObserver
+
+
+LOGGER = commons.logger()
+# neighbor accesses, by name, as given in configuration files
+NEIGHBOR_ACCESSES = {'moore': neighbors.moore, 'vonneumann': neighbors.vonneumann}
+
+
+class PopulationTracker(observer.Observer):
+    """Keep the peak population, and the step of extinction"""
+    synchronous = True  # cheap, and needed at the end of the run
+
+    def __init__(self, engine=None):
+        self.peak_population = 0
+        self.peak_step = 0
+        self.extinction_step = None
+
+    def update(self, world, signals={}):
+        if world.nb_individual > self.peak_population:
+            self.peak_population = world.nb_individual
+            self.peak_step = world.step_number
+        if not world.have_life and self.extinction_step is None:
+            self.extinction_step = world.step_number
+
+
+def read_config(filename:str) -> dict:
+    """Return the dict field:value read in given configuration file"""
+    fields = {}
+    with open(filename) as fd:
+        for nb_line, line in enumerate(fd, start=1):
+            line = line.split('#')[0].strip()
+            if not line: continue
+            try:
+                field, value = (part.strip() for part in line.split('=', 1))
+            except ValueError:
+                raise ValueError('Invalid line ' + str(nb_line) + ' in '
+                                 + filename + ': "' + line + '"')
+            fields[field] = value
+    return fields
+
+
+def configuration(fields:dict={}, **overrides) -> Configuration:
+    """Return a valid Configuration built from given fields, overriden by
+    given overrides. Raise ValueError if the configuration is invalid."""
+    fields = dict(fields, **overrides)
+    unknown = set(fields) - set(Configuration.ALL_FIELDS)
+    if unknown:
+        raise ValueError('Unknown configuration fields: ' + ', '.join(sorted(unknown)))
+    if isinstance(fields.get('neighbor_access'), str):
+        fields['neighbor_access'] = NEIGHBOR_ACCESSES[fields['neighbor_access']]
+    config = Configuration(**fields)
+    if not config.is_valid():
+        raise ValueError('Invalid configuration:\n' + str(config))
+    return config
+
+
+def optional_observers(config:Configuration) -> tuple:
+    """Return the observer classes asked by given config: publication
+    of the world state in shared memory, event log and checkpoints"""
+    observers = ()
+    if config.shared_state:
+        observers += (partial(observer.SharedStatePublisher, name=config.shared_state),)
+    if config.event_log:
+        observers += (partial(observer.EventLogger,
+                              archive_directory=config.dir_archive_simulation),)
+    if config.checkpoint_interval:
+        observers += (partial(observer.Checkpointer,
+                              archive_directory=config.dir_archive_simulation,
+                              interval=config.checkpoint_interval,
+                              deltas=config.checkpoint_deltas),)
+    return observers
+
+
+def restored(config:Configuration, restore:str, step:int=None, observers=()):
+    """Return an engine restored from given checkpoint file, or from given
+    step of the checkpoints with deltas in given directory"""
+    if os.path.isdir(restore):
+        return Engine.rewind(config, restore, step, observers)
+    return Engine.restore_from(config, restore, observers)
+
+
+def run(config:Configuration, steps:int=None, restore:str=None,
+        restore_step:int=None, profiler=None) -> dict:
+    """Run a simulation of given config for given number of steps
+    (the steps_number field by default), or until extinction.
+    If a checkpoint file is given, the simulation is restored from it
+    instead of populated. If a directory of checkpoints with deltas
+    is given, the given step (default to the last) is restored.
+    If a profiler is given (see the profiling module), the time spent
+    in each phase of the steps is added to the summary.
+
+    Return a summary of the simulation.
+
+    """
+    steps = config.steps_number if steps is None else steps
+    config.steps_number = steps
+    config.waiting_time = 0.
+    observers = (PopulationTracker,) + optional_observers(config)
+    if restore:
+        engine = restored(config, restore, restore_step, observers)
+    else:
+        engine = Engine.generate_from(config, observers)
+    if profiler:
+        engine.profiler = profiler
+    tracker = next(o for o in engine.world.observers
+                   if isinstance(o, PopulationTracker))
+    engine.world.init_observers()
+    if not restore:
+        engine.world.populate()
+    tracker.update(engine.world)
+    start = time.time()
+    engine.apply(config)
+    elapsed = time.time() - start
+    engine.world.deinit()
+    world = engine.world
+    summary = {
+        'steps': world.step_number,
+        'extinct': not world.have_life,
+        'extinction_step': tracker.extinction_step,
+        'peak_population': tracker.peak_population,
+        'peak_step': tracker.peak_step,
+        'final_population': world.nb_individual,
+        'final_nutrients': world.object_counter[Nutrient],
+        'elapsed': elapsed,
+        'steps_per_second': world.step_number / elapsed if elapsed else None,
+        'reaction_cache': cache.REACTIONS.stats,
+    }
+    lags = {o.name: o.stats for o in world.observers if isinstance(o, AsyncObserver)}
+    if lags:
+        summary['observers'] = lags
+    if profiler:
+        summary['phases'] = profiler.stats
+    return summary
+
+
+def write_summary(summary:dict, filename:str=None):
+    """Write given summary in JSON in given file, or on stdout if None"""
+    if filename is None:
+        print(json.dumps(summary, sort_keys=True))
+    else:
+        with open(filename, 'w') as fd:
+            json.dump(summary, fd, sort_keys=True, indent=1)
@@ -2,7 +2,6 @@
 Assume the production of Individual instances.
 
 """
-import random
 from functools import partial
 
 import neural_world.default as default
@@ -17,7 +16,8 @@ class Incubator(Configurable):
 
     A simple way to create a new Incubator behavior is to subclass Incubator,
     and redefine the following methods: memory_size,
-    nb_inter_neuron, nb_edges, random_neuron_id.
+    nb_inter_neuron, nb_edges, random_neuron_type, random_edges.
+    Random draws are made in the incubation stream (see the rng module).
 
     """
 
@@ -26,26 +26,38 @@ class Incubator(Configurable):
             'memory_min_size', 'memory_max_size',
             'neuron_inter_mincount', 'neuron_inter_maxcount',
             'neuron_edges_mincount', 'neuron_edges_maxcount',
-            'mutator',
+            'network_evaluator', 'mutator', 'neighbor_access',
+            'random_streams',
         ])
         self.neuron_types = NeuronType.xano()
 
 
+    def randint(self, low:int, high:int) -> int:
+        """Return an integer of [low;high]"""
+        return int(self.random_streams.incubation.integers(low, high, endpoint=True))
+
     def memory_size(self):
         """Return the memory size"""
-        return random.randint(self.memory_min_size, self.memory_max_size)
+        return self.randint(self.memory_min_size, self.memory_max_size)
 
     def nb_inter_neuron(self):
         """Return number of intermediate neuron"""
-        return random.randint(self.neuron_inter_mincount, self.neuron_inter_maxcount)
+        return self.randint(self.neuron_inter_mincount, self.neuron_inter_maxcount)
 
     def nb_edges(self):
         """Return number of edges"""
-        return random.randint(self.neuron_edges_mincount, self.neuron_edges_maxcount)
+        return self.randint(self.neuron_edges_mincount, self.neuron_edges_maxcount)
 
     def random_neuron_type(self):
         """Return a random neuron type"""
-        return random.choice(self.neuron_types)
+        return self.neuron_types[self.randint(0, len(self.neuron_types) - 1)]
+
+    def random_edges(self, nb_neuron:int, nb_edges:int) -> tuple:
+        """Return given number of random edges between given number of neurons"""
+        return tuple(map(tuple, self.random_streams.incubation.integers(
+            NeuralNetwork.MINIMAL_NEURON_ID, nb_neuron, size=(nb_edges, 2),
+            endpoint=True,
+        ).tolist()))
 
 
     def spawn(self):
@@ -54,13 +66,12 @@ class Incubator(Configurable):
         neural_network = NeuralNetwork(
             nb_inter_neuron=self.nb_inter_neuron(),
             memory_size=self.memory_size(),
+            nb_neighbor=len(tuple(self.neighbor_access((0, 0)))),
+            evaluator=self.network_evaluator,
         )
         nb_neuron_type = neural_network.nb_neuron_type
-        random.nid = lambda: (random.randint(NeuralNetwork.MINIMAL_NEURON_ID,
-                                             neural_network.nb_neuron))
-        random.eid = lambda: (random.nid(), random.nid())
         neural_network.build(
-            edges=(random.eid() for _ in range(self.nb_edges())),
+            edges=self.random_edges(neural_network.nb_neuron, self.nb_edges()),
             neuron_types=(self.random_neuron_type() for _ in range(nb_neuron_type))
         )
 
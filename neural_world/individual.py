@@ -31,14 +31,25 @@ class Individual:
 
     def update(self, engine, neighbors, coords):
         """Compute the next step and send command to the given engine"""
-        # Life cost
+        self.live()
+        # get states of input neurons and react to it
+        self.emit_reaction(engine, coords, self.reaction_to(
+            neighbors, individual=self, coords=coords
+        ))
+
+    def live(self):
+        """Pay the energy cost of living one more step"""
         self.energy -= 1
+
+    def emit_reaction(self, engine, coords, reaction:iter):
+        """Send to given engine the actions of self for the current step:
+        nutrient picking, then the given reaction, or the death of self
+        if no energy remains."""
         # Pick Nutrient
         engine.add(actions.PickNutrientAction(self, coords))
         # Life support
         if self.energy > 0:
-            # get states of input neurons and react to it
-            for action in self.reaction_to(neighbors, individual=self, coords=coords):
+            for action in reaction:
                 if action:
                     engine.add(action)
         else:  # energy is lower than zero
@@ -50,6 +61,13 @@ class Individual:
         actions = self.neural_network.react(neighbors=neighbors, **kwargs)
         yield from (action for action in actions if action is not None)
 
+    def reaction_with(self, output_states, neighbors, **kwargs):
+        """Yield actions instances, according to the given output states
+        of the neural network, already computed for neighbors and kwargs"""
+        actions = self.neural_network.react_with(output_states,
+                                                 neighbors=neighbors, **kwargs)
+        yield from (action for action in actions if action is not None)
+
 
     def clone(self, mutator=None, energy:int=None):
         """Return a new Individuals, created with the same data,
@@ -61,8 +79,7 @@ class Individual:
         """
         # life support
         if energy is None:  # split energy between the two individuals
-            energy = self.energy // 2
-            self.energy = int(self.energy / 2 + 0.5)
+            energy = self.split_energy()
         # Create
         return Individual(
             self.neural_network.clone(mutator),
@@ -70,10 +87,20 @@ class Individual:
         )
 
 
+    def split_energy(self) -> int:
+        """Give away half of the energy of self, and return it"""
+        energy = self.energy // 2
+        self.energy = int(self.energy / 2 + 0.5)
+        return energy
+
     @property
     def memory_size(self):
         return self.neural_network.memory_size
 
+    @property
+    def genome(self):
+        return self.neural_network.genome
+
     @property
     def network_atoms(self):
         return self.neural_network.neural_network
@@ -4,7 +4,6 @@ Mutators are objects capable of modify data exploited by Individuals, allowing
 
 """
 import logging
-from random import random, randrange, choice as random_choice
 
 import neural_world.default as default
 import neural_world.commons as commons
@@ -19,12 +18,20 @@ LOGGER = commons.logger('life')
 
 
 class Mutator(Configurable):
+    """Random draws are made in the mutation stream (see the rng module)"""
 
     def __init__(self, config):
         super().__init__(config, config_fields=[
-            'mutation_rate',
+            'mutation_rate', 'random_streams',
         ])
 
+    def randrange(self, start:int, stop:int) -> int:
+        return int(self.random_streams.mutation.integers(start, stop))
+
+    def random_neuron_type(self) -> NeuronType:
+        neuron_types = NeuronType.xano()
+        return neuron_types[self.randrange(0, len(neuron_types))]
+
     def mutate(self, nb_intermediate_neuron:int, nb_total_neuron:int,
                neuron_types:iter, edges:iter):
         """Return the data received in input, modified according to
@@ -36,12 +43,10 @@ class Mutator(Configurable):
         edges: iterable of 2-tuple describing links between neurons.
 
         """
-        MUTATION_RATE = self.mutation_rate
-        mutation = lambda: random() <= MUTATION_RATE
-        mutate_nb_neuron   = mutation(), mutation()
-        mutate_neuron_type = mutation(), mutation()
-        mutate_edges       = mutation(), mutation()
-        del mutation
+        mutations = (self.random_streams.mutation.random(6) <= self.mutation_rate).tolist()
+        mutate_nb_neuron   = mutations[0:2]
+        mutate_neuron_type = mutations[2:4]
+        mutate_edges       = mutations[4:6]
 
         if any(mutate_nb_neuron):
             add, rmv = mutate_nb_neuron
@@ -49,7 +54,7 @@ class Mutator(Configurable):
             if add:
                 nb_total_neuron += 1
                 nb_intermediate_neuron += 1
-                neuron_types.append(random_choice(NeuronType.xano()))
+                neuron_types.append(self.random_neuron_type())
                 if commons.log_level() >= logging.INFO:
                     LOGGER.info('Mutator ' + str(self)
                                  + ' add new neuron of type '
@@ -57,7 +62,7 @@ class Mutator(Configurable):
             if rmv and nb_intermediate_neuron > 0:
                 nb_total_neuron -= 1
                 nb_intermediate_neuron -= 1
-                target_idx = randrange(0, len(neuron_types))
+                target_idx = self.randrange(0, len(neuron_types))
                 if commons.log_level() >= logging.INFO:
                     LOGGER.info('Mutator ' + str(self)
                                  + ' remove neuron ' + str(target_idx) + ' ('
@@ -68,8 +73,8 @@ class Mutator(Configurable):
             modify, swap = mutate_neuron_type
             neuron_types = list(neuron_types)  # allow modifications
             if modify:  # modify just one type
-                target_idx = randrange(0, len(neuron_types))
-                new_type = random_choice(NeuronType.xano())
+                target_idx = self.randrange(0, len(neuron_types))
+                new_type = self.random_neuron_type()
                 if commons.log_level() >= logging.INFO:
                     LOGGER.info('Mutator ' + str(self) + ' modify type of '
                                  + str(target_idx) + ' from '
@@ -78,8 +83,8 @@ class Mutator(Configurable):
                                 )
                 neuron_types[target_idx] = new_type
             if swap:  # swap two types in the list
-                target1_idx = randrange(0, len(neuron_types))
-                target2_idx = randrange(0, len(neuron_types))
+                target1_idx = self.randrange(0, len(neuron_types))
+                target2_idx = self.randrange(0, len(neuron_types))
                 neuron_types[target1_idx], neuron_types[target2_idx] = (
                     neuron_types[target2_idx], neuron_types[target1_idx]
                 )
@@ -94,14 +99,14 @@ class Mutator(Configurable):
             add, rmv = mutate_edges
             edges = list(edges)  # allow modifications
             if add:  # add one new edge
-                target1_idx = randrange(1, nb_total_neuron + 1)
-                target2_idx = randrange(1, nb_total_neuron + 1)
+                target1_idx = self.randrange(1, nb_total_neuron + 1)
+                target2_idx = self.randrange(1, nb_total_neuron + 1)
                 edges.append((target1_idx, target2_idx))
                 if commons.log_level() >= logging.INFO:
                     LOGGER.info('Mutator ' + str(self) + ' get an edge '
                                  + str((target1_idx, target2_idx)) + '.')
             if rmv:  # remove one existing edge
-                idx = randrange(0, len(edges))
+                idx = self.randrange(0, len(edges))
                 if commons.log_level() >= logging.INFO:
                     LOGGER.info('Mutator ' + str(self) + ' lose its edge '
                                  + str(edges[idx]) + '.')
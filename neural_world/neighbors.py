@@ -4,6 +4,8 @@ Definition of the concept of Neighbors.
 """
 import itertools
 
+import numpy as np
+
 
 
 def moore(coords):
@@ -16,4 +18,26 @@ def moore(coords):
     )
 
 def vonneumann(coords):
-    return (nei for nei in moore(coords) if 0 in nei)
+    "Yields von neumann neighbors coords"
+    x, y = coords
+    return (
+        (x+i, y+j)
+        for i, j in itertools.product((-1, 0, 1), repeat=2)
+        if (i == 0) != (j == 0)
+    )
+
+
+def table(neighbor_access, bounds) -> np.ndarray:
+    """Return the int32 array (squares x neighbors) giving for each square
+    the indexes of its neighbors, as given by neighbor_access, in a space
+    of given bounds where coords wrap around.
+
+    The square of coords (x, y) has the index x * height + y.
+
+    """
+    width, height = bounds
+    return np.array([
+        [(nx % width) * height + ny % height
+         for nx, ny in neighbor_access((x, y))]
+        for x, y in itertools.product(range(width), range(height))
+    ], dtype=np.int32).reshape(width * height, -1)
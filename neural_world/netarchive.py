@@ -0,0 +1,133 @@
+"""
+Append-only archive of the neural networks of individuals, rendered later.
+
+Instead of rendering graphs at each birth, the Archivist may append
+the networks to a single archive file, where each line is one of:
+
+    genome <TAB> fingerprint <TAB> cleaned atoms <TAB> all atoms
+    individual <TAB> id <TAB> parent id, or - <TAB> fingerprint
+
+A genome is written once, at the birth of its first individual:
+identical clones share it, and are therefore rendered only once.
+Rendering, in DOT and PNG files named after the genome fingerprint,
+is performed later by a pool of processes (see render()),
+for instance with:
+
+    python -m neural_world render <archive directory>
+
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from neural_world import commons
+
+
+LOGGER = commons.logger()
+FILE_NETWORKS = 'networks.archive'
+FILE_TEMPLATE = 'network_%s_%s.%s'
+GENOME, INDIVIDUAL = 'genome', 'individual'
+
+
+def fingerprint_string(fingerprint:int) -> str:
+    return format(fingerprint, '016x')
+
+
+class NetworkArchive:
+    """Writer of an archive of networks.
+    Appending to an existing archive keeps its genomes known."""
+
+    def __init__(self, filename:str):
+        self.filename = filename
+        self.known = set(read(filename)[0]) if os.path.exists(filename) else set()
+        self.file = open(filename, 'a')
+        if self.file.tell():
+            with open(filename, 'rb') as fd:
+                fd.seek(-1, os.SEEK_END)
+                if fd.read(1) != b'\n':  # last line cut by an interruption
+                    self.file.write('\n')
+
+    def add(self, individual, parent=None):
+        """Archive given new individual, and its genome if not known"""
+        genome = individual.genome
+        fingerprint = fingerprint_string(genome.fingerprint)
+        if fingerprint not in self.known:
+            self.known.add(fingerprint)
+            self.file.write('\t'.join((GENOME, fingerprint, genome.neural_network,
+                                       genome.neural_network_all)) + '\n')
+        self.file.write('\t'.join((INDIVIDUAL, str(individual.unique_id),
+                                   str(parent.unique_id) if parent else '-',
+                                   fingerprint)) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+def read(filename:str) -> (dict, dict):
+    """Return the genomes, as a dict fingerprint: (cleaned atoms, all atoms),
+    and the individuals, as a dict id: (parent id or None, fingerprint),
+    found in given archive file. Lines cut by an interruption are ignored."""
+    genomes, individuals = {}, {}
+    with open(filename) as fd:
+        for line in fd:
+            if not line.endswith('\n'):  # last line, cut
+                continue
+            kind, *fields = line.rstrip('\n').split('\t')
+            try:
+                if kind == GENOME:
+                    fingerprint, cleaned, whole = fields
+                    genomes[fingerprint] = cleaned, whole
+                elif kind == INDIVIDUAL:
+                    idn, parent, fingerprint = fields
+                    individuals[int(idn)] = (None if parent == '-' else int(parent)), fingerprint
+            except ValueError:  # line cut, then completed by the next run
+                continue
+    return genomes, individuals
+
+
+def genome_filename(directory:str, fingerprint:str, version:str, ext:str) -> str:
+    return os.path.join(directory, FILE_TEMPLATE % (fingerprint, version, ext))
+
+
+def render_genome(directory:str, fingerprint:str, cleaned:str, whole:str,
+                  save_graph:bool=True, render_graph:bool=True) -> int:
+    """Write the DOT and PNG files of the genome of given fingerprint and
+    atoms that are not already in given directory.
+    Return the number of written files."""
+    from neural_world import converter  # needs pygraphviz
+    nb_file = 0
+    for version, network_atoms in (('dot_cln', cleaned), ('dot_all', whole)):
+        dot_file = genome_filename(directory, fingerprint, version, 'dot')
+        png_file = genome_filename(directory, fingerprint, version, 'png')
+        todo_dot = save_graph and not os.path.exists(dot_file)
+        todo_png = render_graph and not os.path.exists(png_file)
+        if todo_dot or todo_png:
+            graph = converter.network_atoms_to_dot(network_atoms)
+        if todo_dot:
+            with open(dot_file, 'w') as fd:
+                fd.write(graph)
+            nb_file += 1
+        if todo_png:
+            converter.graph_rendering(graph, png_file,
+                                      layout=converter.GraphvizLayout.dot)
+            nb_file += 1
+    return nb_file
+
+
+def render(directory:str, nb_workers:int=None, save_graph:bool=True,
+           render_graph:bool=True, fingerprints:iter=None) -> int:
+    """Render the genomes of the archive in given directory, or only those
+    of given fingerprints, on nb_workers processes (one per core by default).
+    Files already rendered are kept.
+
+    Return the number of written files.
+
+    """
+    genomes, _ = read(os.path.join(directory, FILE_NETWORKS))
+    if fingerprints is not None:
+        genomes = {fp: genomes[fp] for fp in fingerprints}
+    LOGGER.info('RENDER: ' + str(len(genomes)) + ' genomes in ' + directory)
+    with ProcessPoolExecutor(max_workers=nb_workers or os.cpu_count()) as pool:
+        futures = [pool.submit(render_genome, directory, fingerprint, cleaned,
+                               whole, save_graph, render_graph)
+                   for fingerprint, (cleaned, whole) in genomes.items()]
+        return sum(future.result() for future in futures)
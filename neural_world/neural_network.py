@@ -49,6 +49,7 @@ class NeuralNetwork(NeuralNetworkEngine):
         nb_neighbor_neuron = NeuralNetwork.nb_neighbor_neuron(nb_neighbor, nb_unit_type)
         # fields and finally a call to base class init
         self.memory = [False] * memory_size
+        self.nb_neighbor = nb_neighbor
         self.energy_level_precision = 5
         self.max_energy = 0
         super().__init__(inputs=((self.neighbors, nb_neighbor_neuron),
@@ -62,10 +63,9 @@ class NeuralNetwork(NeuralNetworkEngine):
 
 
     def neighbors(self, **kwargs):
-        return tuple(itertools.chain.from_iterable(
-            NeuralNetwork.square_to_input_neurons(square)
-            for square in kwargs['neighbors']
-        ))
+        """Input states are the nutrient and individual presence
+        in each neighbor square, as given by World.neighbors"""
+        return tuple(itertools.chain.from_iterable(kwargs['neighbors']))
 
     def directions(self, states, **kwargs):
         directions = tuple(d for s, d in zip(states, Direction) if s)
@@ -132,24 +132,6 @@ class NeuralNetwork(NeuralNetworkEngine):
         return nb_type * nb_neighbor
 
 
-    @staticmethod
-    def square_to_input_neurons(square):
-        """From a set of objects, return states of associated input neurons
-
-        square: set of objects (Nutrient, Individual).
-        return: 2-tuple of boolean, that are the states of
-                input neurons for given square.
-
-        """
-        empty = len(square) == 0
-        if empty:
-            contains_nutrients, contains_individuals = False, False
-        else:
-            contains_nutrients = any(o.is_nutrient for o in square)
-            contains_individuals = any(o.is_individual for o in square)
-        return contains_nutrients, contains_individuals
-
-
     def clone(self, mutator=None):
         """Return a copy of self, eventually mutated by given mutator"""
         # copy the data, mutate it if any mutator given
@@ -163,8 +145,15 @@ class NeuralNetwork(NeuralNetworkEngine):
                 self.neuron_types, self.edges
             )
 
+        # an unmutated clone shares the genome of self
+        unmutated = (nb_intermediate_neuron == self.nb_intermediate_neuron
+                     and neuron_types == self.neuron_types
+                     and edges == self.edges)
         return NeuralNetwork(
             edges=edges, neuron_types=neuron_types,
             memory_size=self.memory_size,
+            nb_neighbor=self.nb_neighbor,
             nb_inter_neuron=nb_intermediate_neuron,
+            evaluator=self.evaluator,
+            genome=self.genome if unmutated else None,
         )
@@ -2,15 +2,17 @@
 
 import itertools
 
+from neural_world import cache
 from neural_world import commons
 from neural_world import default
+from neural_world import genome
 from neural_world import solving
-from neural_world.commons import (NeuronType, Direction,
-                                  FILE_ASP_CLEANING, FILE_ASP_RUNNING)
+from neural_world.genome import Genome, MINIMAL_NEURON_ID
+from neural_world.commons import (NeuronType, Direction, Evaluator,
+                                  FILE_ASP_RUNNING)
 
 
 LOGGER = commons.logger(commons.SUBLOGGER_LIFE)
-MINIMAL_NEURON_ID = 1
 
 
 class NeuralNetworkEngine:
@@ -37,56 +39,70 @@ class NeuralNetworkEngine:
     Subclasses of NeuralNetworkEngine should define the content of inputs
     and outputs, and expose them through the NeuralNetworkEngine.__init__ method.
 
+    The evaluator gives the way output states are computed from input states:
+    through the ASP solving of network_running.lp (the reference),
+    or through a Circuit compiled once from the cleaned network.
+
+    The atoms, the cleaned network and the circuit are kept by an interned
+    Genome, shared by all the neural networks built from the same data.
+
     """
 
     def __init__(self, nb_intermediate_neuron:int, inputs:tuple, outputs:iter,
-                 edges:iter=None, neuron_types:iter=None):
+                 edges:iter=None, neuron_types:iter=None,
+                 evaluator:Evaluator=default.NETWORK_EVALUATOR,
+                 genome:Genome=None):
         self.inputs, self.outputs = tuple(inputs), tuple(outputs)
         self.nb_intermediate_neuron = nb_intermediate_neuron
+        self.evaluator = Evaluator(evaluator)
         self._nb_input_neuron = sum(int(n) for _, n in self.inputs)
         self._nb_output_neuron = sum(int(n) for _, n in self.outputs)
-        if edges is not None and neuron_types is not None:
+        self.genome = genome
+        if genome is not None:
+            assert genome.nb_intermediate_neuron == nb_intermediate_neuron
+            assert genome.nb_input_neuron == self.nb_input_neuron
+            assert genome.nb_output_neuron == self.nb_output_neuron
+        elif edges is not None and neuron_types is not None:
             self.build(edges, neuron_types)
-        else:
-            self.edges, self.neuron_types = None, None  # build() call necessary
+        # else: build() call necessary
 
     def build(self, edges:iter, neuron_types:iter):
         """Build the neural network using input data and attributes"""
-        self.edges, self.neuron_types = tuple(edges), tuple(neuron_types)
-
-        neuron_ids = iter(range(MINIMAL_NEURON_ID, self.nb_neuron + MINIMAL_NEURON_ID))
-        neuron_type = iter(self.neuron_types)
-        network_atoms = '.'.join(itertools.chain(
-            # input neurons
-            ('neuron(' + str(idn) + ','
-             + default.INPUT_NEURON_TYPE.value + ')'
-             for idn in itertools.islice(neuron_ids, 0, self.nb_input_neuron)),
-            # intermediate neurons
-            ('neuron(' + str(idn) + ',' + next(neuron_type).value + ')'
-             for idn in itertools.islice(neuron_ids, 0, self.nb_intermediate_neuron)),
-            # output neurons: give their type and their output status.
-            ('neuron(' + str(idn) + ',' + next(neuron_type).value + ').'
-             + 'output(' + str(idn) + ')'  # this neuron is an output
-             for idn in neuron_ids),
-            # edges
-            ('edge(' + str(id1) + ',' + str(id2) + ')'
-             for id1, id2 in self.edges)
-        )) + '.'
-        assert network_atoms.count('neuron') == self.nb_neuron
-        assert network_atoms.count('edge') == len(self.edges)
-        assert network_atoms.count('output') == self.nb_output_neuron
-        assert network_atoms.count(',i)') == self.nb_input_neuron
-        assert ('neuron(' + str(MINIMAL_NEURON_ID)) in network_atoms
-        assert ('neuron(' + str(self.maximal_neuron_id)) in network_atoms
-        assert ('neuron(' + str(MINIMAL_NEURON_ID-1)) not in network_atoms
-        # Cleaning, for remove useless data
-        self.neural_network_all = network_atoms
-        self.neural_network = NeuralNetworkEngine.cleaned(network_atoms)
-        LOGGER.debug('NEW NEURAL NETWORK: ' + self.neural_network_all)
-        LOGGER.debug('CLEANED: ' + self.neural_network)
-
-    def input_states(self, kwargs):
-        for input_func, nb_neuron in self.inputs:
+        self.genome = Genome.of(self.nb_input_neuron, self.nb_intermediate_neuron,
+                                self.nb_output_neuron, neuron_types, edges,
+                                self.evaluator)
+        # Compilation, if the network is evaluated through its circuit
+        if self.evaluator.compiling:
+            self.genome.circuit
+
+    @property
+    def edges(self):
+        return self.genome.edges if self.genome else None
+
+    @property
+    def neuron_types(self):
+        return self.genome.neuron_types if self.genome else None
+
+    @property
+    def neural_network_all(self):
+        return self.genome.neural_network_all
+
+    @property
+    def neural_network(self):
+        return self.genome.neural_network
+
+    @property
+    def circuit(self):
+        return self.genome.circuit
+
+    @property
+    def fingerprint(self):
+        return self.genome.reaction_fingerprint
+
+    def input_states(self, kwargs, skip:int=0):
+        """Yield the states of input neurons, skipping the given number
+        of first input functions"""
+        for input_func, nb_neuron in self.inputs[skip:]:
             states = input_func(**kwargs)
             assert len(states) == nb_neuron
             yield from states
@@ -94,8 +110,13 @@ class NeuralNetworkEngine:
     def react(self, **kwargs):
         """Call all output functions, based on reactions of the neural network
         to input functions, and yield their results."""
-        self.reaction_data = kwargs
         output_states = self.output_from(self.input_states(kwargs))
+        yield from self.react_with(output_states, **kwargs)
+
+    def react_with(self, output_states:tuple, **kwargs):
+        """Call all output functions with given output states, as computed
+        by output_from, and yield their results."""
+        self.reaction_data = kwargs
         assert self.nb_output_neuron == len(output_states)
         output_states = iter(output_states)
         for output_func, values in self.outputs:
@@ -109,27 +130,43 @@ class NeuralNetworkEngine:
         states: iterable of booleans, giving the state of input neurons.
         return: iterable of booleans, giving the state of output neurons.
 
+        Results are memoized in the process-wide cache.REACTIONS.
+
         """
+        up_inputs = frozenset(
+            # position in list gives the input neuron id
+            idn for idn, is_up in enumerate(input_states, start=MINIMAL_NEURON_ID)
+            if is_up
+        )
+        packed_inputs = cache.packed(up_inputs)
+        ret = cache.REACTIONS.get(self.fingerprint, packed_inputs)
+        if ret is None:
+            if self.evaluator.solving:
+                up_outputs = self.solved_outputs(up_inputs)
+            else:
+                up_outputs = self.circuit(up_inputs)
+            min_output_neuron_id = self.min_output_neuron_id
+            ret = tuple(idx in up_outputs for idx in range(min_output_neuron_id,
+                                                           self.maximal_neuron_id+1))
+            cache.REACTIONS.put(self.fingerprint, packed_inputs, ret)
+        LOGGER.debug('OUTPUT STATES: ' + str(ret))
+        return ret
+
+    def solved_outputs(self, up_inputs:iter) -> set:
+        """Return ids of up-state output neurons, computed by the ASP solver
+        from given ids of up-state input neurons."""
         # Atoms creation:
         #  - define the neural network
-        #  - add an atom up/1 or down/1 foreach input neuron according to its state
+        #  - add an atom up/1 foreach input neuron in up state
         input_atoms = self.neural_network + ''.join(
-            'up(' + str(idn) + ').'
-            # position in list gives the input neuron id
-            for idn, is_up in enumerate(input_states, start=MINIMAL_NEURON_ID)
-            if is_up
+            'up(' + str(idn) + ').' for idn in sorted(up_inputs)
         )
         LOGGER.debug('INPUT ATOMS: "' + input_atoms + '"')
         # ASP solver call
         model = solving.model_from(input_atoms, FILE_ASP_RUNNING)
         LOGGER.debug('OUTPUT ATOMS: ' + str(model))
-        up_outputs = set(int(atom.split('(')[1].strip(')'))
-                         for atom in model if atom.startswith('up'))
-        min_output_neuron_id = self.min_output_neuron_id
-        ret = tuple(idx in up_outputs for idx in range(min_output_neuron_id,
-                                                       self.maximal_neuron_id+1))
-        LOGGER.debug('OUTPUT STATES: ' + str(ret))
-        return ret
+        return set(int(atom.split('(')[1].strip(')'))
+                   for atom in model if atom.startswith('up'))
 
     @property
     def maximal_neuron_id(self):
@@ -177,12 +214,10 @@ class NeuralNetworkEngine:
 
 
     @staticmethod
-    def cleaned(network_atoms:str) ->str:
+    def cleaned(network_atoms:str, evaluator:Evaluator=Evaluator.ASP) ->str:
         """Return a cleaned version of given neural network to remove
         useless neuron, give an orientation to edges,..."""
-        model = solving.model_from(network_atoms, FILE_ASP_CLEANING)
-        assert model is not None, 'cleaning network lead to non existing model'
-        return '.'.join(model) + ('.' if len(model) else '')
+        return genome.cleaned(network_atoms, evaluator)
 
 
     @staticmethod
@@ -1,7 +1,13 @@
 """
 Object placed in the World, consummed by Individuals.
 
+Nutrients are stored by the spaces in a NutrientLayer, keeping only
+the number of nutrients and their total energy for each square.
+Nutrient instances are created only when asked for.
+
 """
+import numpy as np
+
 import neural_world.default as default
 
 
@@ -17,3 +23,75 @@ class Nutrient:
     def is_nutrient(self): return True
     @property
     def is_individual(self): return False
+
+
+class NutrientLayer:
+    """Numbers and total energies of nutrients in each square of a space
+    of two dimensions, as numpy arrays.
+
+    Squares are given by their index, x * height + y for the square
+    at coords (x, y). Nutrients of a square are undistinguishable:
+    each one have the mean energy of the square.
+
+    """
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = np.zeros(self.bounds, dtype=np.int32)
+        self.energy = np.zeros(self.bounds, dtype=np.int64)
+        # views on the same data, indexed by squares indexes
+        self.flat_counts = self.counts.reshape(-1)
+        self.flat_energy = self.energy.reshape(-1)
+
+    def add(self, cell:int, energy:int=default.NUTRIENT_ENERGY):
+        """Add a nutrient of given energy in square of given index"""
+        self.flat_counts[cell] += 1
+        self.flat_energy[cell] += energy
+
+    def add_all(self, cells:np.ndarray, energy:int=default.NUTRIENT_ENERGY):
+        """Add a nutrient of given energy in each square of given indexes,
+        that may be repeated"""
+        np.add.at(self.flat_counts, cells, 1)
+        np.add.at(self.flat_energy, cells, energy)
+
+    def remove(self, cell:int, energy:int):
+        """Remove a nutrient of given energy from square of given index.
+        Raise KeyError if no nutrient is present"""
+        if not self.flat_counts[cell]:
+            raise KeyError(cell)
+        self.flat_counts[cell] -= 1
+        self.flat_energy[cell] -= energy
+
+    def consume(self, cell:int) -> Nutrient or None:
+        """Remove a nutrient from square of given index and return it,
+        or None if no nutrient is present"""
+        nutrient = self.nutrient(cell)
+        if nutrient:
+            self.remove(cell, nutrient.energy)
+        return nutrient
+
+    def nutrient(self, cell:int) -> Nutrient or None:
+        """Return a Nutrient instance equivalent to nutrients of the square
+        of given index, or None if no nutrient is present"""
+        count = self.flat_counts[cell]
+        if count:
+            return Nutrient(energy=int(self.flat_energy[cell] // count))
+        return None
+
+    def nutrients(self, cell:int) -> list:
+        """Return Nutrient instances equivalent to nutrients of the square
+        of given index"""
+        count = int(self.flat_counts[cell])
+        return [self.nutrient(cell) for _ in range(count)]
+
+    def present(self, cells:np.ndarray) -> np.ndarray:
+        """Return the boolean array of nutrient presence in given squares"""
+        return self.flat_counts[cells] > 0
+
+    def __len__(self):
+        """Total number of nutrients"""
+        return int(self.flat_counts.sum())
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + self.energy.nbytes
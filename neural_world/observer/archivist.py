@@ -3,6 +3,9 @@ The Archivist is an observer of world.
 It saves data like DOT versions of neuron networks,
 and keep alive a register of events easily parsable.
 
+In deferred mode, networks are appended to a single archive,
+rendered at the end of the simulation (see the netarchive module).
+
 """
 import os
 from functools import partial
@@ -10,6 +13,7 @@ from functools import partial
 import neural_world.commons as commons
 import neural_world.actions as action
 import neural_world.converter as converter
+import neural_world.netarchive as netarchive
 from neural_world.nutrient import Nutrient
 from neural_world.individual import Individual
 from . import observer
@@ -21,12 +25,15 @@ class Archivist(observer.Observer, action.ActionEmitter):
     GRAPHVIZ_LAYOUT = converter.GraphvizLayout.dot
 
     def __init__(self, engine, archive_directory, simulation_id=None, *,
-                 save_graph=True, render_graph=True):
+                 save_graph=True, render_graph=True, deferred=False,
+                 nb_render_workers=None):
         super().__init__(invoker=engine)
         # data saving options
         self.save_graph = save_graph
         self.render_graph = render_graph
         self.do_graph = any((save_graph, render_graph))
+        self.deferred = deferred
+        self.nb_render_workers = nb_render_workers
         # use simulation_id as the name of the subdir in archive directory
         self.simulation_id = 'sim_' + str(simulation_id) if simulation_id else ''
         self.archive_directory = archive_directory
@@ -45,6 +52,11 @@ class Archivist(observer.Observer, action.ActionEmitter):
             os.path.join(self.archive_directory, Archivist.FILE_ARCHIVES),
             'w'  # erase unexpected existant file
         )
+        self.networks = None
+        if self.deferred:
+            self.networks = netarchive.NetworkArchive(
+                os.path.join(self.archive_directory, netarchive.FILE_NETWORKS)
+            )
 
     def __del__(self):
         "Close main archive file"
@@ -52,8 +64,12 @@ class Archivist(observer.Observer, action.ActionEmitter):
 
     def update(self, world, signals):
         """Intercept new individuals creation for create a snapshot
-        of their neural networks, in DOT format and PNG picture."""
-        if self.do_graph and observer.Signal.NEW_INDIVIDUAL in signals:
+        of their neural networks, in DOT format and PNG picture,
+        or archive them for a deferred rendering."""
+        if self.deferred and observer.Signal.NEW_INDIVIDUAL in signals:
+            new_indiv, parent, _ = signals[observer.Signal.NEW_INDIVIDUAL]
+            self.networks.add(new_indiv, parent)
+        elif self.do_graph and observer.Signal.NEW_INDIVIDUAL in signals:
             new_indiv, parent, _ = signals[observer.Signal.NEW_INDIVIDUAL]
             gen_filename = partial(self._archive_filename, new_indiv)
             network_versions = (
@@ -70,6 +86,14 @@ class Archivist(observer.Observer, action.ActionEmitter):
                     converter.graph_rendering(graph, render_file,
                                               layout=Archivist.GRAPHVIZ_LAYOUT)
 
+    def postprocessing(self, world):
+        """Render the archived networks, in deferred mode"""
+        if self.deferred:
+            self.networks.close()
+            if self.do_graph:
+                netarchive.render(self.archive_directory, self.nb_render_workers,
+                                  self.save_graph, self.render_graph)
+
     def save(self, data, archive_filename):
         "Save given data in file named archive_filename"
         with open(archive_filename, 'w') as fd:
@@ -0,0 +1,64 @@
+"""
+The Checkpointer is an observer of world, saving a checkpoint
+of the simulation every given number of steps (see the checkpoint module).
+
+With deltas, each checkpoint is kept, and followed by the deltas
+of the next steps, allowing to restore any step after the first checkpoint.
+
+"""
+import os
+
+import neural_world.commons as commons
+import neural_world.checkpoint as checkpoint
+from . import observer
+
+
+LOGGER = commons.logger()
+
+
+class Checkpointer(observer.Observer):
+    FILE_CHECKPOINT = 'checkpoint.nwck'
+    synchronous = True  # needs the world itself
+
+    def __init__(self, engine, archive_directory, interval:int, deltas:bool=False):
+        os.makedirs(archive_directory, exist_ok=True)
+        self.engine = engine
+        self.directory = archive_directory
+        self.filename = os.path.join(archive_directory, Checkpointer.FILE_CHECKPOINT)
+        self.interval = interval
+        self.deltas = None  # DeltaLog following the last checkpoint
+        if deltas:
+            engine.journal = checkpoint.Journal()
+
+    def update(self, world, signals={}):
+        """Save a checkpoint at each interval of steps, and a delta
+        at the other steps if asked"""
+        if len(signals) == 0 or observer.Signal.NEW_STEP in signals:
+            if self.interval and world.step_number % self.interval == 0:
+                self.save(world)
+            elif self.deltas:
+                self.deltas.write(world, self.engine.journal)
+
+    def save(self, world):
+        if self.engine.journal is None:
+            self.engine.save(self.filename)
+            LOGGER.info('CHECKPOINT: step ' + str(world.step_number)
+                        + ' saved in ' + self.filename)
+            return
+        if self.deltas:
+            self.deltas.close()
+        filename = os.path.join(self.directory,
+                                checkpoint.BASE_FILENAME.format(world.step_number))
+        genomes = self.engine.save(filename)
+        self.deltas = checkpoint.DeltaLog(
+            os.path.join(self.directory, checkpoint.DELTA_FILENAME.format(world.step_number)),
+            world, genomes
+        )
+        self.engine.journal.clear()
+        LOGGER.info('CHECKPOINT: step ' + str(world.step_number)
+                    + ' saved in ' + filename + ', followed by deltas')
+
+    def postprocessing(self, world):
+        if self.deltas:
+            self.deltas.close()
+            self.deltas = None
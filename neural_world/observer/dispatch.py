@@ -0,0 +1,248 @@
+"""
+Asynchronous dispatch of signals to observers.
+
+An AsyncObserver wraps an observer, and delivers it the signals in its own
+thread, through a bounded queue: a slow observer (rendering, printing,…)
+does not slow down the simulation, unless its queue is full and its
+overflow policy is to block.
+
+Observers do not receive the world itself, that is modified meanwhile,
+but an immutable WorldSnapshot, and the individuals in signals
+are replaced by FrozenIndividual instances.
+A single snapshot is taken by notification, and shared by all
+asynchronous observers. The grids of the space are copied in it
+only at new steps, and only if an observer needs them.
+
+"""
+import time
+import weakref
+import threading
+from collections import deque, defaultdict
+
+import numpy as np
+
+import neural_world.commons as commons
+from neural_world.commons import Overflow
+from . import observer
+
+
+LOGGER = commons.logger()
+
+
+class FrozenIndividual:
+    """Immutable view of an individual, at the time of a signal"""
+    __slots__ = ('unique_id', 'energy', 'genome')
+    is_individual, is_nutrient = True, False
+
+    def __init__(self, individual):
+        self.unique_id = individual.unique_id
+        self.energy = individual.energy
+        self.genome = individual.neural_network.genome
+
+    @property
+    def network_atoms(self):
+        return self.genome.neural_network
+
+    @property
+    def network_atoms_all(self):
+        return self.genome.neural_network_all
+
+    def __str__(self):
+        return str(self.unique_id)
+
+
+class FrozenSpace:
+    """Immutable states of the squares of a space, as copies of its grids"""
+
+    def __init__(self, space):
+        self.bounds = space.bounds
+        self.nutrients = space.nutrients.counts.copy()
+        self.individual_ids = space.individual_ids.copy()
+
+    def cell_states(self, cells:np.ndarray) -> tuple:
+        return tuple(zip((self.nutrients.ravel()[cells] > 0).tolist(),
+                         (self.individual_ids.ravel()[cells] > 0).tolist()))
+
+
+class WorldSnapshot:
+    """Immutable view of a world, at the time of a signal.
+
+    The statistics are kept for new steps only, and the states
+    of the squares, costly to copy, are added by snapshot_of()
+    when needed: otherwise, they are None.
+
+    """
+
+    def __init__(self, world, new_step:bool=True):
+        self.step_number = world.step_number
+        self.space_width = world.space_width
+        self.space_height = world.space_height
+        self.all_coords = world.all_coords
+        self.object_counter = defaultdict(int, world.object_counter)
+        self.nb_individual = world.nb_individual
+        self.statistics = world.statistics if new_step else None
+        self.space = None
+
+    @property
+    def have_life(self):
+        return self.nb_individual > 0
+
+
+# world: (notification number, snapshot) of its last notification
+SNAPSHOTS = weakref.WeakKeyDictionary()
+
+
+def snapshot_of(world, signals:dict={}, with_space:bool=False) -> WorldSnapshot:
+    """Return the snapshot of the current notification of given world,
+    taken at its first request, with the given signals"""
+    notification, snapshot = SNAPSHOTS.get(world, (None, None))
+    if notification != world.notifications:
+        snapshot = WorldSnapshot(world, new_step=is_new_step(signals))
+        SNAPSHOTS[world] = world.notifications, snapshot
+    if with_space and snapshot.space is None:
+        snapshot.space = FrozenSpace(world.space)
+    return snapshot
+
+
+def frozen_signals(signals:dict) -> dict:
+    """Return given signals, with immutable payloads"""
+    if observer.Signal.NEW_INDIVIDUAL in signals:
+        new, parent, coords = signals[observer.Signal.NEW_INDIVIDUAL]
+        signals = dict(signals)
+        signals[observer.Signal.NEW_INDIVIDUAL] = (
+            FrozenIndividual(new), parent and FrozenIndividual(parent), coords
+        )
+    return signals
+
+
+def is_new_step(signals:dict) -> bool:
+    return len(signals) == 0 or observer.Signal.NEW_STEP in signals
+
+
+class AsyncObserver(observer.Observer):
+    """Proxy delivering the signals to an observer in its own thread.
+
+    The queue keeps at most queue_size signals. When it is full,
+    the given Overflow policy is applied.
+    Pre and postprocessing are performed in the simulation thread,
+    postprocessing after delivery of all queued signals.
+
+    """
+
+    def __init__(self, observer, queue_size:int, overflow:Overflow=Overflow.BLOCK):
+        self.observer = observer
+        self.queue_size = max(1, queue_size)
+        self.overflow = overflow
+        self.queue = deque()  # (notification time, step, world snapshot, signals)
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        # lag metrics
+        self.received = self.delivered = self.dropped = self.coalesced = 0
+        self.errors = self.max_pending = 0
+        self.total_latency = self.max_latency = 0.
+        self.notified_step = self.delivered_step = 0
+
+    @property
+    def name(self):
+        return type(self.observer).__name__
+
+    def preprocessing(self, world):
+        self.observer.preprocessing(world)
+        self.start()
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.deliver_all, daemon=True,
+                                       name='observer-' + self.name)
+        self.thread.start()
+
+    def update(self, world, signals={}):
+        """Queue the given signals, with a snapshot of given world"""
+        if self.thread is None:
+            self.start()
+        snapshot = snapshot_of(world, signals, with_space=self.observer.needs_space
+                               and is_new_step(signals))
+        item = time.monotonic(), world.step_number, snapshot, frozen_signals(signals)
+        with self.condition:
+            self.received += 1
+            self.notified_step = world.step_number
+            while len(self.queue) >= self.queue_size:
+                if self.overflow is Overflow.DROP_OLDEST:
+                    self.queue.popleft()
+                    self.dropped += 1
+                elif self.overflow is Overflow.COALESCE and is_new_step(signals) \
+                     and self.coalesce():
+                    self.coalesced += 1
+                else:  # wait for the observer
+                    self.condition.wait()
+            self.queue.append(item)
+            self.max_pending = max(self.max_pending, len(self.queue))
+            self.condition.notify_all()
+
+    def coalesce(self) -> bool:
+        """Remove the oldest queued new step, and return True,
+        or False if there is none"""
+        for idx, (_, _, _, signals) in enumerate(self.queue):
+            if is_new_step(signals):
+                del self.queue[idx]
+                return True
+        return False
+
+    def deliver_all(self):
+        """Thread loop: deliver queued signals until stopped and queue empty"""
+        while True:
+            with self.condition:
+                while not self.queue and self.running:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                notification, step, world, signals = self.queue.popleft()
+                self.condition.notify_all()
+            try:
+                self.observer.update(world, signals)
+            except Exception:
+                self.errors += 1
+                LOGGER.exception('OBSERVER ' + self.name + ': error in update')
+            latency = time.monotonic() - notification
+            with self.condition:
+                self.delivered += 1
+                self.delivered_step = step
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+    def postprocessing(self, world):
+        if self.thread:
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+            self.thread.join()
+            self.thread = None
+        LOGGER.info('OBSERVER ' + self.name + ': ' + str(self.stats))
+        self.observer.postprocessing(world)
+
+    @property
+    def stats(self) -> dict:
+        """Lag metrics of the observer"""
+        with self.condition:
+            return {
+                'received': self.received,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'pending': len(self.queue),
+                'max_pending': self.max_pending,
+                'step_lag': self.notified_step - self.delivered_step,
+                'mean_latency': self.total_latency / self.delivered if self.delivered else 0.,
+                'max_latency': self.max_latency,
+            }
+
+
+def dispatched(observer, config):
+    """Return given observer, wrapped in an AsyncObserver if
+    the given config asks for it and the observer allows it"""
+    if config.async_observers and not observer.synchronous:
+        return AsyncObserver(observer, config.observer_queue_size,
+                             config.observer_overflow)
+    return observer
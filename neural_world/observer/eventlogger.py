@@ -0,0 +1,67 @@
+"""
+The EventLogger is an observer of world, writing births, deaths, moves
+and step summaries in a binary event log (see the eventlog module).
+
+Births are given by signals. Deaths and moves are found at each new step,
+by comparison of the individuals of the world with those of the last step.
+Steps are counted by the logger, as the world step number may be reset.
+
+"""
+import os
+
+import neural_world.commons as commons
+from neural_world.eventlog import EventLog
+from neural_world.nutrient import Nutrient
+from . import observer
+
+
+LOGGER = commons.logger()
+
+
+class EventLogger(observer.Observer):
+    FILE_EVENTS = 'events.log'
+    synchronous = True  # needs the individuals of the world
+
+    def __init__(self, engine, archive_directory, chunk_size:int=2**20):
+        os.makedirs(archive_directory, exist_ok=True)
+        self.filename = os.path.join(archive_directory, EventLogger.FILE_EVENTS)
+        self.chunk_size = chunk_size
+        self.log = None
+        self.step = 0  # number of the current step
+        self.coords = {}  # individual id: coords at the last step
+
+    def preprocessing(self, world):
+        self.log = EventLog(self.filename, self.chunk_size)
+        LOGGER.info('EVENT LOG: written in ' + self.filename)
+
+    def update(self, world, signals={}):
+        if self.log is None:
+            return
+        if observer.Signal.NEW_INDIVIDUAL in signals:
+            new, parent, coords = signals[observer.Signal.NEW_INDIVIDUAL]
+            coords = world.wrapped(coords)
+            self.log.birth(self.step, new.unique_id,
+                           parent.unique_id if parent else None, coords,
+                           new.genome.fingerprint)
+            self.coords[new.unique_id] = coords
+        elif len(signals) == 0 or observer.Signal.NEW_STEP in signals:
+            self.log_step(world)
+
+    def log_step(self, world):
+        """Write the deaths and moves of the last step, then its summary"""
+        current = {indiv.unique_id: coords for indiv, coords in world.individuals.items()}
+        for idn, coords in self.coords.items():
+            new_coords = current.get(idn)
+            if new_coords is None:
+                self.log.death(self.step, idn, coords)
+            elif new_coords != coords:
+                self.log.move(self.step, idn, new_coords)
+        self.coords = current
+        self.step += 1
+        self.log.step(self.step, world.nb_individual,
+                      world.object_counter[Nutrient])
+
+    def postprocessing(self, world):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
@@ -13,7 +13,16 @@ class Signal(Enum):
 
 
 class Observer:
-    """Receive signals from an Observable"""
+    """Receive signals from an Observable.
+
+    Observers needing the world itself, not a snapshot of it, and cheap
+    enough for being called in the simulation thread, are synchronous.
+    Others may be dispatched asynchronously (see the dispatch module):
+    those reading the squares of the world need a copy of the space.
+
+    """
+    synchronous = False
+    needs_space = False
 
     def __init__(self, *args, **kwargs):
         pass
@@ -36,6 +45,7 @@ class Observable:
 
     def __init__(self, *args, **kwargs):
         self.observers = set()
+        self.notifications = 0  # number of notify_observers calls
 
     def register(self, observer):
         "Add given observer to set of observers"
@@ -47,6 +57,7 @@ class Observable:
 
     def notify_observers(self, signals={}):
         "notify all observers"
+        self.notifications += 1
         [o.update(self, signals) for o in self.observers]
 
     def init_observers(self):
@@ -0,0 +1,35 @@
+"""
+The SharedStatePublisher is an observer of world, writing its state
+in shared memory at each step, for other processes.
+See the shared module.
+
+"""
+import neural_world.commons as commons
+from neural_world.shared import SharedWorldState
+from . import observer
+
+
+LOGGER = commons.logger()
+
+
+class SharedStatePublisher(observer.Observer):
+    synchronous = True  # needs the world itself
+
+    def __init__(self, engine, name:str=None):
+        self.name = name or None  # None: let the system choose it
+        self.state = None
+
+    def preprocessing(self, world):
+        self.state = SharedWorldState(world.space.bounds, self.name)
+        self.state.write(world)
+        LOGGER.info('SHARED STATE: published as ' + self.state.name)
+
+    def update(self, world, signals={}):
+        """Write the world state at each new step"""
+        if self.state and (len(signals) == 0 or observer.Signal.NEW_STEP in signals):
+            self.state.write(world)
+
+    def postprocessing(self, world):
+        if self.state:
+            self.state.close()
+            self.state = None
@@ -2,11 +2,12 @@
 Basical implementation of a terminal view for World object.
 
 """
+import numpy as np
+
 import neural_world.commons as commons
 import neural_world.actions as action
 from neural_world.individual import Individual
 from neural_world.nutrient import Nutrient
-from neural_world.neural_network import NeuralNetwork
 from . import observer
 
 
@@ -14,6 +15,8 @@ LOGGER = commons.logger()
 
 
 class TerminalWorldView(observer.Observer, action.ActionEmitter):
+    needs_space = True
+
     def __init__(self, engine):
         super().__init__(invoker=engine)
         self.graphics = {
@@ -25,25 +28,22 @@ class TerminalWorldView(observer.Observer, action.ActionEmitter):
     def update(self, world, signals={}):
         """Print World in the terminal"""
         if len(signals) == 0 or observer.Signal.NEW_STEP in signals:
+            statistics = world.statistics  # copies, when world is a snapshot
             print('\nstep:', world.step_number,
                   '\tindividuals:', world.object_counter[Individual],
-                  '\tmemories:', len(NeuralNetwork.MEMORIES), NeuralNetwork.MEMORIES,
-                  '\ndirections:', NeuralNetwork.DIRECTIONS,
+                  '\tmemories:', len(statistics['memories']), statistics['memories'],
+                  '\ndirections:', statistics['directions'],
+                  '\nreactions cache:', statistics['reactions'],
                  )
-            x_prev, line = 0, ''
-            for coords, objects in world.ordered_objects:
-                x, y = coords
-                if x_prev != x:
-                    x_prev = x
-                    print('|', line, '|')
-                    line = ''
-                if len(objects) > 0:
-                    if any(isinstance(o, Individual) for o in objects):
-                        line += self.graphics[Individual]
-                    else:
-                        line += self.graphics[Nutrient]
-                else:
-                    line += ' '
+            states = world.space.cell_states(np.arange(len(world.all_coords)))
+            for x in range(world.space_width):
+                line = ''.join(
+                    self.graphics[Individual] if indiv else
+                    (self.graphics[Nutrient] if nutrient else ' ')
+                    for nutrient, indiv in states[x*world.space_height:
+                                                  (x+1)*world.space_height]
+                )
+                print('|', line, '|')
 
 
 class NullTerminalWorldView(TerminalWorldView):
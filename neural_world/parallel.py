@@ -0,0 +1,186 @@
+"""
+Evaluation of neural networks by a pool of worker processes.
+
+Each worker keeps replicas of the genomes it has to evaluate, keyed by their
+fingerprint, and compiles them once. At each step, the networks are shared
+between workers according to their genome fingerprint, so that a genome is
+replicated in a single worker, and each worker receives the genomes
+it does not know yet, the fingerprints of the genomes that are not used
+anymore, and the input states of its networks as packed bits.
+It sends back the output states, as packed bits.
+
+"""
+import os
+import atexit
+import weakref
+import multiprocessing
+
+import numpy as np
+
+from neural_world import commons
+from neural_world import default
+from neural_world.commons import Evaluator
+
+
+LOGGER = commons.logger(commons.SUBLOGGER_LIFE)
+
+
+def serve(connection):
+    """Worker loop: evaluate the received requests until None is received.
+
+    A request is a 4-tuple (new genomes, forgotten fingerprints,
+    fingerprints, packed inputs), where a new genome is given
+    as a 2-tuple (fingerprint, genome data).
+    The reply is the packed outputs.
+
+    """
+    from neural_world.batch import evaluate_circuits
+    genomes = {}  # fingerprint: genome
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        new, forgotten, fingerprints, inputs = request
+        networks = replicas(genomes, new, forgotten, fingerprints)
+        inputs = np.unpackbits(inputs, axis=1, bitorder='little').astype(bool)
+        outputs = evaluate_circuits(networks, inputs)
+        connection.send(np.packbits(outputs, axis=1, bitorder='little'))
+    connection.close()
+
+
+def replicas(genomes:dict, new:iter, forgotten:iter, fingerprints:iter) -> list:
+    """Update given dict fingerprint:genome of a worker with given new
+    and forgotten genomes, and return the genomes of given fingerprints"""
+    from neural_world.genome import Genome
+    for fingerprint in forgotten:
+        genomes.pop(fingerprint, None)
+    for fingerprint, data in new:
+        genomes[fingerprint] = Genome.of(*data, evaluator=Evaluator.CIRCUIT)
+    return [genomes[fingerprint] for fingerprint in fingerprints]
+
+
+class WorkerPool:
+    """Pool of worker processes evaluating neural networks.
+
+    Workers are started at the first evaluation, and stopped
+    when the pool is resized or stopped.
+    A number of workers of 0 stands for one worker per core.
+
+    Subclasses may run another worker loop, receiving the connection
+    and the worker_args() as arguments, and send other requests
+    through send().
+
+    """
+    serve = staticmethod(serve)
+
+    def __init__(self, nb_workers:int=default.NB_WORKERS):
+        self.nb_workers = nb_workers
+        self.workers = []  # (process, connection)
+        self.known = []  # for each worker, set of known fingerprints
+        self.forgotten = []  # for each worker, list of dead fingerprints
+
+    @property
+    def size(self):
+        return self.nb_workers or os.cpu_count()
+
+    def resize(self, nb_workers:int):
+        """Change the number of workers"""
+        if nb_workers != self.nb_workers:
+            self.stop()
+            self.nb_workers = nb_workers
+
+    def worker_args(self, worker:int) -> tuple:
+        """Additional arguments of the loop of given worker"""
+        return ()
+
+    def start(self):
+        for worker in range(self.size):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=self.serve, args=(worker_connection, *self.worker_args(worker)),
+                daemon=True
+            )
+            process.start()
+            self.workers.append((process, connection))
+            self.known.append(set())
+            self.forgotten.append([])
+        LOGGER.info('WORKERS: ' + str(self.size) + ' started')
+
+    def stop(self):
+        for process, connection in self.workers:
+            try:
+                connection.send(None)
+            except OSError:  # daemon worker already terminated at exit
+                pass
+            process.join()
+        self.workers, self.known, self.forgotten = [], [], []
+
+    def forget(self, worker:int, fingerprint:int):
+        """Called when a genome sent to given worker is not used anymore"""
+        if worker < len(self.forgotten):
+            self.forgotten[worker].append(fingerprint)
+            self.known[worker].discard(fingerprint)
+
+    def evaluate(self, networks:list, inputs:np.ndarray) -> np.ndarray:
+        """Return output states of given neural networks, for given input
+        states, as batch.evaluate_circuits"""
+        nb_outputs = max((n.nb_output_neuron for n in networks), default=0)
+        outputs = np.zeros((len(networks), nb_outputs), dtype=bool)
+        if not networks:
+            return outputs
+        if not self.workers:
+            self.start()
+        genomes = [network.genome for network in networks]
+        assignment = np.array([g.fingerprint % len(self.workers) for g in genomes])
+        packed = np.packbits(inputs, axis=1, bitorder='little')
+        requests = []  # (worker, indexes of its networks)
+        for worker in range(len(self.workers)):
+            indexes = np.flatnonzero(assignment == worker)
+            if len(indexes):
+                self.send(worker, [genomes[idx] for idx in indexes], packed[indexes])
+                requests.append((worker, indexes))
+        self.receive_outputs(requests, outputs)
+        return outputs
+
+    def send(self, worker:int, genomes:list, *payload):
+        """Send to given worker a request about given genomes, with
+        the new and forgotten genomes of the worker, and given payload"""
+        new, forgotten = self.news(worker, genomes)
+        _, connection = self.workers[worker]
+        connection.send((new, forgotten,
+                         [genome.fingerprint for genome in genomes], *payload))
+
+    def news(self, worker:int, genomes:iter) -> (tuple, list):
+        """Return the data of given genomes unknown by given worker, which
+        are then known, and the fingerprints it has to forget"""
+        new = {}
+        for genome in genomes:
+            if genome.fingerprint not in self.known[worker] and genome.fingerprint not in new:
+                new[genome.fingerprint] = (
+                    genome.nb_input_neuron, genome.nb_intermediate_neuron,
+                    genome.nb_output_neuron, genome.neuron_types, genome.edges
+                )
+                weakref.finalize(genome, self.forget, worker, genome.fingerprint)
+        self.known[worker].update(new)
+        forgotten, self.forgotten[worker] = self.forgotten[worker], []
+        return tuple(new.items()), forgotten
+
+    def receive_outputs(self, requests:list, outputs:np.ndarray):
+        """Receive the packed outputs of given requests, as pairs
+        (worker, indexes of the networks), and write them in outputs"""
+        for worker, indexes in requests:
+            _, connection = self.workers[worker]
+            replies = np.unpackbits(connection.recv(), axis=1, bitorder='little')
+            width = min(outputs.shape[1], replies.shape[1])
+            outputs[indexes, :width] = replies[:, :width]
+
+
+# The process-wide pool, resized by Engine.apply
+WORKERS = WorkerPool()
+atexit.register(WORKERS.stop)
+
+
+def evaluate_parallel(networks:list, inputs:np.ndarray) -> np.ndarray:
+    """Return output states of given neural networks, for given input states,
+    computed by the workers. See batch.evaluate_circuits."""
+    return WORKERS.evaluate(networks, inputs)
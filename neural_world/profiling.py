@@ -0,0 +1,64 @@
+"""
+Time spent by the engine in each phase of the steps.
+
+The Engine, and the batched evaluations, surround each phase of a step
+with the phase() context of their profiler:
+
+    inputs: gathering of the input states of the networks
+    evaluation: computation of the reactions, and emission of their actions
+    invocation: execution of the actions of the individuals
+    regeneration: regeneration of the nutrients
+    observers: notification of the new step to the observers
+
+With unbatched evaluators, only the neighbors are gathered in the inputs
+phase, other input states being computed by the networks themselves.
+With the tiled one, the steps are computed by the tiles: the inputs phase
+is the sending of the step to the tiles, the evaluation one the wait
+of their reactions, and the invocation one the resolution of the actions
+and the update of the world.
+By default, the engine uses NULL_PROFILER, that measures nothing.
+
+"""
+import time
+from contextlib import contextmanager, nullcontext
+
+
+PHASES = ('inputs', 'evaluation', 'invocation', 'regeneration', 'observers')
+
+
+class PhaseProfiler:
+    """Accumulate the time spent in each phase"""
+
+    def __init__(self):
+        self.times = dict.fromkeys(PHASES, 0.)
+        self.calls = dict.fromkeys(PHASES, 0)
+
+    @contextmanager
+    def phase(self, name:str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    @property
+    def stats(self) -> dict:
+        """Total time in seconds and number of calls of each phase"""
+        return {name: {'time': self.times[name], 'calls': self.calls[name]}
+                for name in PHASES}
+
+
+class NullProfiler:
+    """Profiler measuring nothing, at the lowest cost"""
+    CONTEXT = nullcontext()
+
+    def phase(self, name:str):
+        return NullProfiler.CONTEXT
+
+    @property
+    def stats(self) -> dict:
+        return {}
+
+
+NULL_PROFILER = NullProfiler()
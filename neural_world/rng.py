@@ -0,0 +1,48 @@
+"""
+Seedable random streams of a simulation.
+
+Each source of randomness of the simulation draws from its own stream,
+a numpy Generator independent of the others, all of them derived
+from a single seed:
+
+    placement: initial population and nutrients, random coords of spawns
+    regeneration: nutrients regenerated at each step
+    mutation: mutations of the genomes of clones
+    incubation: genomes of spawned individuals
+    replication: placement of clones around their parent
+
+Because each stream is used in the order of the actions of the world,
+that is the same whatever the evaluation of the networks,
+two simulations of the same seed are identical.
+
+"""
+import random
+
+import numpy as np
+
+
+STREAMS = ('placement', 'regeneration', 'mutation', 'incubation', 'replication')
+
+
+class RandomStreams:
+    """Named numpy generators derived from given seed, or, if None,
+    from a seed drawn by the random module"""
+
+    def __init__(self, seed:int=None):
+        self.seed = random.getrandbits(64) if seed is None else seed
+        sequences = np.random.SeedSequence(self.seed).spawn(len(STREAMS))
+        for name, sequence in zip(STREAMS, sequences):
+            setattr(self, name, np.random.default_rng(sequence))
+
+    @property
+    def state(self) -> dict:
+        """States of the generators, by stream name"""
+        return {name: getattr(self, name).bit_generator.state for name in STREAMS}
+
+    @state.setter
+    def state(self, states:dict):
+        for name in STREAMS:
+            getattr(self, name).bit_generator.state = states[name]
+
+    def __str__(self):
+        return 'RandomStreams(seed=' + str(self.seed) + ')'
@@ -0,0 +1,201 @@
+"""
+Sharing of the state of a World with other processes, through shared memory.
+
+A SharedWorldState holds, in a single shared memory block, a header
+followed by grids of the space, indexed as the World squares (x, y):
+    ids: unique id of an individual in the square, 0 if none (int64)
+    energies: total energy of the individuals in the square (int64)
+    occupancy: number of individuals in the square (int32)
+    nutrients: number of nutrients in the square (int32)
+
+The header gives the sequence counter, the step number, the bounds
+and the numbers of individuals and nutrients.
+Only the squares of the individuals of the last and current writes
+are rewritten, the nutrient counts being copied as a whole.
+The grids may also be written by other processes, as the tiles
+of a TilePool, within the writing() context.
+The sequence counter is odd while the state is written (a seqlock):
+readers copy the grids, and retry if the counter was odd or changed meanwhile.
+Readers never block the writer, and the writer never waits for them.
+
+A SharedWorldReader maps the state read-only, given its name:
+
+    reader = SharedWorldReader('neural_world')
+    snapshot = reader.snapshot()
+    print(snapshot.step, snapshot.occupancy.sum())
+
+"""
+import sys
+import time
+import weakref
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+from neural_world.nutrient import Nutrient
+
+
+# indexes of the header fields, the header being of HEADER_SIZE int64
+SEQUENCE, STEP, WIDTH, HEIGHT, NB_INDIVIDUAL, NB_NUTRIENT = range(6)
+HEADER_SIZE = 8  # last ones are reserved
+GRIDS = (('ids', np.int64), ('energies', np.int64),
+         ('occupancy', np.int32), ('nutrients', np.int32))
+
+# A consistent copy of the shared state
+Snapshot = namedtuple('Snapshot', ('step', 'nb_individual', 'nb_nutrient')
+                      + tuple(name for name, _ in GRIDS))
+
+
+def memory_size(bounds:tuple) -> int:
+    """Return the size in bytes of the shared state of a space of given bounds"""
+    width, height = bounds
+    return 8 * HEADER_SIZE + sum(np.dtype(dtype).itemsize * width * height
+                                 for _, dtype in GRIDS)
+
+
+def views(buffer, bounds:tuple) -> (np.ndarray, dict):
+    """Return the header array and the dict name:grid over given buffer"""
+    width, height = bounds
+    header = np.ndarray(HEADER_SIZE, dtype=np.int64, buffer=buffer)
+    grids, offset = {}, 8 * HEADER_SIZE
+    for name, dtype in GRIDS:
+        grids[name] = np.ndarray((width, height), dtype=dtype,
+                                 buffer=buffer, offset=offset)
+        offset += grids[name].nbytes
+    return header, grids
+
+
+def attached(name:str) -> shared_memory.SharedMemory:
+    """Return the existing shared memory of given name, without registering
+    it to the resource tracker.
+
+    The creator only is responsible of the unlinking: otherwise, the tracker
+    would unlink the memory at the end of the first reader process.
+
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register, resource_tracker.register = resource_tracker.register, lambda *_: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedWorldState:
+    """Writer of the state of a World in a new shared memory block.
+
+    The block is unlinked by close(), or when the instance is collected.
+    The name, if not given, is chosen by the system.
+
+    """
+
+    def __init__(self, bounds:tuple, name:str=None):
+        self.bounds = tuple(bounds)
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=True, size=memory_size(self.bounds)
+        )
+        self.unlink = weakref.finalize(self, self.memory.unlink)
+        self.header, self.grids = views(self.memory.buf, self.bounds)
+        self.header[:] = 0
+        self.header[WIDTH], self.header[HEIGHT] = self.bounds
+        for grid in self.grids.values():
+            grid[...] = 0
+        self.cells = np.empty(0, dtype=np.int64)  # squares of the last write
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    @property
+    def sequence(self):
+        return int(self.header[SEQUENCE])
+
+    @contextmanager
+    def writing(self, world):
+        """Context where the grids are written, by this process or others,
+        the header being then written from given world"""
+        self.header[SEQUENCE] += 1  # odd: write in progress
+        try:
+            yield self.grids
+        finally:
+            self.header[STEP] = world.step_number
+            self.header[NB_INDIVIDUAL] = world.nb_individual
+            self.header[NB_NUTRIENT] = world.object_counter[Nutrient]
+            self.header[SEQUENCE] += 1  # even: state is consistent
+
+    def write(self, world):
+        """Write the state of given world"""
+        cells = np.fromiter((world.cell(coords) for coords in world.individuals.values()),
+                            dtype=np.int64, count=world.nb_individual)
+        ids = np.fromiter((indiv.unique_id for indiv in world.individuals),
+                          dtype=np.int64, count=world.nb_individual)
+        energies = np.fromiter((indiv.energy for indiv in world.individuals),
+                               dtype=np.int64, count=world.nb_individual)
+        with self.writing(world) as grids:
+            for name in ('ids', 'energies', 'occupancy'):
+                grids[name].reshape(-1)[self.cells] = 0
+            self.cells = cells
+            grids['ids'].reshape(-1)[cells] = ids
+            np.add.at(grids['energies'].reshape(-1), cells, energies)
+            np.add.at(grids['occupancy'].reshape(-1), cells, 1)
+            grids['nutrients'][...] = world.space.nutrients.counts
+
+    def close(self):
+        """Release and unlink the shared memory"""
+        del self.header, self.grids
+        self.memory.close()
+        self.unlink()
+
+
+class SharedWorldReader:
+    """Read-only mapping of a SharedWorldState, found by its name"""
+
+    def __init__(self, name:str):
+        self.memory = attached(name)
+        header = np.ndarray(HEADER_SIZE, dtype=np.int64, buffer=self.memory.buf)
+        self.bounds = int(header[WIDTH]), int(header[HEIGHT])
+        self.header, self.grids = views(self.memory.buf, self.bounds)
+        for array in (self.header, *self.grids.values()):
+            array.flags.writeable = False
+
+    @property
+    def sequence(self):
+        return int(self.header[SEQUENCE])
+
+    @property
+    def step(self):
+        return int(self.header[STEP])
+
+    def snapshot(self, timeout:float=1.) -> Snapshot:
+        """Return a consistent copy of the shared state.
+        Raise TimeoutError if the state is written during all given time."""
+        deadline = time.monotonic() + timeout
+        while True:
+            before = self.sequence
+            if before % 2 == 0:
+                header = self.header.copy()
+                grids = {name: grid.copy() for name, grid in self.grids.items()}
+                if self.sequence == before:
+                    return Snapshot(step=int(header[STEP]),
+                                    nb_individual=int(header[NB_INDIVIDUAL]),
+                                    nb_nutrient=int(header[NB_NUTRIENT]), **grids)
+            if time.monotonic() > deadline:
+                raise TimeoutError('Shared world state is never consistent')
+            time.sleep(0)
+
+    def wait_step(self, step:int, timeout:float=None, delay:float=0.01) -> bool:
+        """Wait until the shared state reaches given step, and return True,
+        or False if the given timeout (in seconds) is reached before"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.step < step:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(delay)
+        return True
+
+    def close(self):
+        del self.header, self.grids
+        self.memory.close()
@@ -1,13 +1,37 @@
 """Definition of generic solving routines,
-encapsulating ASP calls through pyasp API.
+encapsulating ASP calls through clingo or pyasp API.
+
+When the clingo python module is available, the solving is performed
+in-process: each ASP program is read and parsed only once, and kept in memory
+as a list of statements.
+Programs declaring #external atoms are grounded once for each set of other
+atoms, in a clingo Control kept in the CONTROLS pool: calls differing only
+by their external atoms just assign them, then solve.
+Given atoms of an external predicate that are not declared external
+by the grounded program are ignored, as they cannot change its models.
+Other programs feed a new clingo Control at each call.
+Otherwise, pyasp is used, running gringo and clasp in subprocesses.
 
 """
-from pyasp import asp
+from collections import OrderedDict
+
+try:
+    import clingo
+    from clingo import ast as clingo_ast
+except ImportError:  # pyasp will spawn the solvers
+    clingo = None
+try:
+    from pyasp import asp
+except ImportError:
+    asp = None
 from neural_world import commons
 
 
 LOGGER = commons.logger(commons.SUBLOGGER_SOLVING)
 
+if clingo is None and asp is None:
+    raise ImportError('Solving needs one of the clingo or pyasp modules')
+
 # ASP SOLVING OPTIONS
 ASP_GRINGO_OPTIONS = ''  # no default options
 ASP_CLASP_OPTIONS  = ''  # options of solving heuristics
@@ -15,6 +39,14 @@ ASP_CLASP_OPTIONS  = ''  # options of solving heuristics
 # ASP_CLASP_OPTIONS += ' --configuration=frumpy'
 # ASP_CLASP_OPTIONS += ' --heuristic=Vsids'
 
+# Solving through clingo, if available.
+USE_CLINGO = clingo is not None
+# Parsed ASP programs: tuple of filenames -> Program
+PROGRAMS = {}
+# Grounded programs: (filenames, options, atoms) -> Grounded, least recently used first
+CONTROLS = OrderedDict()
+CONTROLS_MAXSIZE = 256
+
 
 def model_from(base_atoms, aspfiles, aspargs={},
                gringo_options='', clasp_options=''):
@@ -38,13 +70,18 @@ def model_from(base_atoms, aspfiles, aspargs={},
     constants = ' -c '.join(str(k)+'='+str(v) for k,v in aspargs.items())
     if len(aspargs) > 0:  # must begin by a -c for announce the first constant
         constants = '-c ' + constants
+    LOGGER.info('SOLVING: ' + str(aspfiles) + ' constants: ' + str(constants))
+    if USE_CLINGO:
+        options = ' '.join((constants, ASP_GRINGO_OPTIONS, gringo_options,
+                            ASP_CLASP_OPTIONS, clasp_options))
+        return clingo_model(base_atoms, aspfiles, options)
+
     gringo_options = ' '.join((constants, ASP_GRINGO_OPTIONS, gringo_options))
     clasp_options += ' ' + ' '.join(ASP_CLASP_OPTIONS)
 
     #  create solver and ground base and program in a single ground call.
     solver = asp.Gringo4Clasp(gringo_options=gringo_options,
                               clasp_options=clasp_options)
-    LOGGER.info('SOLVING: ' + str(aspfiles) + ' constants: ' + str(constants))
     answers = solver.run(aspfiles, additionalProgramText=base_atoms)
 
     # return the first found solution, or None if no solution
@@ -59,3 +96,97 @@ def model_from(base_atoms, aspfiles, aspargs={},
     except StopIteration:
         # no valid model
         return None
+
+
+class Program:
+    """Parsed statements of an ASP program, and names of its
+    external predicates"""
+
+    def __init__(self, aspfiles):
+        statements = []
+        clingo_ast.parse_files(list(aspfiles), statements.append)
+        self.statements = tuple(statements)
+        self.externals = frozenset(
+            statement.atom.symbol.name for statement in self.statements
+            if statement.ast_type == clingo_ast.ASTType.External
+        )
+
+    def control(self, atoms:str, options:str) -> 'clingo.Control':
+        """Return a new Control, where self and given atoms are added"""
+        control = clingo.Control(['--warn=none', *options.split()])
+        with clingo_ast.ProgramBuilder(control) as builder:
+            for statement in self.statements:
+                builder.add(statement)
+        control.add('base', [], atoms)
+        return control
+
+
+class Grounded:
+    """Control where a program is grounded, with its external atoms by name"""
+
+    def __init__(self, control):
+        self.control = control
+        self.externals = {str(atom.symbol): atom.symbol
+                          for atom in control.symbolic_atoms if atom.is_external}
+
+    def assign(self, atoms:iter):
+        """Set to true the externals of given names, and others to false"""
+        atoms = frozenset(atoms)
+        for name, symbol in self.externals.items():
+            self.control.assign_external(symbol, name in atoms)
+
+
+def program(aspfiles) -> Program:
+    """Return the parsed ASP program in given files"""
+    key = tuple(aspfiles)
+    try:
+        return PROGRAMS[key]
+    except KeyError:
+        PROGRAMS[key] = Program(key)
+        return PROGRAMS[key]
+
+
+def grounded(aspfiles, options:str, atoms:str) -> Grounded:
+    """Return the program in given files grounded with given atoms,
+    from the CONTROLS pool if possible"""
+    key = tuple(aspfiles), options, atoms
+    try:
+        CONTROLS.move_to_end(key)
+        return CONTROLS[key]
+    except KeyError:
+        control = program(aspfiles).control(atoms, options)
+        control.ground([('base', [])])
+        CONTROLS[key] = Grounded(control)
+        while len(CONTROLS) > CONTROLS_MAXSIZE:
+            CONTROLS.popitem(last=False)
+        return CONTROLS[key]
+
+
+def clingo_model(base_atoms, aspfiles, options='') -> set:
+    """Return the first model of the program in given files with given atoms,
+    as a set of atoms, or None if no model.
+
+    Options are command-line options of clingo.
+
+    """
+    externals = program(aspfiles).externals
+    if externals:  # the program is grounded without the external atoms
+        atoms, inputs = [], []
+        for atom in base_atoms.split('.'):
+            atom = atom.strip()
+            if atom:
+                (inputs if atom.split('(')[0] in externals else atoms).append(atom)
+        solved = grounded(aspfiles, options, '.'.join(atoms) + '.' if atoms else '')
+        solved.assign(inputs)
+        control = solved.control
+    else:
+        control = program(aspfiles).control(base_atoms, options)
+        control.ground([('base', [])])
+    with control.solve(yield_=True) as models:
+        for model in models:
+            first_solution = set(str(atom) for atom in model.symbols(shown=True))
+            LOGGER.debug('SOLVING INPUT: ' + str(base_atoms))
+            LOGGER.debug('SOLVING OUTPUT: ' + str(len(first_solution))
+                         + ': ' + ' '.join(first_solution))
+            return first_solution
+    return None
@@ -1,17 +1,35 @@
 """
-Definition of the Space class that placement of objects in space.
+Definition of the Space classes that handle placement of objects in space.
+
+Both classes share the same API, used by the World:
+    add(obj, coords) and remove(obj, coords): placement of objects.
+    occuped_at(coords): True iff an individual is at given coords.
+    consume_nutrient(coords): remove a nutrient from given coords and return it.
+    cell_states(cells): (nutrient presence, individual presence) of the squares
+                        of given indexes.
+    objects_at(coords): objects placed at given coords.
+    items(): pairs (coords, objects) of non-empty squares.
+    individual_ids: grid of the id of an individual of each square (0 if none).
+
+In both, nutrients are counted by a NutrientLayer, not kept as objects.
 
 """
+import itertools
 from collections import defaultdict
 
+import numpy as np
+
+from neural_world.commons import SpaceBackend
+from neural_world.nutrient import NutrientLayer
+
 
 class Space(defaultdict):
-    """Dictionnary (coords in k-dimension space):(set of object) that handle
-    space borders.
+    """Dictionnary (coords in 2-dimension space):(set of individuals) that
+    handle space borders.
 
-    Needs bounds in N^k at construction.
+    Needs bounds in N^2 at construction.
 
-    This assume that all keys are k-tuple of integers in N, and ensure
+    This assume that all keys are 2-tuple of integers in N, and ensure
     that values in keys will never overpass the bound
     in associated dimension.
 
@@ -21,6 +39,9 @@ class Space(defaultdict):
         "Bounds must be maximal values reachable by coords"
         super().__init__(set)
         self.bounds = bounds
+        self.nutrients = NutrientLayer(bounds)
+        # wrapped coordinates of each square index
+        self.all_coords = tuple(itertools.product(*map(range, bounds)))
 
     def fix_key(self, key):
         "Return the key, modified for being in the bounds"
@@ -29,9 +50,166 @@ class Space(defaultdict):
             for value, bound in zip(key, self.bounds)
         )
 
+    def cell(self, coords):
+        "Return the index of the square at given coords"
+        x, y = coords
+        width, height = self.bounds
+        return (x % width) * height + y % height
+
     def __getitem__(self, key):
         return super().__getitem__(self.fix_key(key))
 
+    def add(self, obj, coords):
+        if obj.is_nutrient:
+            self.nutrients.add(self.cell(coords), obj.energy)
+        else:
+            self[coords].add(obj)
+
+    def remove(self, obj, coords):
+        if obj.is_nutrient:
+            self.nutrients.remove(self.cell(coords), obj.energy)
+        else:
+            self[coords].remove(obj)
+
+    def occuped_at(self, coords):
+        """Return True iff an individual is present at given coords"""
+        # no empty set created for unknown coords
+        return bool(self.get(self.fix_key(coords)))
+
+    def consume_nutrient(self, coords):
+        """Remove a Nutrient instance from coords and return it,
+        or None if no nutrient is present"""
+        return self.nutrients.consume(self.cell(coords))
+
+    def cell_states(self, cells:np.ndarray) -> tuple:
+        """Return for each given square index the 2-tuple of booleans giving
+        the presence of nutrients and individuals in the square"""
+        return tuple(zip(
+            self.nutrients.present(cells).tolist(),
+            (bool(self.get(self.all_coords[cell])) for cell in cells.tolist())
+        ))
+
+    def objects_at(self, coords):
+        return (self.nutrients.nutrients(self.cell(coords))
+                + list(self.get(self.fix_key(coords), ())))
+
+    def items(self):
+        """Yield pairs (coords, objects) of non-empty squares"""
+        occuped = set(np.flatnonzero(self.nutrients.counts).tolist())
+        occuped.update(self.cell(coords) for coords, indivs
+                       in dict.items(self) if indivs)
+        for idx in sorted(occuped):
+            coords = self.all_coords[idx]
+            yield coords, self.objects_at(coords)
+
+    @property
+    def individual_ids(self) -> np.ndarray:
+        """Grid of the id of an individual of each square (0 if none)"""
+        ids = np.zeros(self.bounds, dtype=np.int64)
+        for coords, indivs in dict.items(self):
+            if indivs:
+                ids[coords] = next(iter(indivs)).unique_id
+        return ids
+
+
+class GridSpace:
+    """Space of two dimensions, stored in numpy arrays.
+
+    Each square holds the id of the individual placed on it (0 if none),
+    whatever the number of objects in it.
+    In the rare case of many individuals in the same square, only one is
+    in the grid, the others being kept by the stacked dict.
+
+    """
+
+    def __init__(self, bounds):
+        "Bounds must be maximal values reachable by coords"
+        self.bounds = tuple(bounds)
+        self.width, self.height = self.bounds
+        self.individual_ids = np.zeros(self.bounds, dtype=np.int64)
+        self.nutrients = NutrientLayer(self.bounds)
+        self.individuals = {}  # id: individual
+        self.stacked = defaultdict(list)  # coords: individuals not in the grid
+        # wrapped coordinates of each square index, in the order of items()
+        self.all_coords = tuple(itertools.product(range(self.width),
+                                                  range(self.height)))
+
+    def fix_key(self, coords):
+        "Return the coords, modified for being in the bounds"
+        x, y = coords
+        return x % self.width, y % self.height
+
+    def cell(self, coords):
+        "Return the index of the square at given coords"
+        x, y = coords
+        return (x % self.width) * self.height + y % self.height
+
+    def add(self, obj, coords):
+        coords = self.fix_key(coords)
+        if obj.is_nutrient:
+            self.nutrients.add(self.cell(coords), obj.energy)
+        elif self.individual_ids[coords]:
+            self.stacked[coords].append(obj)
+        else:
+            self.individual_ids[coords] = obj.unique_id
+            self.individuals[obj.unique_id] = obj
+
+    def remove(self, obj, coords):
+        coords = self.fix_key(coords)
+        if obj.is_nutrient:
+            self.nutrients.remove(self.cell(coords), obj.energy)
+        elif self.individual_ids[coords] == obj.unique_id:
+            del self.individuals[obj.unique_id]
+            self.individual_ids[coords] = 0
+            if coords in self.stacked:  # an individual takes the free place
+                self.add(self.stacked[coords].pop(), coords)
+                if not self.stacked[coords]:
+                    del self.stacked[coords]
+        else:
+            if obj not in self.stacked.get(coords, ()):
+                raise KeyError(obj)
+            self.stacked[coords].remove(obj)
+            if not self.stacked[coords]:
+                del self.stacked[coords]
+
     def occuped_at(self, coords):
         """Return True iff an individual is present at given coords"""
-        return any(obj.is_individual for obj in self[coords])
+        return bool(self.individual_ids[self.fix_key(coords)])
+
+    def consume_nutrient(self, coords):
+        """Remove a Nutrient instance from coords and return it,
+        or None if no nutrient is present"""
+        return self.nutrients.consume(self.cell(coords))
+
+    def cell_states(self, cells:np.ndarray) -> tuple:
+        """Return for each given square index the 2-tuple of booleans giving
+        the presence of nutrients and individuals in the square"""
+        return tuple(zip(self.nutrients.present(cells).tolist(),
+                         (self.individual_ids.ravel()[cells] > 0).tolist()))
+
+    def objects_at(self, coords):
+        coords = self.fix_key(coords)
+        objects = self.nutrients.nutrients(self.cell(coords))
+        if self.individual_ids[coords]:
+            objects.append(self.individuals[int(self.individual_ids[coords])])
+            objects.extend(self.stacked.get(coords, ()))
+        return objects
+
+    def items(self):
+        """Yield pairs (coords, objects) of non-empty squares"""
+        occuped = (self.nutrients.counts > 0) | (self.individual_ids > 0)
+        for idx in np.flatnonzero(occuped):
+            coords = self.all_coords[idx]
+            yield coords, self.objects_at(coords)
+
+    @property
+    def nbytes(self):
+        """Memory used by the grids, in bytes"""
+        return self.individual_ids.nbytes + self.nutrients.nbytes
+
+
+# Space class of each SpaceBackend
+SPACES = {
+    SpaceBackend.DICT: Space,
+    SpaceBackend.GRID: GridSpace,
+}
@@ -0,0 +1,166 @@
+"""
+Parameter sweeps: many independent headless simulations,
+run in parallel by a pool of processes.
+
+A sweep is described by a JSON specification, as:
+
+    {
+        "base": {"space_width": 50, "network_evaluator": "numpy"},
+        "grid": {"mutation_rate": [0.01, 0.05], "nutrient_regen": [0.001, 0.01]},
+        "seeds": 3,
+        "steps": 1000
+    }
+
+Runs are all the combinations of the grid values, each one repeated
+for each seed (a number of seeds n stands for seeds 0 to n-1).
+Instead of a grid, a random sampling may be given:
+
+        "random": {"mutation_rate": [0.0, 0.1], "neuron_edges_maxcount": [10, 40]},
+        "samples": 20,
+        "sample_seed": 0
+
+where each field receives a value drawn uniformly in the given bounds
+(as integers if both bounds are integers).
+
+Runs of multiprocess evaluators (parallel, tiled) not giving nb_workers
+share the cores left by the sweep: with a pool using all cores,
+they get a single worker each.
+
+Results are written as JSON lines, one per run, as soon as the run
+is finished. Runs already in the results file are not performed again,
+so an interrupted sweep can be resumed.
+
+"""
+import os
+import json
+import random
+import itertools
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from neural_world import cache
+from neural_world import commons
+from neural_world import headless
+
+
+LOGGER = commons.logger()
+
+
+def read_spec(filename:str) -> dict:
+    """Return the sweep specification in given JSON file"""
+    with open(filename) as fd:
+        return json.load(fd)
+
+
+def parameters(spec:dict) -> iter:
+    """Yield the configuration fields of each run of given specification,
+    seeds apart"""
+    base = spec.get('base', {})
+    if 'random' in spec:
+        sampler = random.Random(spec.get('sample_seed', 0))
+        def drawn(low, high):
+            if isinstance(low, int) and isinstance(high, int):
+                return sampler.randint(low, high)
+            return sampler.uniform(low, high)
+        for _ in range(spec.get('samples', 1)):
+            yield dict(base, **{field: drawn(*bounds)
+                                for field, bounds in sorted(spec['random'].items())})
+    else:
+        grid = sorted(spec.get('grid', {}).items())
+        fields = tuple(field for field, _ in grid)
+        for values in itertools.product(*(values for _, values in grid)):
+            yield dict(base, **dict(zip(fields, values)))
+
+
+def seeds(spec:dict) -> tuple:
+    """Return the seeds of given specification"""
+    seeds = spec.get('seeds', 1)
+    return tuple(range(seeds)) if isinstance(seeds, int) else tuple(seeds)
+
+
+def runs(spec:dict) -> iter:
+    """Yield (key, fields, seed) for each run of given specification.
+    The key identifies the run in results files."""
+    for fields, seed in itertools.product(parameters(spec), seeds(spec)):
+        yield run_key(fields, seed), fields, seed
+
+
+def run_key(fields:dict, seed:int) -> str:
+    return json.dumps({'fields': fields, 'seed': seed}, sort_keys=True)
+
+
+def done_runs(results_file:str) -> set:
+    """Return keys of the successful runs found in given results file"""
+    done = set()
+    if not os.path.exists(results_file):
+        return done
+    with open(results_file) as fd:
+        for line in fd:
+            try:
+                result = json.loads(line)
+            except ValueError:  # line cut by an interruption
+                continue
+            if 'error' not in result:
+                done.add(run_key(result['fields'], result['seed']))
+    return done
+
+
+def ends_with_newline(filename:str) -> bool:
+    with open(filename, 'rb') as fd:
+        fd.seek(-1, os.SEEK_END)
+        return fd.read(1) == b'\n'
+
+
+def run_configuration(fields:dict, seed:int, nb_workers:int=None):
+    """Return the configuration of the run of given fields and seed,
+    giving nb_workers workers to multiprocess evaluators, if not in fields"""
+    config = headless.configuration(fields, seed=seed)
+    if nb_workers and config.network_evaluator.multiprocess and 'nb_workers' not in fields:
+        config = headless.configuration(fields, seed=seed, nb_workers=nb_workers)
+    return config
+
+
+def run_one(fields:dict, seed:int, steps:int=None, nb_workers:int=None) -> dict:
+    """Run a single simulation with given fields and seed,
+    and return its result. Errors are reported in the result.
+    Multiprocess evaluators get nb_workers workers (see run_configuration)."""
+    result = {'fields': fields, 'seed': seed}
+    try:
+        cache.REACTIONS.clear()  # statistics of this run only
+        config = run_configuration(fields, seed, nb_workers)
+        result['summary'] = headless.run(config, steps)
+    except Exception as e:
+        result['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
+    return result
+
+
+def run(spec:dict, results_file:str, nb_workers:int=None) -> int:
+    """Perform the runs of given specification that are not already
+    in given results file, on nb_workers processes (one per core by default).
+
+    Return the number of performed runs.
+
+    """
+    done = done_runs(results_file)
+    todo = [(fields, seed) for key, fields, seed in runs(spec) if key not in done]
+    LOGGER.info('SWEEP: ' + str(len(todo)) + ' runs to perform, '
+                + str(len(done)) + ' already done.')
+    if not todo:
+        return 0
+    steps = spec.get('steps')
+    nb_processes = min(nb_workers or os.cpu_count(), len(todo))
+    run_workers = max(1, os.cpu_count() // nb_processes)  # cores left to each run
+    with ProcessPoolExecutor(max_workers=nb_processes) as pool, \
+         open(results_file, 'a') as fd:
+        if fd.tell() and not ends_with_newline(results_file):
+            fd.write('\n')  # the last line was cut by an interruption
+        futures = [pool.submit(run_one, fields, seed, steps, run_workers)
+                   for fields, seed in todo]
+        for future in as_completed(futures):
+            result = future.result()
+            fd.write(json.dumps(result, sort_keys=True) + '\n')
+            fd.flush()
+            if 'error' in result:
+                LOGGER.error('SWEEP: run ' + run_key(result['fields'], result['seed'])
+                             + ' failed: ' + result['error'])
+    return len(todo)
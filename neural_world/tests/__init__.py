@@ -1,5 +1,4 @@
 import unittest
-from pyasp.asp import TermSet
 
 from neural_world.neural_network import (FILE_ASP_CLEANING, FILE_ASP_RUNNING,
                                          NeuralNetwork)
@@ -6,6 +6,8 @@ Unit tests for ASP solving.
 import unittest
 from collections import defaultdict
 
+from neural_world import solving
+from neural_world.neural_network import FILE_ASP_RUNNING
 from neural_world.tests import NeuralNetworkTester
 
 
@@ -66,6 +68,19 @@ class TestASPSolving(NeuralNetworkTester):
 
 
 
+@unittest.skipUnless(solving.USE_CLINGO, 'needs the clingo module')
+class TestGroundedControls(unittest.TestCase):
+
+    def test_reuse(self):
+        network = 'neuron(1,i). neuron(2,i). neuron(3,x). output(3). edge(1,3). edge(2,3).'
+        solving.CONTROLS.clear()
+        for inputs, expected in (('up(1).', {'up(3)'}), ('up(1). up(2).', set()),
+                                 ('', set()), ('up(2).', {'up(3)'})):
+            self.assertEqual(solving.model_from(network + inputs, FILE_ASP_RUNNING),
+                             expected, inputs)
+        self.assertEqual(len(solving.CONTROLS), 1)  # grounded once
+
+
 class TestNeuronLogicalGates(NeuralNetworkTester):
     """Test all logical gates, with all possible cases of
     predecessor neurons states.
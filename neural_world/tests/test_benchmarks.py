@@ -0,0 +1,89 @@
+"""
+Unit tests for the benchmarks and the profiling of steps.
+
+"""
+import os
+import tempfile
+import unittest
+
+from neural_world import headless
+from neural_world import cache
+from neural_world.benchmarks import steps, networks, compare
+from neural_world.commons import Evaluator
+from neural_world.profiling import PHASES, PhaseProfiler
+
+
+FIELDS = {'network_evaluator': 'numpy', 'space_width': 10, 'space_height': 8,
+          'init_indiv_count': 10}
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_phases(self):
+        for evaluator in (Evaluator.CIRCUIT, Evaluator.NUMPY, Evaluator.TILED):
+            profiler = PhaseProfiler()
+            config = headless.configuration(FIELDS, network_evaluator=evaluator,
+                                            seed=1, nb_workers=2)
+            summary = headless.run(config, steps=5, profiler=profiler)
+            self.assertEqual(set(summary['phases']), set(PHASES))
+            for name in PHASES:
+                self.assertEqual(profiler.calls[name], summary['steps'], name)
+                self.assertGreater(profiler.times[name], 0., name)
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_case(self):
+        case = steps.run_case(FIELDS, seed=2, steps=4, allocation_steps=1)
+        self.assertEqual(case['fields'], FIELDS)
+        self.assertEqual(set(case['phases']), set(PHASES))
+        self.assertGreater(case['steps_per_second'], 0)
+        if case['population']:
+            self.assertGreater(case['allocations']['peak'], 0)
+
+    def test_networks(self):
+        maxbytes = cache.REACTIONS.maxbytes
+        with tempfile.TemporaryDirectory() as directory:
+            results = networks.run(os.path.join(directory, 'networks.json'),
+                                   nb_network=2, nb_input=3, sizes=((2, 6),),
+                                   evaluators=(Evaluator.CIRCUIT, Evaluator.NUMPY))
+        self.assertEqual(cache.REACTIONS.maxbytes, maxbytes)
+        operations = {(case['fields']['group'], case['fields']['backend'],
+                       case['fields']['operation']) for case in results['cases']}
+        for group in ('spawned_2_6', 'dense', 'deep', 'many_outputs'):
+            self.assertIn((group, 'circuit', 'output_from'), operations)
+            self.assertIn((group, 'numpy', 'batch'), operations)
+            self.assertIn((group, 'python', 'cleaned'), operations)
+        for case in results['cases']:
+            self.assertEqual(case['mismatches'], 0, case['fields'])
+            self.assertGreater(case['time_per_call'], 0, case['fields'])
+
+    def test_deep(self):
+        network = networks.pathological(1, 0)['deep'][0]
+        edges = network.genome.edges
+        self.assertEqual(len(edges), len(set(edges)))
+        self.assertEqual({a for a, b in edges if b == 5}, {1, 2, 3, 4})
+        self.assertFalse(any(b <= network.nb_input_neuron for a, b in edges))
+        self.assertEqual({b for a, b in edges if a == 104}, {105, 106, 107, 108})
+
+    def test_compare(self):
+        case = {'fields': FIELDS, 'seed': 0, 'steps': 10, 'steps_per_second': 100.,
+                'peak_rss': 1000, 'phases': {'evaluation': 1., 'inputs': 1e-5}}
+        key = compare.run_key(FIELDS, 0)
+        slower = dict(case, steps_per_second=80., phases={'evaluation': 1.05,
+                                                          'inputs': 1e-4})
+        regressions = {name for _, name, _, _, _, worse
+                       in compare.compare({key: case}, {key: slower}) if worse}
+        self.assertEqual(regressions, {'steps_per_second'})
+        faster = dict(case, steps_per_second=150., peak_rss=1200)
+        regressions = {name for _, name, _, _, _, worse
+                       in compare.compare({key: case}, {key: faster}) if worse}
+        self.assertEqual(regressions, {'peak_rss'})
+        retained = dict(case, allocations={'retained': 0})
+        found = {name: (ratio, worse) for _, name, _, _, ratio, worse
+                 in compare.compare({key: retained}, {key: retained})}
+        self.assertEqual(found['allocations.retained'], (1., False))
+        leaking = dict(case, allocations={'retained': 100})
+        found = {name: (ratio, worse) for _, name, _, _, ratio, worse
+                 in compare.compare({key: retained}, {key: leaking})}
+        self.assertEqual(found['allocations.retained'], (None, False))
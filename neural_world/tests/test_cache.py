@@ -0,0 +1,55 @@
+"""
+Unit tests for the ReactionCache class.
+
+"""
+import unittest
+
+from neural_world.cache import ReactionCache, REACTIONS, entry_size, fingerprint, packed
+from neural_world import parallel
+from neural_world.config import Configuration
+
+
+class TestReactionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ReactionCache(maxbytes=2 * entry_size((1, 0), (True,)))
+
+    def test_hits_and_misses(self):
+        self.assertIsNone(self.cache.get(1, 0b101))
+        self.cache.put(1, 0b101, (True, False))
+        self.assertEqual(self.cache.get(1, 0b101), (True, False))
+        self.assertIsNone(self.cache.get(2, 0b101))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        self.cache.put(1, 0, (True,))
+        self.cache.put(2, 0, (False,))
+        self.cache.get(1, 0)  # 2 is now the least recently used
+        self.cache.put(3, 0, (True,))
+        self.assertIsNone(self.cache.get(2, 0))
+        self.assertEqual(self.cache.get(1, 0), (True,))
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertEqual(self.cache.stats['size'], 2)
+        self.assertEqual(self.cache.nbytes, self.cache.maxbytes)
+
+    def test_resize(self):
+        self.cache.put(1, 0, (True,))
+        self.cache.put(2, 0, (True,))
+        self.cache.resize(0)
+        self.assertEqual(self.cache.stats['size'], 0)
+        self.cache.put(3, 0, (True,))  # disabled cache keeps nothing
+        self.assertIsNone(self.cache.get(3, 0))
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertEqual(self.cache.nbytes, 0)
+
+    def test_keys(self):
+        self.assertEqual(packed((1, 3)), 0b1010)
+        self.assertEqual(fingerprint('edge(1,2).', 2), fingerprint('edge(1,2).', 2))
+        self.assertNotEqual(fingerprint('edge(1,2).', 2), fingerprint('edge(1,2).', 3))
+
+    def test_configuration(self):
+        """Process-wide resources are sized by the engine only"""
+        maxbytes, nb_workers = REACTIONS.maxbytes, parallel.WORKERS.nb_workers
+        Configuration(reaction_cache_memory=maxbytes + 1, nb_workers=nb_workers + 1)
+        self.assertEqual(REACTIONS.maxbytes, maxbytes)
+        self.assertEqual(parallel.WORKERS.nb_workers, nb_workers)
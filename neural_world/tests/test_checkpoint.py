@@ -0,0 +1,130 @@
+"""
+Unit tests for the checkpoints of simulations.
+
+"""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from functools import partial
+
+from neural_world import checkpoint
+from neural_world import headless
+from neural_world.commons import Evaluator, SpaceBackend
+from neural_world.engine import Engine
+from neural_world.neural_network import NeuralNetwork
+from neural_world.observer import Checkpointer
+
+
+def states(world) -> list:
+    """Return the comparable state of all individuals of given world"""
+    return [(indiv.unique_id, coords, indiv.energy, tuple(indiv.neural_network.memory),
+             indiv.neural_network.max_energy, indiv.genome.fingerprint)
+            for indiv, coords in world.individuals.items()]
+
+
+def history(engine, config, nb_step:int) -> list:
+    """Return the states of the world at each of the next steps"""
+    steps = []
+    for _ in range(nb_step):
+        engine.apply(config)
+        steps.append((engine.world.step_number, states(engine.world),
+                      engine.world.space.nutrients.counts.tolist()))
+    return steps
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'checkpoint.nwck')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assert_deterministic_restore(self, space_backend:SpaceBackend):
+        config = headless.configuration(network_evaluator=Evaluator.NUMPY, seed=4,
+                                        space_backend=space_backend,
+                                        space_width=9, space_height=7,
+                                        init_indiv_count=20,
+                                        steps_number=1, waiting_time=0)
+        engine = Engine.generate_from(config)
+        engine.world.populate()
+        history(engine, config, 5)
+        engine.save(self.filename)
+        expected = history(engine, config, 10)
+        directions = dict(NeuralNetwork.DIRECTIONS)
+
+        restored = Engine.restore_from(config, self.filename)
+        self.assertEqual(restored.world.step_number, 5)
+        self.assertEqual(history(restored, config, 10), expected)
+        self.assertEqual(dict(NeuralNetwork.DIRECTIONS), directions)
+
+    def test_dict_space(self):
+        self.assert_deterministic_restore(SpaceBackend.DICT)
+
+    def test_grid_space(self):
+        self.assert_deterministic_restore(SpaceBackend.GRID)
+
+    def test_invalid(self):
+        config = headless.configuration(space_width=9, space_height=7)
+        engine = Engine.generate_from(config)
+        engine.world.populate()
+        data = io.BytesIO()
+        checkpoint.save(engine.world, data)
+        other = Engine.generate_from(headless.configuration(space_width=7, space_height=9))
+        with self.assertRaises(ValueError):  # other space
+            checkpoint.load(io.BytesIO(data.getvalue()), other.world)
+        with self.assertRaises(ValueError):  # truncated
+            checkpoint.load(io.BytesIO(data.getvalue()[:-10]),
+                            Engine.generate_from(config).world)
+
+
+class TestDeltas(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = headless.configuration(network_evaluator=Evaluator.NUMPY, seed=6,
+                                             space_width=9, space_height=7,
+                                             init_indiv_count=20,
+                                             steps_number=1, waiting_time=0)
+        engine = Engine.generate_from(self.config, observers=(
+            partial(Checkpointer, archive_directory=self.directory,
+                    interval=4, deltas=True),
+        ))
+        engine.world.populate()
+        self.expected = dict((step, (individuals, nutrients)) for step, individuals, nutrients
+                             in history(engine, self.config, 14))
+        engine.world.deinit()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def restored(self, step:int=None) -> Engine:
+        engine = Engine.rewind(self.config, self.directory, step)
+        self.assertEqual(engine.world.step_number, 14 if step is None else step)
+        world = engine.world
+        self.assertEqual((states(world), world.space.nutrients.counts.tolist()),
+                         self.expected[world.step_number])
+        return engine
+
+    def test_rewind(self):
+        self.assertEqual(checkpoint.base_steps(self.directory), [4, 8, 12])
+        for step in (4, 6, 9, 12, 13, None):
+            self.restored(step)
+        with self.assertRaises(ValueError):
+            self.restored(2)  # before the first checkpoint
+
+    def test_resume(self):
+        engine = self.restored(6)
+        for step, *state in history(engine, self.config, 8):
+            self.assertEqual(tuple(state), self.expected[step])
+
+    def test_interrupted(self):
+        filename = os.path.join(self.directory, checkpoint.DELTA_FILENAME.format(12))
+        with open(filename, 'rb+') as fd:
+            fd.truncate(os.path.getsize(filename) - 10)  # cut the last delta
+        self.restored(13)
+        with self.assertRaises(ValueError):
+            self.restored(14)
@@ -0,0 +1,117 @@
+"""
+Unit tests for the Circuit evaluator, compared to the ASP semantic.
+
+"""
+import random
+import unittest
+
+from neural_world import batch
+from neural_world import parallel
+from neural_world.circuit import Circuit
+from neural_world.config import Configuration
+from neural_world.tests import NeuralNetworkTester, comparable_atoms
+
+
+class CircuitTester(NeuralNetworkTester):
+
+    def assert_same_running(self, network_atoms, up_inputs):
+        """Compare outputs of a Circuit compiled from given atoms
+        and of the ASP solving, for given ids of up input neurons."""
+        up_atoms = ''.join('up(' + str(idn) + ').' for idn in up_inputs)
+        expected = comparable_atoms(self._run(network_atoms + up_atoms))
+        found = comparable_atoms(tuple(
+            'up(' + str(idn) + ')'
+            for idn in Circuit(network_atoms)(up_inputs)
+        ))
+        self.assertEqual(found, expected)
+
+
+class TestCircuit(CircuitTester):
+
+    def test_no_atoms(self):
+        self.assertEqual(Circuit('')(()), frozenset())
+
+    def test_gates(self):
+        atoms = ('neuron(1,i). neuron(2,i). neuron(3,i).'
+                 'neuron(4,{}). output(4).'
+                 'edge(1,4). edge(2,4). edge(3,4).')
+        cases = ((), (1,), (2,), (3,), (1, 2), (1, 3), (2, 3), (1, 2, 3))
+        for gate in 'xano':
+            for up_inputs in cases:
+                self.assert_same_running(atoms.format(gate), up_inputs)
+
+    def test_gates_without_predecessors(self):
+        for gate in 'xano':
+            self.assert_same_running('neuron(1,{}). output(1).'.format(gate), ())
+
+    def test_two_paths(self):
+        atoms = ('neuron(1,i). neuron(2,i). '
+                 'neuron(3,n). neuron(4,o). neuron(5,n). '
+                 'neuron(6,x). output(6). neuron(7,a). output(7). '
+                 'edge(1,3). edge(1,4). edge(2,4). edge(2,5). '
+                 'edge(3,6). edge(4,6). edge(4,7). edge(5,7). ')
+        for up_inputs in ((), (1,), (2,), (1, 2)):
+            self.assert_same_running(atoms, up_inputs)
+
+    def test_levels(self):
+        circuit = Circuit('neuron(1,i). neuron(2,n). neuron(3,o). output(3).'
+                          'edge(1,2). edge(2,3). edge(1,3).')
+        self.assertEqual(circuit.levels, {1: 0, 2: 1, 3: 2})
+        self.assertEqual(circuit.depth, 2)
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError):
+            Circuit('neuron(1,o). neuron(2,o). edge(1,2). edge(2,1).')
+
+
+class TestCircuitOnSpawnedNetworks(unittest.TestCase):
+    """Compare both evaluators on randomly generated networks"""
+
+    def test_random_networks(self):
+        incubator = Configuration(network_evaluator='circuit').incubator
+        for _ in range(10):
+            network = incubator.spawn().neural_network
+            nb_input = network.nb_input_neuron
+            for _ in range(5):
+                up_inputs = frozenset(idn for idn in range(1, nb_input + 1)
+                                      if random.random() < 0.5)
+                self.assertEqual(network.circuit(up_inputs),
+                                 network.solved_outputs(up_inputs))
+
+
+class TestBatchEvaluation(unittest.TestCase):
+    """Compare the batch evaluations with circuits"""
+
+    def setUp(self):
+        incubator = Configuration(network_evaluator='numpy').incubator
+        self.networks = [incubator.spawn().neural_network for _ in range(20)]
+        self.input_states = [tuple(random.random() < 0.5
+                                   for _ in range(network.nb_input_neuron))
+                             for network in self.networks]
+
+    def assert_batch_evaluation(self, evaluate):
+        outputs = evaluate(self.networks, batch.input_array(self.input_states))
+        for network, inputs, states in zip(self.networks, self.input_states, outputs):
+            self.assertEqual(tuple(states[:network.nb_output_neuron]),
+                             network.output_from(inputs))
+            self.assertFalse(any(states[network.nb_output_neuron:]))
+
+    def test_numpy(self):
+        self.assert_batch_evaluation(batch.evaluate_circuits)
+
+    def test_asp(self):
+        self.assert_batch_evaluation(batch.evaluate_asp)
+
+    def test_parallel(self):
+        pool = parallel.WorkerPool(nb_workers=2)
+        try:
+            self.assert_batch_evaluation(pool.evaluate)
+            self.assert_batch_evaluation(pool.evaluate)  # genomes already known
+            self.assertEqual(sum(map(len, pool.known)),
+                             len(set(n.genome for n in self.networks)))
+        finally:
+            pool.stop()
+
+    def test_no_network(self):
+        for evaluate in batch.EVALUATIONS.values():
+            self.assertEqual(evaluate([], batch.input_array([])).shape, (0, 0))
@@ -0,0 +1,55 @@
+"""
+Unit tests for the python cleaning of neural networks,
+compared to the ASP cleaning.
+
+"""
+import unittest
+
+from neural_world import genome
+from neural_world.cleaning import cleaned
+from neural_world.commons import Evaluator
+from neural_world.config import Configuration
+from neural_world.tests import NeuralNetworkTester
+
+
+class TestPythonCleaning(NeuralNetworkTester):
+
+    def assert_same_cleaning(self, atoms):
+        self.assert_cleaning(atoms, cleaned(atoms))
+
+    def test_no_atoms(self):
+        self.assertEqual(cleaned(''), '')
+        self.assert_same_cleaning('')
+
+    def test_simple_clean(self):
+        self.assert_same_cleaning('neuron(1,i). neuron(2,i). neuron(3,o). '
+                                  'output(3). edge(1,3). edge(1,2).')
+
+    def test_orientation(self):
+        atoms = ('neuron(1,i). neuron(2,i). neuron(3,a). neuron(4,o). output(4). '
+                 'edge(1,3). edge(3,2). edge(4,3). edge(3,3).')
+        self.assert_same_cleaning(atoms)
+        self.assertEqual(cleaned(atoms), 'neuron(1,i).neuron(3,a).neuron(4,o).'
+                                         'output(4).edge(1,3).edge(3,4).')
+
+    def test_input_targeted_edges(self):
+        self.assert_same_cleaning('neuron(1,i). neuron(2,o). output(2). edge(2,1).')
+
+    def test_unreachable_output(self):
+        self.assert_same_cleaning('neuron(1,i). neuron(2,x). neuron(3,o). '
+                                  'output(3). edge(2,3).')
+
+    def test_spawned_networks(self):
+        """Differential test on randomly generated networks"""
+        incubator = Configuration().incubator
+        for _ in range(50):
+            network = incubator.spawn().neural_network
+            self.assert_same_cleaning(network.neural_network_all)
+
+    def test_same_order(self):
+        """Cleaned atoms do not depend on the cleaning backend"""
+        incubator = Configuration().incubator
+        for _ in range(20):
+            atoms = incubator.spawn().neural_network.neural_network_all
+            self.assertEqual(genome.cleaned(atoms, Evaluator.ASP),
+                             genome.cleaned(atoms, Evaluator.CIRCUIT))
@@ -0,0 +1,141 @@
+"""
+Unit tests for the asynchronous dispatch of signals to observers.
+
+"""
+import random
+import threading
+import unittest
+
+import numpy as np
+
+from neural_world import headless
+from neural_world.commons import Evaluator, Overflow
+from neural_world.engine import Engine
+from neural_world.nutrient import Nutrient
+from neural_world.observer import Observer, Signal
+from neural_world.observer.dispatch import AsyncObserver, snapshot_of
+
+
+class Recorder(Observer):
+    """Observer recording the received signals, waiting for a gate
+    to be opened before the first one"""
+
+    def __init__(self, engine=None):
+        self.gate = threading.Event()
+        self.steps = []
+        self.births = []
+
+    def update(self, world, signals={}):
+        self.gate.wait()
+        if Signal.NEW_INDIVIDUAL in signals:
+            self.births.append(signals[Signal.NEW_INDIVIDUAL][0].unique_id)
+        else:
+            self.steps.append(world.step_number)
+
+
+class TestAsyncObserver(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.config = headless.configuration(network_evaluator=Evaluator.NUMPY,
+                                             space_width=6, space_height=6,
+                                             steps_number=1, waiting_time=0)
+        self.world = Engine.generate_from(self.config).world
+        self.world.populate()
+
+    def notified_steps(self, overflow:Overflow, nb_step:int=10, queue_size:int=3):
+        """Return the recorder and its proxy, after notification of steps
+        while the recorder was blocked"""
+        recorder = Recorder()
+        proxy = AsyncObserver(recorder, queue_size, overflow)
+        self.world.register(proxy)
+        proxy.preprocessing(self.world)
+        waiter = threading.Timer(0.1, recorder.gate.set)
+        waiter.start()
+        for step in range(1, nb_step + 1):
+            self.world.step_number = step
+            self.world.notify_observers()
+        proxy.postprocessing(self.world)
+        waiter.join()
+        return recorder, proxy
+
+    def test_block(self):
+        recorder, proxy = self.notified_steps(Overflow.BLOCK)
+        self.assertEqual(recorder.steps, list(range(1, 11)))
+        self.assertEqual(proxy.stats['delivered'], 10)
+        self.assertEqual(proxy.stats['step_lag'], 0)
+        self.assertLessEqual(proxy.stats['max_pending'], 3)
+
+    def test_drop_oldest(self):
+        recorder, proxy = self.notified_steps(Overflow.DROP_OLDEST)
+        self.assertEqual(recorder.steps[-3:], [8, 9, 10])
+        self.assertEqual(len(recorder.steps) + proxy.stats['dropped'], 10)
+        self.assertGreater(proxy.stats['dropped'], 0)
+
+    def test_coalesce(self):
+        recorder = Recorder()
+        proxy = AsyncObserver(recorder, 2, Overflow.COALESCE)
+        self.world.register(proxy)
+        individual = next(iter(self.world.individuals))
+        self.world.notify_observers({Signal.NEW_INDIVIDUAL: (individual, None, (0, 0))})
+        for step in range(1, 6):
+            self.world.step_number = step
+            self.world.notify_observers()
+        recorder.gate.set()
+        proxy.postprocessing(self.world)
+        self.assertEqual(recorder.births, [individual.unique_id])  # never dropped
+        self.assertEqual(recorder.steps[-1], 5)
+        self.assertEqual(len(recorder.steps) + proxy.stats['coalesced'], 5)
+
+    def test_errors(self):
+        class Failing(Observer):
+            def update(self, world, signals={}):
+                raise RuntimeError
+        proxy = AsyncObserver(Failing(), 4)
+        self.world.register(proxy)
+        self.world.notify_observers()
+        proxy.postprocessing(self.world)
+        self.assertEqual(proxy.stats['errors'], 1)
+        self.assertEqual(proxy.stats['delivered'], 1)
+
+    def test_snapshot(self):
+        cells = np.arange(36)
+        states = self.world.space.cell_states(cells)
+        self.world.notifications += 1
+        snapshot = snapshot_of(self.world)
+        self.assertIsNone(snapshot.space)
+        self.assertIs(snapshot_of(self.world, with_space=True), snapshot)  # shared
+        self.world.step_number += 1
+        self.world.add_nutrient(0)
+        self.world.add_nutrient(1)
+        self.assertEqual(snapshot.step_number, self.world.step_number - 1)
+        self.assertEqual(snapshot.space.cell_states(cells), states)
+        self.assertEqual(snapshot.object_counter[Nutrient] + 2,
+                         self.world.object_counter[Nutrient])
+        self.world.notifications += 1
+        self.assertIsNot(snapshot_of(self.world), snapshot)
+
+    def test_shared_snapshot(self):
+        recorders = [Recorder(), Recorder()]
+        recorders[0].needs_space = True
+        snapshots = []
+        for recorder in recorders:
+            recorder.gate.set()
+            recorder.update = lambda world, signals={}: snapshots.append(world)
+            self.world.register(AsyncObserver(recorder, 4))
+        self.world.notify_observers()
+        self.world.deinit_observers()
+        self.assertEqual(len(snapshots), 2)
+        self.assertIs(snapshots[0], snapshots[1])
+        self.assertIsNotNone(snapshots[0].space)
+        self.assertEqual(snapshots[0].statistics['reactions'],
+                         self.world.statistics['reactions'])
+
+    def test_run(self):
+        config = headless.configuration(network_evaluator=Evaluator.NUMPY,
+                                        space_width=8, space_height=8,
+                                        async_observers=True,
+                                        observer_overflow='coalesce')
+        summary = headless.run(config, steps=10)
+        self.assertNotIn('observers', summary)  # the tracker is synchronous
+        self.assertLessEqual(summary['steps'], 10)
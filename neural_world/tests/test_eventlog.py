@@ -0,0 +1,96 @@
+"""
+Unit tests for the binary event log.
+
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from functools import partial
+
+from neural_world import headless
+from neural_world.commons import Evaluator
+from neural_world.engine import Engine
+from neural_world.eventlog import (EventLog, EventLogReader, Birth, Death,
+                                   Move, Step)
+from neural_world.observer import EventLogger
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'events.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def written(self, close:bool=True) -> EventLog:
+        log = EventLog(self.filename, chunk_size=64)
+        log.birth(0, 1, None, (2, 3), 42)
+        log.birth(0, 2, 1, (2, 4), 43)
+        log.step(1, 2, 10)
+        log.move(1, 2, (3, 4))
+        log.death(1, 1, (2, 3))
+        log.step(2, 1, 9)
+        log.birth(2, 3, 2, (4, 4), 43)
+        if close:
+            log.close()
+        else:
+            log.flush()
+            log.file.close()
+        return log
+
+    def test_reader(self):
+        self.written()
+        with EventLogReader(self.filename) as reader:
+            self.assertEqual(len(list(reader)), 7)
+            self.assertEqual(list(reader.steps), [0, 1, 2])
+            self.assertEqual(list(reader.events(1, 2)), [
+                Step(1, 2, 10), Move(1, 2, (3, 4)), Death(1, 1, (2, 3))
+            ])
+            self.assertEqual(list(reader.events(3)), [])
+            self.assertEqual(reader.birth(2), Birth(0, 2, 1, (2, 4), 43))
+            self.assertEqual(reader.birth(1).parent, None)
+            self.assertEqual(list(reader.history(2)), [
+                Birth(0, 2, 1, (2, 4), 43), Move(1, 2, (3, 4))
+            ])
+            self.assertEqual(list(reader.history(1))[-1], Death(1, 1, (2, 3)))
+            with self.assertRaises(KeyError):
+                reader.birth(4)
+
+    def test_interrupted(self):
+        self.written(close=False)
+        with open(self.filename, 'ab') as fd:
+            fd.write(b'\x01\x20\x00\x02')  # cut record
+        with EventLogReader(self.filename) as reader:
+            self.assertEqual(len(list(reader)), 7)
+            self.assertEqual(list(reader.steps), [0, 1, 2])
+            self.assertEqual(reader.birth(3).coords, (4, 4))
+
+    def test_simulation(self):
+        random.seed(3)
+        config = headless.configuration(network_evaluator=Evaluator.NUMPY,
+                                        space_width=8, space_height=8,
+                                        steps_number=15, waiting_time=0)
+        engine = Engine.generate_from(config, observers=(
+            partial(EventLogger, archive_directory=self.directory),
+        ))
+        engine.world.init_observers()
+        engine.world.populate()
+        engine.apply(config)
+        engine.world.deinit()
+        coords = {}  # replay of the log
+        with EventLogReader(self.filename) as reader:
+            for event in reader:
+                if isinstance(event, (Birth, Move)):
+                    coords[event.id] = event.coords
+                elif isinstance(event, Death):
+                    del coords[event.id]
+            last_step = list(reader.events(reader.steps[-1]))[0]
+        self.assertEqual(coords, {indiv.unique_id: coords for indiv, coords
+                                  in engine.world.individuals.items()})
+        self.assertEqual(last_step, Step(engine.world.step_number,
+                                         engine.world.nb_individual,
+                                         len(engine.world.space.nutrients)))
@@ -0,0 +1,42 @@
+"""
+Unit tests for the Genome interning.
+
+"""
+import unittest
+
+from neural_world.commons import NeuronType, Evaluator
+from neural_world.config import Configuration
+from neural_world.genome import Genome
+
+
+TYPES = (NeuronType.AND, NeuronType.OR)
+EDGES = ((1, 3), (2, 3), (3, 4))
+
+
+class TestGenome(unittest.TestCase):
+
+    def test_interning(self):
+        genome = Genome.of(2, 1, 1, TYPES, EDGES, Evaluator.CIRCUIT)
+        self.assertIs(genome, Genome.of(2, 1, 1, list(TYPES), list(EDGES)))
+        self.assertIsNot(genome, Genome.of(2, 1, 1, TYPES, EDGES[:2]))
+        self.assertEqual(genome.canonical, '2,1,1/ao/1,3;2,3;3,4')
+
+    def test_edges_order(self):
+        genome = Genome.of(2, 1, 1, TYPES, EDGES, Evaluator.CIRCUIT)
+        self.assertIs(genome, Genome.of(2, 1, 1, TYPES, EDGES[::-1]))
+        self.assertIs(genome, Genome.of(2, 1, 1, TYPES, EDGES + EDGES[:1]))
+
+    def test_atoms(self):
+        genome = Genome.of(2, 1, 1, TYPES, EDGES, Evaluator.CIRCUIT)
+        self.assertEqual(genome.neural_network_all,
+                         'neuron(1,i).neuron(2,i).neuron(3,a).neuron(4,o).'
+                         'output(4).edge(1,3).edge(2,3).edge(3,4).')
+        self.assertEqual(genome.circuit(frozenset((1, 2))), frozenset((4,)))
+        self.assertEqual(genome.circuit(frozenset((1,))), frozenset())
+
+    def test_unmutated_clone(self):
+        network = Configuration(network_evaluator=Evaluator.CIRCUIT).incubator.spawn().neural_network
+        clone = network.clone(mutator=None)
+        self.assertIs(clone.genome, network.genome)
+        self.assertIs(clone.circuit, network.circuit)
+        self.assertEqual(clone.fingerprint, network.fingerprint)
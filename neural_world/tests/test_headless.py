@@ -0,0 +1,41 @@
+"""
+Unit tests for the headless running of simulations.
+
+"""
+import os
+import tempfile
+import unittest
+
+from neural_world import headless
+from neural_world.commons import Evaluator
+from neural_world.neighbors import vonneumann
+
+
+class TestHeadless(unittest.TestCase):
+
+    def test_read_config(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.conf', delete=False) as fd:
+            fd.write('# comment\nspace_width = 12\n\nnetwork_evaluator=circuit  # fast\n')
+        try:
+            fields = headless.read_config(fd.name)
+        finally:
+            os.remove(fd.name)
+        self.assertEqual(fields, {'space_width': '12', 'network_evaluator': 'circuit'})
+
+    def test_configuration(self):
+        config = headless.configuration({'space_width': '12'}, space_width='8',
+                                        neighbor_access='vonneumann')
+        self.assertEqual(config.space_width, 8)
+        self.assertIs(config.neighbor_access, vonneumann)
+        with self.assertRaises(ValueError):
+            headless.configuration({'no_such_field': '1'})
+
+    def test_run(self):
+        config = headless.configuration(network_evaluator=Evaluator.NUMPY,
+                                        space_width=10, space_height=10)
+        summary = headless.run(config, steps=20)
+        self.assertLessEqual(summary['steps'], 20)
+        self.assertEqual(summary['extinct'], summary['final_population'] == 0)
+        self.assertGreaterEqual(summary['peak_population'], 4)
+        if summary['extinct']:
+            self.assertEqual(summary['extinction_step'], summary['steps'])
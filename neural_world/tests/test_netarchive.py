@@ -0,0 +1,68 @@
+"""
+Unit tests for the deferred archive of neural networks.
+
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from neural_world import netarchive
+from neural_world.commons import Evaluator
+from neural_world.config import Configuration
+
+
+class TestNetworkArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, netarchive.FILE_NETWORKS)
+        incubator = Configuration(network_evaluator=Evaluator.CIRCUIT).incubator
+        self.parent = incubator.spawn()
+        self.clone = self.parent.clone()  # unmutated: same genome
+        self.other = incubator.spawn()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def archived(self):
+        archive = netarchive.NetworkArchive(self.filename)
+        archive.add(self.parent)
+        archive.add(self.clone, self.parent)
+        archive.add(self.other)
+        archive.close()
+        return netarchive.read(self.filename)
+
+    def test_deduplication(self):
+        genomes, individuals = self.archived()
+        fingerprint = netarchive.fingerprint_string(self.parent.genome.fingerprint)
+        self.assertEqual(len(genomes), len({self.parent.genome, self.other.genome}))
+        self.assertEqual(genomes[fingerprint], (self.parent.network_atoms,
+                                                self.parent.network_atoms_all))
+        self.assertEqual(individuals[self.clone.unique_id],
+                         (self.parent.unique_id, fingerprint))
+        self.assertEqual(individuals[self.parent.unique_id], (None, fingerprint))
+
+    def test_interrupted(self):
+        self.archived()
+        with open(self.filename, 'a') as fd:
+            fd.write('individual\t12')  # cut line
+        self.assertEqual(len(netarchive.read(self.filename)[1]), 3)
+        archive = netarchive.NetworkArchive(self.filename)
+        archive.add(self.clone, self.parent)  # genome already known
+        archive.close()
+        genomes, individuals = netarchive.read(self.filename)
+        self.assertEqual(len(individuals), 3)
+        with open(self.filename) as fd:
+            self.assertEqual(sum(line.startswith('genome') for line in fd), len(genomes))
+
+    def test_render(self):
+        genomes, _ = self.archived()
+        nb_file = netarchive.render(self.directory, nb_workers=1, render_graph=False)
+        self.assertEqual(nb_file, 2 * len(genomes))
+        for fingerprint in genomes:
+            self.assertTrue(os.path.exists(netarchive.genome_filename(
+                self.directory, fingerprint, 'dot_cln', 'dot')))
+        # already rendered
+        self.assertEqual(netarchive.render(self.directory, nb_workers=1,
+                                           render_graph=False), 0)
@@ -0,0 +1,77 @@
+"""
+Unit tests for the seeded random streams.
+
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from functools import partial
+
+from neural_world import headless
+from neural_world.commons import Evaluator
+from neural_world.engine import Engine
+from neural_world.individual import Individual
+from neural_world.observer import EventLogger
+from neural_world.rng import RandomStreams, STREAMS
+
+
+class TestRandomStreams(unittest.TestCase):
+
+    def test_seeded(self):
+        first, second, other = RandomStreams(3), RandomStreams(3), RandomStreams(4)
+        draws = lambda streams: [getattr(streams, name).random(4).tolist()
+                                 for name in STREAMS]
+        self.assertEqual(draws(first), draws(second))
+        self.assertNotEqual(draws(first), draws(other))
+        # streams are independent
+        self.assertEqual(len(set(map(tuple, draws(first)))), len(STREAMS))
+
+    def test_state(self):
+        streams = RandomStreams(3)
+        state = streams.state
+        expected = streams.mutation.random(4).tolist()
+        streams.state = state
+        self.assertEqual(streams.mutation.random(4).tolist(), expected)
+
+    def test_unseeded(self):
+        random.seed(2)
+        first = RandomStreams()
+        random.seed(2)
+        self.assertEqual(RandomStreams().seed, first.seed)
+
+
+class TestReproducibility(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def event_log(self, evaluator:Evaluator, seed:int=11) -> bytes:
+        """Return the event log of a simulation of given evaluator and seed"""
+        directory = os.path.join(self.directory, evaluator.name)
+        random.seed()  # the random module must not be used
+        Individual.next_individual_id = 1  # as in a new process
+        config = headless.configuration(network_evaluator=evaluator, seed=seed,
+                                        space_width=10, space_height=10,
+                                        init_indiv_count=12, nutrient_regen=0.05,
+                                        mutation_rate=0.2, nb_workers=2,
+                                        steps_number=20, waiting_time=0)
+        engine = Engine.generate_from(config, observers=(
+            partial(EventLogger, archive_directory=directory),
+        ))
+        engine.world.init_observers()
+        engine.world.populate()
+        engine.apply(config)
+        engine.world.deinit()
+        with open(os.path.join(directory, EventLogger.FILE_EVENTS), 'rb') as fd:
+            return fd.read()
+
+    def test_same_seed(self):
+        expected = self.event_log(Evaluator.NUMPY)
+        for evaluator in Evaluator:
+            self.assertEqual(self.event_log(evaluator), expected, evaluator)
+        self.assertNotEqual(self.event_log(Evaluator.NUMPY, seed=12), expected)
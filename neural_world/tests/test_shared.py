@@ -0,0 +1,99 @@
+"""
+Unit tests for the sharing of the world state through shared memory.
+
+"""
+import random
+import unittest
+import multiprocessing
+
+import numpy as np
+
+from neural_world import headless
+from neural_world.commons import Evaluator
+from neural_world.engine import Engine
+from neural_world.shared import SharedWorldState, SharedWorldReader
+
+
+def read_step(name:str, step:int, results):
+    """Wait for given step in the shared state of given name, then put
+    its snapshot in given queue"""
+    reader = SharedWorldReader(name)
+    reader.wait_step(step, timeout=10.)
+    snapshot = reader.snapshot()
+    results.put((snapshot.step, snapshot.occupancy.sum(), snapshot.nutrients.sum()))
+    reader.close()
+
+
+class TestSharedWorldState(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        config = headless.configuration(network_evaluator=Evaluator.NUMPY,
+                                        space_width=7, space_height=5,
+                                        waiting_time=0, steps_number=1)
+        self.config = config
+        self.engine = Engine.generate_from(config)
+        self.world = self.engine.world
+        self.world.populate()
+        self.state = SharedWorldState(self.world.space.bounds)
+
+    def tearDown(self):
+        self.state.close()
+
+    def test_successive_writes(self):
+        self.state.write(self.world)
+        for _ in range(3):
+            self.engine.apply(self.config)
+            self.state.write(self.world)
+        fresh = SharedWorldState(self.world.space.bounds)
+        try:
+            fresh.write(self.world)
+            for name, grid in self.state.grids.items():
+                self.assertTrue(np.array_equal(grid, fresh.grids[name]), name)
+            self.assertTrue(np.array_equal(self.state.header[1:], fresh.header[1:]))
+        finally:
+            fresh.close()
+
+    def test_snapshot(self):
+        self.state.write(self.world)
+        reader = SharedWorldReader(self.state.name)
+        try:
+            snapshot = reader.snapshot()
+            self.assertEqual(reader.bounds, (7, 5))
+            self.assertEqual(snapshot.nb_individual, self.world.nb_individual)
+            self.assertEqual(snapshot.occupancy.sum(), self.world.nb_individual)
+            self.assertTrue(np.array_equal(snapshot.nutrients,
+                                           self.world.space.nutrients.counts))
+            for indiv, (x, y) in self.world.individuals.items():
+                self.assertGreaterEqual(snapshot.energies[x, y], indiv.energy)
+            self.assertEqual(snapshot.energies.sum(),
+                             sum(indiv.energy for indiv in self.world.individuals))
+            self.assertEqual(self.state.sequence % 2, 0)
+            with self.assertRaises(ValueError):  # read-only mapping
+                reader.grids['occupancy'][0, 0] = 1
+        finally:
+            reader.close()
+
+    def test_torn_write(self):
+        reader = SharedWorldReader(self.state.name)
+        try:
+            self.state.header[0] += 1  # as if a write was interrupted
+            with self.assertRaises(TimeoutError):
+                reader.snapshot(timeout=0.01)
+        finally:
+            reader.close()
+
+    def test_other_process(self):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=read_step,
+                                          args=(self.state.name, 3, results))
+        process.start()
+        self.state.write(self.world)
+        for _ in range(3):
+            self.engine.apply(self.config)
+            self.state.write(self.world)
+        step, nb_individual, nb_nutrient = results.get(timeout=10.)
+        process.join()
+        self.assertEqual(step, self.world.step_number)
+        self.assertEqual(nb_individual, self.world.nb_individual)
+        self.assertEqual(nb_nutrient, len(self.world.space.nutrients))
@@ -0,0 +1,121 @@
+"""
+Unit tests for the Space classes, comparing the GridSpace to the Space.
+
+"""
+import random
+import unittest
+
+import numpy as np
+
+from neural_world.config import Configuration
+from neural_world.nutrient import Nutrient, NutrientLayer
+from neural_world.space import Space, GridSpace
+from neural_world.neighbors import moore, vonneumann, table
+
+
+BOUNDS = (5, 4)
+
+
+class TestSpaces(unittest.TestCase):
+
+    def setUp(self):
+        self.spaces = Space(BOUNDS), GridSpace(BOUNDS)
+        self.incubator = Configuration().incubator
+
+    def assert_same_states(self):
+        all_coords = [(x, y) for x in range(-1, 6) for y in range(-1, 5)]
+        reference, grid = self.spaces
+        cells = np.arange(BOUNDS[0] * BOUNDS[1])
+        self.assertEqual(reference.cell_states(cells), grid.cell_states(cells))
+        for coords in all_coords:
+            self.assertEqual(reference.occuped_at(coords), grid.occuped_at(coords))
+        self.assertEqual(  # non-empty squares only, in the same order
+            [(c, len(objs)) for c, objs in reference.items()],
+            [(c, len(objs)) for c, objs in grid.items()]
+        )
+
+    def test_toroidal_placement(self):
+        indiv = self.incubator.spawn()
+        for space in self.spaces:
+            space.add(indiv, (-1, 4))
+            self.assertTrue(space.occuped_at((4, 0)))
+            self.assertIn(indiv, space.objects_at((9, -4)))
+        self.assert_same_states()
+        for space in self.spaces:
+            space.remove(indiv, (4, 0))
+            self.assertFalse(space.occuped_at((-1, 4)))
+        self.assert_same_states()
+
+    def test_nutrients(self):
+        for space in self.spaces:
+            space.add(Nutrient(energy=3), (1, 1))
+            space.add(Nutrient(energy=3), (1, 1))
+            self.assertEqual(space.consume_nutrient((1, 1)).energy, 3)
+        self.assert_same_states()
+        for space in self.spaces:
+            self.assertEqual(space.consume_nutrient((1, 1)).energy, 3)
+            self.assertIsNone(space.consume_nutrient((1, 1)))
+        self.assert_same_states()
+
+    def test_stacked_individuals(self):
+        first, second = self.incubator.spawn(), self.incubator.spawn()
+        for space in self.spaces:
+            space.add(first, (2, 2))
+            space.add(second, (2, 2))
+            space.remove(first, (2, 2))
+            self.assertTrue(space.occuped_at((2, 2)))
+            self.assertEqual(list(space.objects_at((2, 2))), [second])
+            with self.assertRaises(KeyError):
+                space.remove(first, (2, 2))
+        self.assert_same_states()
+
+    def test_random_operations(self):
+        random.seed(0)
+        placed = []
+        for _ in range(200):
+            coords = random.randrange(-5, 10), random.randrange(-4, 8)
+            if placed and random.random() < 0.3:
+                obj, coords = placed.pop(random.randrange(len(placed)))
+                for space in self.spaces:
+                    space.remove(obj, coords)
+            else:
+                obj = Nutrient() if random.random() < 0.7 else self.incubator.spawn()
+                placed.append((obj, coords))
+                for space in self.spaces:
+                    space.add(obj, coords)
+        self.assert_same_states()
+
+
+class TestNeighborTable(unittest.TestCase):
+
+    def test_moore(self):
+        neighbors = table(moore, BOUNDS)
+        self.assertEqual(neighbors.shape, (20, 8))
+        self.assertEqual(neighbors.dtype, np.int32)
+        # square (0, 0) of index 0, with wrapped neighbors
+        self.assertEqual(sorted(neighbors[0].tolist()),
+                         [1, 3, 4, 5, 7, 16, 17, 19])
+
+    def test_vonneumann(self):
+        neighbors = table(vonneumann, BOUNDS)
+        self.assertEqual(neighbors.shape, (20, 4))
+        # square (2, 2) of index 10
+        self.assertEqual(neighbors[10].tolist(), [6, 9, 11, 14])
+
+
+class TestNutrientLayer(unittest.TestCase):
+
+    def test_counts(self):
+        layer = NutrientLayer(BOUNDS)
+        layer.add(3, energy=4)
+        layer.add_all(np.array([3, 5, 5]), energy=2)
+        self.assertEqual(len(layer), 4)
+        self.assertEqual(layer.present(np.arange(7)).tolist(),
+                         [False] * 3 + [True, False, True, False])
+        self.assertEqual([n.energy for n in layer.nutrients(5)], [2, 2])
+        self.assertEqual(layer.consume(3).energy, 3)  # mean energy
+        self.assertEqual(layer.consume(3).energy, 3)
+        self.assertIsNone(layer.consume(3))
+        with self.assertRaises(KeyError):
+            layer.remove(3, energy=4)
+        self.assertEqual(layer.nbytes, 20 * (4 + 8))
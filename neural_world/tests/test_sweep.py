@@ -0,0 +1,83 @@
+"""
+Unit tests for the parameter sweeps.
+
+"""
+import os
+import json
+import tempfile
+import unittest
+
+from neural_world import sweep
+
+
+SPEC = {
+    'base': {'space_width': 8, 'space_height': 8, 'network_evaluator': 'circuit'},
+    'grid': {'mutation_rate': [0.01, 0.1], 'nutrient_regen': [0.001]},
+    'seeds': 2,
+    'steps': 5,
+}
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_grid_runs(self):
+        runs = tuple(sweep.runs(SPEC))
+        self.assertEqual(len(runs), 4)
+        self.assertEqual(len(set(key for key, _, _ in runs)), 4)
+        self.assertEqual(runs[0][1], dict(SPEC['base'], mutation_rate=0.01,
+                                          nutrient_regen=0.001))
+
+    def test_random_runs(self):
+        spec = {'random': {'mutation_rate': [0., 0.1], 'neuron_edges_maxcount': [10, 40]},
+                'samples': 5, 'seeds': [7]}
+        runs = tuple(sweep.runs(spec))
+        self.assertEqual(runs, tuple(sweep.runs(spec)))  # same samples
+        self.assertEqual(len(runs), 5)
+        for _, fields, seed in runs:
+            self.assertEqual(seed, 7)
+            self.assertTrue(0. <= fields['mutation_rate'] <= 0.1)
+            self.assertIsInstance(fields['neuron_edges_maxcount'], int)
+
+    def test_run_one(self):
+        first = sweep.run_one(SPEC['base'], seed=3, steps=10)
+        self.assertNotIn('error', first)
+        second = sweep.run_one(SPEC['base'], seed=3, steps=10)
+        for field in ('steps', 'peak_population', 'final_nutrients'):
+            self.assertEqual(first['summary'][field], second['summary'][field])
+        self.assertIn('error', sweep.run_one({'no_such_field': 1}, seed=0))
+
+    def test_run_workers(self):
+        parallel = dict(SPEC['base'], network_evaluator='parallel')
+        self.assertEqual(sweep.run_configuration(parallel, 0, nb_workers=1).nb_workers, 1)
+        self.assertEqual(sweep.run_configuration(dict(parallel, nb_workers=3), 0,
+                                                 nb_workers=1).nb_workers, 3)
+        self.assertEqual(sweep.run_configuration(SPEC['base'], 0, nb_workers=1).nb_workers,
+                         sweep.run_configuration(SPEC['base'], 0).nb_workers)
+
+    def test_resume(self):
+        key, fields, seed = next(sweep.runs(SPEC))
+        with tempfile.TemporaryDirectory() as directory:
+            results = os.path.join(directory, 'results.jsonl')
+            with open(results, 'w') as fd:
+                fd.write(json.dumps({'fields': fields, 'seed': seed}) + '\n')
+                fd.write('{"fields": {}, "seed"')  # interrupted write
+            self.assertEqual(sweep.done_runs(results), {key})
+
+    def test_run(self):
+        keys = [key for key, _, _ in sweep.runs(SPEC)]
+        key, fields, seed = next(sweep.runs(SPEC))
+        with tempfile.TemporaryDirectory() as directory:
+            results = os.path.join(directory, 'results.jsonl')
+            with open(results, 'w') as fd:
+                fd.write(json.dumps(sweep.run_one(fields, seed, SPEC['steps'])) + '\n')
+                fd.write('{"fields": {}, "seed"')  # interrupted write
+            self.assertEqual(sweep.run(SPEC, results, nb_workers=2), len(keys) - 1)
+            self.assertEqual(sweep.run(SPEC, results, nb_workers=2), 0)
+            with open(results) as fd:
+                lines = fd.read().splitlines()
+        self.assertEqual(lines[1], '{"fields": {}, "seed"')  # kept on its own line
+        found = [json.loads(line) for line in lines[:1] + lines[2:]]
+        self.assertEqual(sorted(sweep.run_key(r['fields'], r['seed']) for r in found),
+                         sorted(keys))
+        for result in found:
+            self.assertIn('summary', result)
@@ -0,0 +1,87 @@
+"""
+Unit tests for the tiled world.
+
+"""
+import unittest
+
+from neural_world import tiling
+from neural_world.commons import Evaluator
+from neural_world.config import Configuration
+from neural_world.engine import Engine
+from neural_world.individual import Individual
+from neural_world.neighbors import moore, vonneumann
+
+
+def simulation(evaluator:Evaluator, seed:int, steps:int=20,
+               steps_number:int=1, **fields) -> list:
+    """Return the world states of a seeded simulation,
+    after each apply of steps_number steps"""
+    Individual.next_individual_id = 1
+    fields = {'space_width': 12, 'space_height': 9, 'init_indiv_count': 15,
+              **fields}
+    config = Configuration(network_evaluator=evaluator, seed=seed, waiting_time=0,
+                           steps_number=steps_number, nb_workers=4, **fields)
+    engine = Engine.generate_from(config)
+    engine.world.populate()
+    states = []
+    for _ in range(steps):
+        engine.apply(config)
+        world = engine.world
+        states.append((
+            sorted((coords, obj.unique_id, obj.energy,
+                    tuple(obj.neural_network.memory))
+                    for coords, obj in world if obj.is_individual),
+            world.space.nutrients.counts.tolist(),
+            Individual.next_individual_id,
+        ))
+    return states
+
+
+class TestTiles(unittest.TestCase):
+
+    def test_tiles_cover_space(self):
+        for nb_tiles, bounds in ((1, (5, 5)), (4, (12, 9)), (6, (3, 40)), (7, (2, 2))):
+            tiles = tiling.tiles(nb_tiles, bounds)
+            self.assertLessEqual(len(tiles), nb_tiles)
+            squares = [(x, y) for xmin, xmax, ymin, ymax in tiles
+                       for x in range(xmin, xmax) for y in range(ymin, ymax)]
+            self.assertEqual(len(squares), len(set(squares)))
+            self.assertEqual(len(squares), bounds[0] * bounds[1])
+
+    def test_tiles_shape(self):
+        self.assertEqual(tiling.tiles_shape(4, (100, 100)), (2, 2))
+        self.assertEqual(tiling.tiles_shape(4, (100, 2)), (4, 1))
+        self.assertEqual(tiling.tiles_shape(5, (2, 2)), (2, 2))
+
+    def test_configuration(self):
+        nb_workers = tiling.TILES.nb_workers
+        Configuration(nb_workers=nb_workers + 1)  # sized by the engine only
+        self.assertEqual(tiling.TILES.nb_workers, nb_workers)
+
+    def test_halo_offsets(self):
+        self.assertEqual(len(tiling.halo_offsets(moore)), 8)
+        self.assertEqual(len(tiling.halo_offsets(vonneumann)), 4)
+        with self.assertRaises(ValueError):
+            tiling.halo_offsets(lambda coords: ((2, 0),))
+
+
+class TestTiledSimulation(unittest.TestCase):
+
+    def tearDown(self):
+        tiling.TILES.stop()
+
+    def test_same_as_serial(self):
+        self.assertEqual(simulation(Evaluator.TILED, seed=1),
+                         simulation(Evaluator.NUMPY, seed=1))
+
+    def test_steps_in_tiles(self):
+        """Many steps per apply, with births and moves between tiles"""
+        fields = {'steps': 1, 'steps_number': 30, 'space_width': 14,
+                  'space_height': 11, 'init_indiv_count': 40,
+                  'nutrient_regen': 0.3}
+        crossings = tiling.TILES.crossings
+        tiled = simulation(Evaluator.TILED, seed=2, **fields)
+        self.assertGreater(tiling.TILES.crossings, crossings)
+        serial = simulation(Evaluator.NUMPY, seed=2, **fields)
+        self.assertEqual(tiled, serial)
+        self.assertGreater(tiled[-1][2], 40 + 1)  # some births
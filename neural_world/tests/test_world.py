@@ -0,0 +1,59 @@
+"""
+Unit tests for the World registry of individuals.
+
+"""
+import unittest
+
+from neural_world.commons import Direction
+from neural_world.config import Configuration
+from neural_world.nutrient import Nutrient
+from neural_world.world import World
+
+
+class TestIndividualRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Configuration(init_indiv_count=0, nutrient_density=0.)
+        self.world = World(self.config)
+
+    def test_add_move_remove(self):
+        first, second = (self.config.incubator.spawn() for _ in range(2))
+        self.world.add(first, (0, 0))
+        self.world.add(second, (2, -1))
+        self.assertEqual(self.world.individuals, {first: (0, 0), second: (2, 19)})
+        self.world.move(first, (0, 0), (Direction.up,))
+        self.assertEqual(list(self.world.individuals), [first, second])
+        self.assertEqual(self.world.individuals[first],
+                         self.world.wrapped(Direction.final_coords((0, 0), (Direction.up,))))
+        self.world.remove(second, (2, 19))
+        self.assertEqual(tuple(self.world.individuals), (first,))
+        self.assertEqual(self.world.nb_individual, 1)
+        self.assertTrue(self.world.have_life)
+
+    def test_spawn(self):
+        self.assertFalse(self.world.have_life)
+        self.world.spawn((3, 3))
+        indiv, = self.world.individuals
+        self.world.spawn_from(indiv, (3, 3))
+        self.assertEqual(self.world.nb_individual, 2)
+        self.assertEqual(set(self.world.individuals.values()) & {(3, 3)}, {(3, 3)})
+
+
+class TestNutrientRegeneration(unittest.TestCase):
+
+    def test_counter(self):
+        config = Configuration(init_indiv_count=0, nutrient_density=0.,
+                               nutrient_regen=0.1)
+        world = World(config)
+        nb_cells = sum(len(world.regenerate_nutrient()) for _ in range(10))
+        nb_nutrient = world.object_counter[Nutrient]
+        self.assertEqual(nb_nutrient, nb_cells)
+        self.assertEqual(nb_nutrient, len(world.space.nutrients))
+        self.assertTrue(200 < nb_nutrient < 600)
+        # at most one nutrient per square at each regeneration
+        self.assertLessEqual(world.space.nutrients.counts.max(), 10)
+
+    def test_full_regeneration(self):
+        world = World(Configuration(nutrient_density=0., nutrient_regen=1.))
+        world.regenerate_nutrient()
+        self.assertTrue((world.space.nutrients.counts == 1).all())
@@ -0,0 +1,584 @@
+"""
+Tiled World: the torus is split in rectangular tiles, each one owned
+by a worker process.
+
+A Tile holds the state of its squares, nutrients and individuals included,
+and computes their steps. The TilePool, in the main process, coordinates
+the tiles and keeps the World up to date, for the observers.
+
+A step is computed in four requests:
+
+    react: each tile makes its individuals live, reads the one-square halo
+           of its neighbors in shared memory, evaluates the networks,
+           gives their nutrients to the individuals and splits the energy
+           of the replicating ones. It sends back the replications, and
+           the moves toward squares of other tiles.
+    resolve: the main process clones the replicating individuals, in the
+             order of the serial invocation, drawing the mutations and
+             the squares of the clones in the configured random streams.
+             Each tile receives the clones placed in its squares, and the
+             moves from other tiles toward them. It resolves, in the order
+             of the serial invocation, the actions changing its squares,
+             and sends back the outcomes of the moves from other tiles.
+             Outcomes are forwarded to the tiles of the moving individuals,
+             and the request is repeated until all actions are resolved.
+             Individuals leaving a tile are sent back, with the outcomes.
+    commit: each tile receives its incoming individuals, and sends back
+            the resolved actions, the state of its individuals
+            and its nutrients, that are applied to the World.
+    regenerate: the regenerated nutrients, drawn by the main process,
+                are sent to their tiles, that then write their squares
+                in shared memory, giving the halo of the next step.
+
+The serial invocation order is the order of the individuals in the registry
+of the World, then of the actions of each individual: actions are ordered
+by keys (rank of the individual, index of the action). As an action is
+decided only once all actions of lower keys on the same squares are,
+a tiled run gives the same results as a serial one.
+
+The tiles are given the state of the World at the beginning of each
+Engine.apply, and when commands are invoked between two steps.
+
+"""
+import atexit
+from collections import Counter
+
+import numpy as np
+
+from neural_world import batch
+from neural_world import shared
+from neural_world import commons
+from neural_world import default
+from neural_world import observer
+from neural_world.actions import (PickNutrientAction, MoveAction,
+                                  ReplicateAction, RemoveAction)
+from neural_world.commons import Direction, Evaluator
+from neural_world.individual import Individual
+from neural_world.nutrient import Nutrient, NutrientLayer
+from neural_world.neural_network import NeuralNetwork
+from neural_world.parallel import WorkerPool, replicas
+
+
+LOGGER = commons.logger(commons.SUBLOGGER_LIFE)
+
+# Kinds of the actions resolved by the tiles
+MOVE, REMOVE, PLACE = range(3)
+
+
+def serve_tile(connection, memory_name:str, bounds:tuple, tile:tuple,
+               offsets:np.ndarray):
+    """Worker loop of a tile: answer the received requests
+    until None is received.
+
+    A request is a tuple (name of a Tile method, new genomes,
+    forgotten fingerprints, arguments of the method).
+    The reply is the value returned by the method.
+
+    """
+    state = Tile(memory_name, bounds, tile, offsets)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        method, new, forgotten, *args = request
+        replicas(state.genomes, new, forgotten, ())
+        connection.send(getattr(state, method)(*args))
+    state.close()
+    connection.close()
+
+
+def tiles_shape(nb_tiles:int, bounds:tuple) -> (int, int):
+    """Return the numbers of tiles (along x, along y) giving at most
+    nb_tiles tiles with the smallest total halo in a space of given bounds"""
+    width, height = bounds
+    for nb in range(min(nb_tiles, width * height), 0, -1):
+        shapes = [(nx, nb // nx) for nx in range(1, nb + 1)
+                  if nb % nx == 0 and nx <= width and nb // nx <= height]
+        if shapes:
+            return min(shapes, key=lambda s: s[0] * height + s[1] * width)
+
+
+def tiles(nb_tiles:int, bounds:tuple) -> list:
+    """Return the tiles (xmin, xmax, ymin, ymax) sharing a space of
+    given bounds in at most nb_tiles, max bounds being excluded"""
+    (nx, ny), (width, height) = tiles_shape(nb_tiles, bounds), bounds
+    xbounds = np.linspace(0, width, nx + 1).astype(int)
+    ybounds = np.linspace(0, height, ny + 1).astype(int)
+    return [(int(xbounds[i]), int(xbounds[i+1]), int(ybounds[j]), int(ybounds[j+1]))
+            for i in range(nx) for j in range(ny)]
+
+
+def halo_offsets(neighbor_access) -> np.ndarray:
+    """Return the (neighbors x 2) array of the offsets of neighbors given by
+    neighbor_access, or raise ValueError if they are not in a one-square halo"""
+    offsets = np.array(tuple(neighbor_access((0, 0))), dtype=np.int64).reshape(-1, 2)
+    if np.abs(offsets).max(initial=0) > 1:
+        raise ValueError('Tiling needs neighbors in a one-square halo')
+    return offsets
+
+
+def record(indiv, rank:int, cell:int) -> tuple:
+    """Return the data sent to a tile for given individual,
+    of given rank, placed in the square of given index"""
+    network = indiv.neural_network
+    return (indiv.unique_id, rank, cell, indiv.genome.fingerprint, indiv.energy,
+            tuple(network.memory), network.max_energy)
+
+
+class Collector:
+    """Receiver of the actions emitted by the individuals of a tile"""
+
+    def __init__(self):
+        self.commands = []
+
+    def add(self, command):
+        self.commands.append(command)
+
+
+class Tile:
+    """State of the squares of a tile, and of the individuals in it.
+
+    Squares are given by their index in the World, x * height + y.
+    The individuals are kept in the order of their rank
+    in the registry of the World.
+
+    """
+
+    def __init__(self, memory_name:str, bounds:tuple, tile:tuple,
+                 offsets:np.ndarray):
+        self.memory = shared.attached(memory_name)
+        self.width, self.height = bounds
+        _, self.grids = shared.views(self.memory.buf, bounds)
+        self.xmin, self.xmax, self.ymin, self.ymax = tile
+        self.offsets = offsets
+        # coords of the tile and its halo
+        self.halo_xs = np.arange(self.xmin - 1, self.xmax + 1) % self.width
+        self.halo_ys = np.arange(self.ymin - 1, self.ymax + 1) % self.height
+        self.genomes = {}  # fingerprint: genome
+        shape = self.xmax - self.xmin, self.ymax - self.ymin
+        self.nutrients = NutrientLayer(shape)
+        self.counts = np.zeros(shape, dtype=np.int32)  # individuals per square
+        self.individuals = {}  # individual: coords
+        self.ranks = {}  # individual: rank
+        self.actions = []  # (key, kind, individual or record, source, target)
+        self.outcomes = {}  # key: outcome of a move toward another tile
+        self.resolved = []  # (key, kind, id, square) of the current step
+
+    def owns(self, cell:int) -> bool:
+        x, y = divmod(cell, self.height)
+        return self.xmin <= x < self.xmax and self.ymin <= y < self.ymax
+
+    def local(self, cell:int) -> (int, int):
+        """Return the index in the tile arrays of the square of given index"""
+        x, y = divmod(cell, self.height)
+        return x - self.xmin, y - self.ymin
+
+    def cell(self, coords) -> int:
+        x, y = coords
+        return (x % self.width) * self.height + y % self.height
+
+    def add(self, data:tuple):
+        """Place the individual described by given record"""
+        idn, rank, cell, fingerprint, energy, memory, max_energy = data
+        genome = self.genomes[fingerprint]
+        network = NeuralNetwork(genome.nb_intermediate_neuron, len(memory),
+                                nb_neighbor=len(self.offsets),
+                                evaluator=Evaluator.CIRCUIT, genome=genome)
+        network.memory, network.max_energy = list(memory), max_energy
+        indiv = Individual(network, energy)
+        indiv.unique_id = idn
+        self.individuals[indiv] = divmod(cell, self.height)
+        self.ranks[indiv] = rank
+        return indiv
+
+    def remove(self, indiv):
+        del self.individuals[indiv], self.ranks[indiv]
+
+    def sort(self):
+        """Put back the individuals in the order of their rank"""
+        self.individuals = dict(sorted(self.individuals.items(),
+                                       key=lambda item: self.ranks[item[0]]))
+
+    def scatter(self, records:list, counts:np.ndarray, energy:np.ndarray):
+        """Take the given individuals and nutrients of the tile"""
+        self.individuals, self.ranks = {}, {}
+        for data in records:
+            self.add(data)
+        self.counts[...] = 0
+        for coords in self.individuals.values():
+            self.counts[self.local(self.cell(coords))] += 1
+        self.nutrients.counts[...], self.nutrients.energy[...] = counts, energy
+        self.write()
+
+    def react(self) -> (list, list, Counter, Counter):
+        """Compute the reactions of the individuals, give them the nutrients
+        of their square and split the energy of the replicating ones.
+
+        Return the replications (key, id, square, energy of the clone)
+        and the moves (key, source, target) toward other tiles,
+        then the directions and memories statistics.
+
+        """
+        NeuralNetwork.DIRECTIONS.clear()
+        NeuralNetwork.MEMORIES.clear()
+        updates, living = batch.prepared(self, with_neighbors=False)
+        networks = [data['individual'].neural_network for data in living]
+        others = batch.input_array([tuple(network.input_states(data, skip=1))
+                                    for network, data in zip(networks, living)])
+        collector = Collector()
+        batch.emit_all(collector, updates, living,
+                       batch.evaluate_circuits(networks, self.inputs(living, others)))
+        replications, moves = [], []
+        self.actions, self.outcomes, self.resolved = [], {}, []
+        keys = Counter()  # individual: index of its next action
+        for command in collector.commands:
+            indiv = getattr(command, 'obj', getattr(command, 'indiv', None))
+            key = self.ranks[indiv], keys[indiv]
+            keys[indiv] += 1
+            source = self.cell(command.coords)
+            if isinstance(command, PickNutrientAction):
+                nutrient = self.nutrients.consume(np.ravel_multi_index(
+                    self.local(source), self.nutrients.bounds))
+                indiv.energy += nutrient.energy if nutrient else 0
+            elif isinstance(command, ReplicateAction):
+                replications.append((key, indiv.unique_id, source, indiv.split_energy()))
+            elif isinstance(command, RemoveAction):
+                self.actions.append((key, REMOVE, indiv, source, None))
+            elif isinstance(command, MoveAction):
+                target = self.cell(Direction.final_coords(command.coords,
+                                                          command.directions))
+                if target != source:
+                    self.actions.append((key, MOVE, indiv, source, target))
+                    if not self.owns(target):
+                        moves.append((key, source, target))
+        return (replications, moves,
+                Counter(NeuralNetwork.DIRECTIONS), Counter(NeuralNetwork.MEMORIES))
+
+    def inputs(self, living:list, others:np.ndarray) -> np.ndarray:
+        """Return the input states of given living individuals, completing
+        given other input states with the states of their neighbors"""
+        xs, ys = self.halo_xs, self.halo_ys
+        window = np.stack((  # presence in tile and halo
+            self.grids['nutrients'][xs[:, None], ys[None, :]] > 0,
+            self.grids['occupancy'][xs[:, None], ys[None, :]] > 0,
+        ))
+        coords = np.array([data['coords'] for data in living],
+                          dtype=np.int64).reshape(-1, 2)
+        neighbor_xs = (coords[:, 0] - self.xmin + 1)[:, None] + self.offsets[:, 0]
+        neighbor_ys = (coords[:, 1] - self.ymin + 1)[:, None] + self.offsets[:, 1]
+        neighbors = np.stack((window[0][neighbor_xs, neighbor_ys],
+                              window[1][neighbor_xs, neighbor_ys]), axis=2)
+        return np.concatenate((neighbors.reshape(len(living), -1 if living else 0),
+                               others), axis=1)
+
+    def resolve(self, moves:list, placements:list, outcomes:list) -> (list, list, int):
+        """Resolve the actions changing the squares of the tile, as far as
+        possible, in the order of their keys.
+
+        moves: moves (key, source, target) from other tiles toward the tile.
+        placements: clones placed in the tile, as pairs (key, record).
+        outcomes: outcomes (key, success) of moves toward other tiles.
+        return: the outcomes of moves from other tiles decided meanwhile,
+                the individuals (target, record) leaving the tile,
+                and the number of actions left unresolved.
+
+        An action is left unresolved, as all following actions on its
+        squares, while the outcome of a move toward another tile is unknown.
+
+        """
+        if moves or placements:
+            self.actions.extend((key, MOVE, None, source, target)
+                                for key, source, target in moves)
+            self.actions.extend((key, PLACE, data, None, data[2])
+                                for key, data in placements)
+            self.actions.sort(key=lambda action: action[0])
+        self.outcomes.update(outcomes)
+        decided, leaving, pending, blocked = [], [], [], set()
+        for action in self.actions:
+            key, kind, obj, source, target = action
+            squares = {cell for cell in (source, target)
+                       if cell is not None and self.owns(cell)}
+            if blocked & squares:
+                pending.append(action)
+                blocked |= squares
+            elif kind == REMOVE:
+                self.counts[self.local(source)] -= 1
+                self.remove(obj)
+                self.resolved.append((key, REMOVE, obj.unique_id, source))
+            elif kind == PLACE:
+                if not self.counts[self.local(target)]:
+                    self.counts[self.local(target)] += 1
+                    self.add(obj)
+                    self.resolved.append((key, PLACE, obj[0], target))
+            elif self.owns(target):  # move decided here
+                success = not self.counts[self.local(target)]
+                if success:
+                    self.counts[self.local(target)] += 1
+                if obj is None:  # from another tile
+                    decided.append((key, success))
+                elif success:
+                    self.counts[self.local(source)] -= 1
+                    self.individuals[obj] = divmod(target, self.height)
+                    self.resolved.append((key, MOVE, obj.unique_id, target))
+            elif key in self.outcomes:  # move toward another tile
+                if self.outcomes.pop(key):
+                    self.counts[self.local(source)] -= 1
+                    leaving.append((target, record(obj, self.ranks[obj], target)))
+                    self.remove(obj)
+                    self.resolved.append((key, MOVE, obj.unique_id, target))
+            else:  # outcome still unknown
+                pending.append(action)
+                blocked |= squares
+        self.actions = pending
+        return decided, leaving, len(pending)
+
+    def commit(self, arrivals:list) -> (list, list, np.ndarray, np.ndarray):
+        """Place the individuals arriving from other tiles, and return
+        the resolved actions (key, kind, id, square) of the step,
+        the states (id, energy, memory, max energy) of the individuals,
+        then the numbers and energies of the nutrients of the tile"""
+        assert not self.actions, 'unresolved actions at commit'
+        for data in arrivals:
+            self.add(data)
+        if arrivals:
+            self.sort()
+        states = [(indiv.unique_id, indiv.energy, tuple(indiv.neural_network.memory),
+                   indiv.neural_network.max_energy) for indiv in self.individuals]
+        return self.resolved, states, self.nutrients.counts, self.nutrients.energy
+
+    def regenerate(self, cells:np.ndarray, energy:int):
+        """Add a nutrient of given energy in the squares of given indexes,
+        then write the squares of the tile in shared memory"""
+        xs, ys = np.divmod(cells, self.height)
+        self.nutrients.add_all(np.ravel_multi_index(
+            (xs - self.xmin, ys - self.ymin), self.nutrients.bounds), energy)
+        self.write()
+
+    def write(self):
+        """Write the squares of the tile in the shared state"""
+        ids = np.zeros_like(self.nutrients.energy)
+        energies = np.zeros_like(self.nutrients.energy)
+        for indiv, coords in self.individuals.items():
+            square = self.local(self.cell(coords))
+            ids[square] = ids[square] or indiv.unique_id
+            energies[square] += indiv.energy
+        window = slice(self.xmin, self.xmax), slice(self.ymin, self.ymax)
+        self.grids['ids'][window] = ids
+        self.grids['energies'][window] = energies
+        self.grids['occupancy'][window] = self.counts
+        self.grids['nutrients'][window] = self.nutrients.counts
+
+    def close(self):
+        del self.grids
+        self.memory.close()
+
+
+class TilePool(WorkerPool):
+    """Pool of workers, each one owning a tile of the space of a World,
+    and computing the steps of the individuals in it.
+
+    The pool is configured for a World geometry at each scatter,
+    and restarted if the geometry changes.
+
+    """
+    serve = staticmethod(serve_tile)
+
+    def __init__(self, nb_workers:int=default.NB_WORKERS):
+        super().__init__(nb_workers)
+        self.geometry = None  # bounds and neighbor access of the space
+        self.state = None  # shared world state
+        self.individuals = {}  # id: individual of the World
+        self.next_rank = 0  # rank of the next clone
+        self.crossings = 0  # number of moves from a tile to another
+
+    def configure(self, world):
+        geometry = world.space.bounds, world.neighbor_access
+        if geometry != self.geometry:
+            self.stop()
+            self.geometry = geometry
+            self.bounds = tuple(world.space.bounds)
+            self.offsets = halo_offsets(world.neighbor_access)
+
+    def worker_args(self, worker:int) -> tuple:
+        return self.state.name, self.bounds, self.tiles[worker], self.offsets
+
+    def start(self):
+        width, height = self.bounds
+        self.tiles = tiles(self.size, self.bounds)
+        self.tile_of_cell = np.empty(width * height, dtype=np.int64)
+        for idx, (xmin, xmax, ymin, ymax) in enumerate(self.tiles):
+            self.tile_of_cell.reshape(self.bounds)[xmin:xmax, ymin:ymax] = idx
+        self.state = shared.SharedWorldState(self.bounds)
+        # super().start() would start size workers
+        size, self.nb_workers = self.nb_workers, len(self.tiles)
+        try:
+            super().start()
+        finally:
+            self.nb_workers = size
+
+    def stop(self):
+        super().stop()
+        if self.state is not None:
+            self.state.close()
+            self.state = None
+
+    def request(self, worker:int, method:str, *args, genomes:iter=()):
+        """Send to given worker a call of given Tile method with given
+        arguments, with the genomes among given ones it does not know"""
+        new, forgotten = self.news(worker, genomes)
+        _, connection = self.workers[worker]
+        connection.send((method, new, forgotten, *args))
+
+    def replies(self, workers:iter) -> list:
+        """Return the replies of given workers"""
+        return [self.workers[worker][1].recv() for worker in workers]
+
+    def scatter(self, world):
+        """Give the state of given world to the tiles"""
+        self.configure(world)
+        if not self.workers:
+            self.start()
+        self.individuals = {indiv.unique_id: indiv for indiv in world.individuals}
+        self.next_rank = len(world.individuals)
+        records = [[] for _ in self.workers]
+        genomes = [[] for _ in self.workers]
+        for rank, (indiv, coords) in enumerate(world.individuals.items()):
+            cell = world.cell(coords)
+            worker = self.tile_of_cell[cell]
+            records[worker].append(record(indiv, rank, cell))
+            genomes[worker].append(indiv.genome)
+        nutrients = world.space.nutrients
+        with self.state.writing(world):
+            for worker, (xmin, xmax, ymin, ymax) in enumerate(self.tiles):
+                window = slice(xmin, xmax), slice(ymin, ymax)
+                self.request(worker, 'scatter', records[worker],
+                             nutrients.counts[window], nutrients.energy[window],
+                             genomes=genomes[worker])
+            self.replies(range(len(self.workers)))
+
+    def step(self, engine, world):
+        """Compute the next step of given world in the tiles, and apply it
+        to the world, with the journal of given engine"""
+        if engine.commands:  # the world is changed by other commands
+            engine.invoke_all()
+            self.scatter(world)
+        workers = range(len(self.workers))
+        with engine.profiler.phase('inputs'):
+            for worker in workers:
+                self.request(worker, 'react')
+        with engine.profiler.phase('evaluation'):
+            reactions = self.replies(workers)
+        with engine.profiler.phase('invocation'):
+            births, arrivals = self.resolve(world, reactions)
+            self.commit(engine, world, births, arrivals)
+        with engine.profiler.phase('regeneration'):
+            cells = world.regenerate_nutrient()
+            owners = self.tile_of_cell[cells]
+            with self.state.writing(world):
+                for worker in workers:
+                    self.request(worker, 'regenerate', cells[owners == worker],
+                                 world.nutrient_energy)
+                self.replies(workers)
+
+    def resolve(self, world, reactions:list) -> (dict, list):
+        """Clone the replicating individuals, then get the resolution
+        of all actions by the tiles.
+
+        Return the clones with their parent, by key of the replication,
+        and the records of the individuals arriving in each tile.
+
+        """
+        workers = range(len(self.workers))
+        replications, moves = [], [[] for _ in workers]
+        sources = {}  # key of a move toward another tile: tile of the mover
+        for worker, (replicating, leaving, directions, memories) in enumerate(reactions):
+            replications.extend(replicating)
+            for key, source, target in leaving:
+                moves[self.tile_of_cell[target]].append((key, source, target))
+                sources[key] = worker
+            NeuralNetwork.DIRECTIONS.update(directions)
+            NeuralNetwork.MEMORIES.update(memories)
+        # clones are drawn in the order of the serial invocation
+        births, placements = {}, [[] for _ in workers]
+        genomes = [[] for _ in workers]
+        replications.sort()
+        for rank, (key, idn, cell, energy) in enumerate(replications, start=self.next_rank):
+            parent = self.individuals[idn]
+            child = world.incubator.clone(parent, energy)
+            target = world.cell(world.random_neighbor(world.all_coords[cell]))
+            worker = self.tile_of_cell[target]
+            placements[worker].append((key, record(child, rank, target)))
+            genomes[worker].append(child.genome)
+            births[key] = child, parent
+        self.next_rank += len(replications)
+        # rounds of resolution, until all outcomes are known
+        arrivals = [[] for _ in workers]
+        requests = {worker: (moves[worker], placements[worker], ()) for worker in workers}
+        while requests:
+            for worker, args in requests.items():
+                self.request(worker, 'resolve', *args, genomes=genomes[worker])
+                genomes[worker] = []
+            outcomes = {}
+            for worker, (decided, leaving, _) in zip(requests, self.replies(requests)):
+                for key, success in decided:
+                    outcomes.setdefault(sources[key], []).append((key, success))
+                    self.crossings += success
+                for target, data in leaving:
+                    owner = self.tile_of_cell[target]
+                    arrivals[owner].append(data)
+                    genomes[owner].append(self.individuals[data[0]].genome)
+            requests = {worker: ((), (), outcomes[worker]) for worker in sorted(outcomes)}
+        return births, arrivals
+
+    def commit(self, engine, world, births:dict, arrivals:list):
+        """Place the arriving individuals in the tiles, and apply to given
+        world the actions they resolved and the states they give"""
+        for worker, data in enumerate(arrivals):
+            self.request(worker, 'commit', data,
+                         genomes=(self.individuals[idn].genome for idn, *_ in data))
+        commits = self.replies(range(len(self.workers)))
+        resolved = sorted(action for actions, *_ in commits for action in actions)
+        if engine.journal is not None:
+            engine.journal.record(self.commands(world, resolved))
+        for key, kind, idn, cell in resolved:
+            coords = world.all_coords[cell]
+            if kind == REMOVE:
+                world.remove(self.individuals.pop(idn), coords)
+            elif kind == MOVE:
+                indiv = self.individuals[idn]
+                world.relocate(indiv, world.individuals[indiv], coords)
+            else:  # PLACE
+                child, parent = births[key]
+                self.individuals[idn] = world.add(child, coords)
+                LOGGER.info('REPLICATE: ' + str(parent) + ' gives ' + str(child) +
+                            ' at coords ' + str(coords) + '.')
+                world.notify_observers({observer.Signal.NEW_INDIVIDUAL:
+                                        (child, parent, coords)})
+        nutrients = world.space.nutrients
+        for (xmin, xmax, ymin, ymax), (_, states, counts, energy) in zip(self.tiles, commits):
+            for idn, energy_level, memory, max_energy in states:
+                indiv = self.individuals[idn]
+                indiv.energy = energy_level
+                indiv.neural_network.memory = list(memory)
+                indiv.neural_network.max_energy = max_energy
+            window = slice(xmin, xmax), slice(ymin, ymax)
+            world.object_counter[Nutrient] += int(counts.sum() - nutrients.counts[window].sum())
+            nutrients.counts[window], nutrients.energy[window] = counts, energy
+
+    def commands(self, world, resolved:list) -> list:
+        """Return actions equivalent to the resolved ones for a journal,
+        all individuals of given world picking their nutrients first"""
+        commands = [PickNutrientAction(indiv, coords)
+                    for indiv, coords in world.individuals.items()]
+        for _, kind, idn, _ in resolved:
+            indiv = self.individuals.get(idn)
+            if kind == MOVE:
+                commands.append(MoveAction(indiv, world.individuals[indiv], ()))
+            elif kind == REMOVE:
+                commands.append(RemoveAction(indiv, world.individuals[indiv]))
+        return commands
+
+
+# The process-wide pool of tiles, resized by Engine.apply
+TILES = TilePool()
+atexit.register(TILES.stop)
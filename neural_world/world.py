@@ -3,17 +3,18 @@ World define space and objects contained in.
 It provides an API used by the Actions subclasses.
 
 """
-import itertools
-import random
-from collections import defaultdict
+from collections import Counter, defaultdict
 
-import neural_world.default as default
+import numpy as np
+
+import neural_world.cache as cache
 import neural_world.commons as commons
+import neural_world.neighbors as neighbors
 import neural_world.observer as observer
-from neural_world.space import Space
+from neural_world.space import SPACES
 from neural_world.commons import Configurable
 from neural_world.nutrient import Nutrient
-from neural_world.individual import Individual
+from neural_world.neural_network import NeuralNetwork
 
 
 LOGGER = commons.logger('life')
@@ -29,14 +30,18 @@ class World(observer.Observable, Configurable):
     def __init__(self, config):
         observer.Observable.__init__(self)
         Configurable.__init__(self, config=config, config_fields=[
-            'space_width', 'space_height',
+            'space_width', 'space_height', 'space_backend',
             'nutrient_regen', 'nutrient_energy', 'nutrient_density',
             'init_indiv_density', 'init_indiv_count', 'neighbor_access',
-            'incubator', 'terminated'
+            'incubator', 'terminated', 'random_streams',
         ])
 
-        self.space          = Space((self.space_width, self.space_height))
+        self.space          = SPACES[self.space_backend]((self.space_width,
+                                                      self.space_height))
+        self.neighbor_table = neighbors.table(self.neighbor_access,
+                                              self.space.bounds)
         self.object_counter = defaultdict(int)
+        self.individuals    = {}  # individual: coords, in order of arrival
         self.step_number    = 0  # step counter ; just an information
 
     def populate(self):
@@ -51,73 +56,89 @@ class World(observer.Observable, Configurable):
 
         """
         # Populate the world according to densities
-        for coords, square in self.ordered_objects:
-            if random.random() < self.nutrient_density:
-                square.add(Nutrient())
-                self.object_counter[Nutrient] += 1
-            if self.init_indiv_density > 0.:
-                if random.random() < self.init_indiv_density:
-                    self.spawn(square)
+        placement = self.random_streams.placement
+        nb_cell = len(self.all_coords)
+        nutrients = (placement.random(nb_cell) < self.nutrient_density).tolist()
+        spawns = ((placement.random(nb_cell) < self.init_indiv_density).tolist()
+                  if self.init_indiv_density > 0. else (False,) * nb_cell)
+        for cell, coords in enumerate(self.all_coords):
+            if nutrients[cell]:
+                self.add_nutrient(cell)
+            if spawns[cell]:
+                self.spawn(coords)
         # Add indiv_count individuals in the world, randomly
         if self.init_indiv_count > 0:
             for _ in range(self.init_indiv_count):
                 self.spawn(self.random_coords())
 
 
-    def remove(self, obj, place):
-        """Remove an object from space at given coords/square, and return it.
+    def remove(self, obj, coords):
+        """Remove an object from space at given coords, and return it.
 
         obj: an individual or a nutrient.
-        place: coords (2-tuple) or square (set) from obj will be removed.
+        coords: 2-tuple from which obj will be removed.
 
         """
-        if isinstance(place, set): square = place
-        else:                      square = self.space[place]
-        square.remove(obj)
+        self.space.remove(obj, coords)
+        if obj.is_individual:
+            del self.individuals[obj]
         self.object_counter[obj.__class__] -= 1
         return obj
 
-    def add(self, obj, place):
-        """Place given obj at given coords or square, and return it.
+    def add(self, obj, coords):
+        """Place given obj at given coords, and return it.
 
         obj: an individual or a nutrient.
-        place: coords (2-tuple) or square (set) where the obj will be placed.
+        coords: 2-tuple where the obj will be placed.
 
         """
-        if isinstance(place, set):  # its a square !
-            place.add(obj)
-        else:  # its coords !
-            self.space[place].add(obj)
+        self.space.add(obj, coords)
+        if obj.is_individual:
+            self.individuals[obj] = self.wrapped(coords)
         self.object_counter[obj.__class__] += 1
         return obj
 
+    def add_nutrient(self, cell:int, energy:int=None):
+        """Place a nutrient in the square of given index, without creating
+        any Nutrient instance. Energy defaults to the configured one."""
+        if energy is None:
+            energy = self.nutrient_energy
+        self.space.nutrients.add(cell, energy)
+        self.object_counter[Nutrient] += 1
+
     def move(self, obj, coords, directions):
         """Move given obj placed at given coords in the given direction"""
         new_coords = commons.Direction.final_coords(coords, directions)
         if not self.space.occuped_at(new_coords):
-            self.remove(obj, coords)
-            self.add(obj, new_coords)
-            coords = new_coords
+            self.relocate(obj, coords, new_coords)
             LOGGER.debug('MOVE: ' + str(obj) + ': ' + str(coords) + ' -> '
                          + str(directions) + ' -> ' + str(new_coords))
 
+    def relocate(self, obj, coords, new_coords):
+        """Move given obj placed at given coords to given new coords,
+        whatever is placed there"""
+        self.space.remove(obj, coords)
+        self.space.add(obj, new_coords)
+        # the individual keeps its place in the registry
+        self.individuals[obj] = self.wrapped(new_coords)
+
     def pick_nutrient(self, individual, coords):
         """Give to individual the energy of a nutrient at given coords"""
         assert individual.is_individual
         individual.energy += self.consume_nutrient(coords)
         LOGGER.debug('CONSUME NUTRIENTS: ' + str(individual))
 
-    def spawn(self, place=None):
+    def spawn(self, coords=None):
         """Create and place a new indiv, created from incubator."""
         # Use random coords if no coords given
-        if place is None:
-            place = self.random_coords()
+        if coords is None:
+            coords = self.random_coords()
         # Create the new indiv and add it to space
         new = self.incubator.spawn()
-        self.add(new, place)
+        self.add(new, coords)
         # Logs it and send signal to observers
         LOGGER.info('NEW INDIVIDUAL: ' + str(new) + '.')
-        self.notify_observers({observer.Signal.NEW_INDIVIDUAL: (new, None, place)})
+        self.notify_observers({observer.Signal.NEW_INDIVIDUAL: (new, None, coords)})
 
     def spawn_from(self, indiv, coords):
         """Create and place a new indiv, created from given one at given coords."""
@@ -132,25 +153,34 @@ class World(observer.Observable, Configurable):
 
     def random_neighbor(self, coords):
         """Return a random coord, choosen in the neighbors of given coords"""
-        return random.choice(tuple(self.neighbor_access(coords)))
+        neighbors = self.neighbor_table[self.cell(coords)]
+        return self.all_coords[neighbors[self.random_streams.replication.integers(len(neighbors))]]
 
-    def regenerate_nutrient(self):
-        """Place randomly nutrient in the world"""
-        for square in self.squares:
-            if random.random() <= self.nutrient_regen:
-                square.add(Nutrient())
+    def regenerate_nutrient(self) -> np.ndarray:
+        """Place randomly nutrient in the world, and return the indexes
+        of the squares receiving them
+
+        Each square receives a nutrient with probability nutrient_regen:
+        the number of regenerated nutrients is drawn once, then the squares
+        receiving them.
+
+        """
+        nb_cell = len(self.all_coords)
+        regeneration = self.random_streams.regeneration
+        nb_nutrient = regeneration.binomial(nb_cell, min(self.nutrient_regen, 1.))
+        if not nb_nutrient:
+            return np.empty(0, dtype=np.int64)
+        cells = regeneration.choice(nb_cell, size=nb_nutrient, replace=False)
+        self.space.nutrients.add_all(cells, self.nutrient_energy)
+        self.object_counter[Nutrient] += int(nb_nutrient)
+        return cells
 
     def consume_nutrient(self, coords):
         """Remove a Nutrient instance from coords and return
         the associated amount of energy."""
-        square = self.space[coords]
-        nutrient = None
-        for obj in square:
-            if obj.is_nutrient:
-                nutrient = obj
-                break
+        nutrient = self.space.consume_nutrient(coords)
         if nutrient:
-            self.remove(nutrient, coords)
+            self.object_counter[Nutrient] -= 1
             return nutrient.energy
         else:
             return 0
@@ -163,32 +193,52 @@ class World(observer.Observable, Configurable):
         )
 
     def random_coords(self):
-        return (random.randrange(self.space_width),
-                random.randrange(self.space_height))
+        return tuple(self.random_streams.placement.integers(
+            (self.space_width, self.space_height)).tolist())
 
     @property
     def have_life(self):
-        return self.object_counter[Individual] > 0
+        return len(self.individuals) > 0
 
     @property
-    def ordered_objects(self):
-        return (
-            (coords, self.space[coords])
-            for coords in itertools.product(
-                range(self.space_width), range(self.space_height)
-            )
-        )
+    def nb_individual(self):
+        return len(self.individuals)
 
     @property
-    def squares(self):
-        return self.space.values()
+    def statistics(self) -> dict:
+        """Copies of the process-wide statistics of the networks
+        and of the reactions cache"""
+        return {
+            'memories': Counter(NeuralNetwork.MEMORIES),
+            'directions': Counter(NeuralNetwork.DIRECTIONS),
+            'reactions': str(cache.REACTIONS),
+        }
 
-    def neighbors(self, coords):
-        "Return a generator of coords that are the neighbors of given ones"
+    @property
+    def all_coords(self):
+        """Coords of all squares, in the order of their indexes"""
+        return self.space.all_coords
+
+    def cell(self, coords):
+        """Return the index of the square at given coords"""
+        x, y = coords
+        return (x % self.space_width) * self.space_height + y % self.space_height
+
+    def wrapped(self, coords):
+        """Return given coords, modified for being in the space"""
+        return self.all_coords[self.cell(coords)]
+
+    @property
+    def ordered_objects(self):
         return (
-            self.space[neighbor]
-            for neighbor in default.NEIGHBOR_ACCESS(coords)
+            (coords, self.space.objects_at(coords))
+            for coords in self.all_coords
         )
 
+    def neighbors(self, coords):
+        """Return the states of the neighbors of given coords, as 2-tuple
+        of booleans giving the presence of nutrients and individuals"""
+        return self.space.cell_states(self.neighbor_table[self.cell(coords)])
+
     def deinit(self):
         self.deinit_observers()